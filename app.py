@@ -1,10 +1,14 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from decimal import Decimal
-from core import payroll, params
+import io
+from core import payroll, params, roster
 import json
 
 app = Flask(__name__)
 
+# /calculate/batch isteği başına en fazla hesap
+MAX_BATCH_ITEMS = 10000
+
 # Özelleştirilmiş JSON Encoder (Decimal desteği için)
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -27,15 +31,17 @@ def calculate():
         cum_base = Decimal(str(data.get('cum_base', '0')))
         employee_type = data.get('employee_type', 'normal_4a')
         year = int(data.get('year', 2026))
+        month = int(data.get('month', 1))
 
-        year_params = params.load_params(year)
+        year_params = params.get_year_params(year, month)
 
         if mode == 'gross_to_net':
             result = payroll.calculate_pay_slip(
                 gross=amount,
                 cum_tax_base_prev=cum_base,
                 employee_type=employee_type,
-                year_params=year_params
+                year_params=year_params,
+                month=month
             )
             return jsonify({
                 "success": True,
@@ -53,7 +59,8 @@ def calculate():
                 target_net=amount,
                 cum_tax_base_prev=cum_base,
                 employee_type=employee_type,
-                year_params=year_params
+                year_params=year_params,
+                month=month
             )
             
             # Detayları göstermek için tekrar hesapla
@@ -61,7 +68,8 @@ def calculate():
                 gross=gross,
                 cum_tax_base_prev=cum_base,
                 employee_type=employee_type,
-                year_params=year_params
+                year_params=year_params,
+                month=month
             )
             
             return jsonify({
@@ -82,5 +90,134 @@ def calculate():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """
+    Tek istekte çok sayıda hesap: {"items": [{"mode", "amount", "cum_base", "employee_type", "month", "year"}]}.
+    Öğeler yıla göre gruplanıp toplu motorla hesaplanır; sonuçlar girdi sırasıyla döner,
+    hatalı öğeler yalnızca kendi `error` alanıyla işaretlenir.
+    """
+    try:
+        data = request.json
+        items = data.get('items') or []
+        if not isinstance(items, list):
+            return jsonify({"success": False, "error": "items bir liste olmalı"}), 400
+        if len(items) > MAX_BATCH_ITEMS:
+            return jsonify({"success": False, "error": f"En fazla {MAX_BATCH_ITEMS} öğe gönderilebilir"}), 400
+        try:
+            default_year = int(data.get('year', 2026))
+        except (ValueError, TypeError):
+            return jsonify({"success": False, "error": f"Geçersiz yıl: {data.get('year')}"}), 400
+
+        results = roster.calculate_items(items, default_year)
+        return jsonify({"success": True, "data": results})
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/calculate/stream', methods=['POST'])
+def calculate_stream():
+    """
+    Büyük işler için NDJSON akışı: her satır bir `/calculate/batch` öğesidir.
+    Girdi satır satır okunur, `chunk_size` satırlık parçalar halinde hesaplanır ve her
+    parçanın sonucu hemen NDJSON olarak gönderilir. Bir sonraki parça ancak önceki yazıldıktan
+    sonra okunduğundan bellek kullanımı iş boyutundan bağımsızdır.
+    Sorgu parametreleri: year (öğede "year" yoksa; Varsayılan: 2026), chunk_size.
+    """
+    try:
+        year = int(request.args.get('year', 2026))
+        params.get_year_params(year)
+        chunk_size = int(request.args.get('chunk_size', roster.DEFAULT_CHUNK_SIZE))
+        if chunk_size < 1:
+            raise ValueError("chunk_size en az 1 olmalı")
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8')
+
+    def rows():
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line, parse_float=Decimal)
+                row = roster.item_row(item.get('id', i) if isinstance(item, dict) else i, item, year)
+            except ValueError:
+                row = roster.item_row(i, {}, year)
+                row["error"] = "Geçersiz JSON satırı"
+            except Exception as e:
+                # Tek bir öğe akışı yarıda kesmez; hata satırı olarak gönderilir
+                row = roster.item_row(i, {}, year)
+                row["error"] = str(e)
+            yield row
+
+    def generate():
+        for chunk in roster.chunked(rows(), chunk_size):
+            # Öğeler kendi "year" alanlarıyla (`/calculate/batch` gibi) hesaplanır
+            yield roster.format_results(roster.process_item_rows(chunk), "jsonl")
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/calculate/preview', methods=['POST'])
+def calculate_preview():
+    """Kaydırıcı / tuş vuruşu için yalnızca brüt ve net (önbellekli eğriden)."""
+    try:
+        data = request.json
+        month = int(data.get('month', 1))
+        year_params = params.get_year_params(int(data.get('year', 2026)), month)
+        result = payroll.preview(
+            data.get('mode'),
+            Decimal(str(data.get('amount'))),
+            Decimal(str(data.get('cum_base', '0'))),
+            data.get('employee_type', 'normal_4a'),
+            year_params,
+            month
+        )
+        return jsonify({"success": True, "data": {k: str(v) for k, v in result.items()}})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/calculate/offers', methods=['POST'])
+def calculate_offers():
+    """
+    Teklif tablosu: {"rows": [{"target_net", "cum_base", "employee_type", "month"}], "year"}.
+    Hedef netlerin tümü tek seferde brüte çevrilir; hatalı satırlar yalnızca kendi
+    `error` alanıyla işaretlenir.
+    """
+    try:
+        data = request.json
+        rows = data.get('rows') or []
+        if not isinstance(rows, list):
+            return jsonify({"success": False, "error": "rows bir liste olmalı"}), 400
+        if len(rows) > MAX_BATCH_ITEMS:
+            return jsonify({"success": False, "error": f"En fazla {MAX_BATCH_ITEMS} satır gönderilebilir"}), 400
+        try:
+            year_params = params.get_year_params(int(data.get('year', 2026)))
+        except (ValueError, TypeError, FileNotFoundError) as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        items = [
+            dict(r, mode="net_to_gross", amount=r.get('target_net')) if isinstance(r, dict) else r
+            for r in rows
+        ]
+        results = []
+        solved = roster.process_items([roster.item_row(i, item) for i, item in enumerate(items)], year_params)
+        for row, result in zip(rows, solved):
+            if "error" in result:
+                target_net = row.get('target_net') if isinstance(row, dict) else None
+                results.append({"target_net": None if target_net is None else str(target_net), "error": result["error"]})
+            else:
+                results.append({
+                    "target_net": str(result["target_net"]),
+                    "gross": result["found_gross"],
+                    "net": result["net"],
+                    "residual": result["residual"],
+                })
+        return jsonify({"success": True, "data": results})
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,242 @@
+"""
+ASGI Sunucusu (async)
+Flask uygulamasıyla aynı hesap uç noktalarını ve PDF analizini bir olay döngüsü
+üzerinden sunar. Tekil hesaplar (milisaniyenin altında) döngüde çalışır; büyük toplu
+hesaplar ve PDF analizi gibi CPU ağırlıklı işler süreç havuzuna aktarılır. Her iş
+türünün havuzda aynı anda kaç iş çalıştırabileceği ayrı ayrı sınırlıdır; böylece
+uzun PDF işleri sürerken de brütten nete istekleri beklemeden yanıtlanır.
+
+Çalıştırma:
+    uvicorn asgi_app:app --port 8000
+
+Ortam değişkenleri:
+    BORDRO_WORKERS      havuzdaki işçi süreç sayısı (Varsayılan: CPU sayısı)
+    BORDRO_LIMIT_PDF    aynı anda çalışan en fazla PDF analizi (Varsayılan: işçi sayısı - 1)
+    BORDRO_LIMIT_BATCH  aynı anda çalışan en fazla toplu hesap (Varsayılan: işçi sayısı)
+"""
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from core import params, payroll, roster
+from core.parallel import default_workers
+
+WORKERS = int(os.environ.get("BORDRO_WORKERS") or default_workers())
+LIMITS = {
+    "pdf": int(os.environ.get("BORDRO_LIMIT_PDF") or max(1, WORKERS - 1)),
+    "batch": int(os.environ.get("BORDRO_LIMIT_BATCH") or WORKERS),
+}
+
+# Bu sayıya kadar öğe içeren toplu istekler havuza gönderilmeden döngüde hesaplanır
+INLINE_BATCH_ITEMS = 50
+MAX_BATCH_ITEMS = 10000
+MAX_PDF_BYTES = 20 * 1024 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Havuz işleri (süreçler arasında taşınabilmesi için modül düzeyinde) ---
+
+def _batch_job(items: List[Dict[str, Any]], default_year: int) -> List[Dict[str, Any]]:
+    return roster.calculate_items(items, default_year)
+
+
+def _analyze_job(content: bytes, filename: str, year: int, month: Optional[int]) -> Dict[str, Any]:
+    from core.analyzer import analyze_pdf
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        analysis = analyze_pdf(path, params.get_year_params(year, month or 1), month=month)
+    finally:
+        os.remove(path)
+    analysis["filename"] = filename
+    return analysis
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=WORKERS)
+    return _pool
+
+
+def _limit(kind: str) -> asyncio.Semaphore:
+    # Semaforlar çalışan döngüde oluşturulur (lifespan ya da ilk istek)
+    if kind not in _limits:
+        _limits[kind] = asyncio.Semaphore(LIMITS[kind])
+    return _limits[kind]
+
+
+async def run_in_pool(kind: str, func: Callable[..., Any], *args) -> Any:
+    """`func(*args)`ı iş türünün sınırı içinde süreç havuzunda çalıştırır."""
+    async with _limit(kind):
+        return await asyncio.get_running_loop().run_in_executor(_get_pool(), func, *args)
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    _limits.clear()
+
+
+# --- Uç noktalar ---
+
+def _json_body(body: bytes) -> Dict[str, Any]:
+    try:
+        data = json.loads(body or b"{}", parse_float=Decimal)
+    except ValueError:
+        raise HTTPError(400, "Geçersiz JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Geçersiz JSON")
+    return data
+
+
+async def calculate(body: bytes, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+    data = _json_body(body)
+    mode = data.get('mode')
+    amount = Decimal(str(data.get('amount')))
+    cum_base = Decimal(str(data.get('cum_base', '0')))
+    employee_type = data.get('employee_type', 'normal_4a')
+    month = int(data.get('month', 1))
+    year_params = params.get_year_params(int(data.get('year', 2026)), month)
+
+    if mode == 'gross_to_net':
+        result = payroll.calculate_pay_slip(amount, cum_base, employee_type, year_params, month)
+        extra = {"input_gross": str(amount)}
+    elif mode == 'net_to_gross':
+        gross = payroll.find_gross_salary(amount, cum_base, employee_type, year_params, month)
+        result = payroll.calculate_pay_slip(gross, cum_base, employee_type, year_params, month)
+        extra = {"input_net": str(amount), "found_gross": str(gross)}
+    else:
+        raise HTTPError(400, "Geçersiz mod")
+
+    return 200, {
+        "success": True,
+        "data": result,
+        **extra,
+        "visual_data": {
+            "net": str(result['net']),
+            "taxes": str(result['income_tax_net'] + result['stamp_tax_net']),
+            "sgk": str(result['sgk_employee'] + result['unemployment_employee'])
+        }
+    }
+
+
+async def calculate_batch(body: bytes, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+    data = _json_body(body)
+    items = data.get('items') or []
+    if not isinstance(items, list):
+        raise HTTPError(400, "items bir liste olmalı")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPError(400, f"En fazla {MAX_BATCH_ITEMS} öğe gönderilebilir")
+    try:
+        default_year = int(data.get('year', 2026))
+    except (ValueError, TypeError):
+        raise HTTPError(400, f"Geçersiz yıl: {data.get('year')}")
+
+    if len(items) <= INLINE_BATCH_ITEMS:
+        results = roster.calculate_items(items, default_year)
+    else:
+        results = await run_in_pool("batch", _batch_job, items, default_year)
+    return 200, {"success": True, "data": results}
+
+
+async def analyze(body: bytes, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+    """Gövde: PDF dosyasının kendisi. Sorgu: year, month, filename."""
+    if not body:
+        raise HTTPError(400, "PDF içeriği boş")
+    year = int(query.get('year', 2026))
+    # Ay verilmezse bordroda tespit edilen dönem kullanılır
+    month = int(query['month']) if query.get('month') else None
+    analysis = await run_in_pool("pdf", _analyze_job, body, query.get('filename', 'bordro.pdf'), year, month)
+    return 200, {"success": True, "data": analysis}
+
+
+async def health(body: bytes, query: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+    return 200, {"success": True, "workers": WORKERS, "limits": LIMITS}
+
+
+ROUTES = {
+    ("GET", "/health"): (health, 0),
+    ("POST", "/calculate"): (calculate, 64 * 1024),
+    ("POST", "/calculate/batch"): (calculate_batch, 16 * 1024 * 1024),
+    ("POST", "/analyze"): (analyze, MAX_PDF_BYTES),
+}
+
+
+# --- ASGI ---
+
+async def _read_body(receive, max_bytes: int) -> bytes:
+    parts = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Bağlantı kesildi")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPError(413, "İstek gövdesi çok büyük")
+        parts.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(parts)
+
+
+async def _send_json(send, status: int, payload: Dict[str, Any]):
+    body = json.dumps(payload, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            for kind in LIMITS:
+                _limit(kind)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    route = ROUTES.get((scope["method"], scope["path"]))
+    if route is None:
+        return await _send_json(send, 404, {"success": False, "error": "Bulunamadı"})
+    handler, max_bytes = route
+
+    query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()}
+    try:
+        status, payload = await handler(await _read_body(receive, max_bytes), query)
+    except HTTPError as e:
+        status, payload = e.status, {"success": False, "error": str(e)}
+    except Exception as e:
+        status, payload = 500, {"success": False, "error": str(e)}
+    await _send_json(send, status, payload)
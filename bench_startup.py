@@ -0,0 +1,81 @@
+"""
+Açılış Süresi Ölçümü
+Her hedef modülü temiz bir yorumlayıcıda `-X importtime` ile içe aktarır; toplam
+import süresini ve en pahalı modülleri raporlar. Süre bütçeyi aşarsa ya da açılışta
+yüklenmemesi gereken bir bağımlılık (pdfplumber, numpy) yüklenirse hata koduyla çıkar.
+
+Kullanım:
+    python bench_startup.py                 # varsayılan hedefler ve bütçeler
+    python bench_startup.py cli --budget 60 # tek hedef, ms cinsinden bütçe
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Hedef modül -> (bütçe ms, açılışta yüklenmemesi gereken modüller)
+TARGETS = {
+    "cli": (80, ("pdfplumber", "numpy")),
+    "desktop_app": (150, ("pdfplumber", "numpy", "core.analyzer")),
+}
+REPEAT = 5
+
+
+def measure(module: str):
+    """Modülü temiz bir süreçte içe aktarır; (toplam µs, {modül: (öz µs, toplam µs)}) döner."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules[module][1], modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Açılış (import) süresi bütçe kontrolü")
+    parser.add_argument("targets", nargs="*", help=f"Hedef modüller (Varsayılan: {', '.join(TARGETS)})")
+    parser.add_argument("--budget", type=float, help="Bütçe (ms); verilmezse hedefin varsayılanı")
+    parser.add_argument("--top", type=int, default=10, help="Raporlanacak en pahalı modül sayısı")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for target in args.targets or list(TARGETS):
+        budget, forbidden = TARGETS.get(target, (None, ()))
+        budget = args.budget if args.budget is not None else budget
+
+        try:
+            # İşletim sistemi önbelleği ısınmış ölçümlerin en iyisi alınır
+            runs = [measure(target) for _ in range(REPEAT)]
+        except RuntimeError as e:
+            print(f"{target}: ölçülemedi ({e})")
+            failed = True
+            continue
+        total_us, modules = min(runs, key=lambda run: run[0])
+
+        print(f"\n{target}: {total_us / 1000:.1f} ms" + (f" (bütçe {budget:.0f} ms)" if budget else ""))
+        ranked = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in ranked:
+            print(f"  {self_us / 1000:7.2f} ms öz  {cumulative_us / 1000:7.2f} ms toplam  {name}")
+
+        loaded = [name for name in forbidden if name in modules]
+        if loaded:
+            print(f"  HATA: açılışta yüklenmemeli: {', '.join(loaded)}")
+            failed = True
+        if budget and total_us / 1000 > budget:
+            print("  HATA: bütçe aşıldı")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
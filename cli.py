@@ -1,22 +1,197 @@
 import argparse
+import sys
+import time
 from decimal import Decimal
 from core import payroll, params
 import json
 
-def main():
-    parser = argparse.ArgumentParser(description="Türk Bordro Motoru CLI (2026)")
+def run_batch(argv):
+    """Çalışan listesini (CSV/JSONL) akış halinde hesaplar."""
+    from core import roster
+
+    parser = argparse.ArgumentParser(
+        prog="cli.py batch",
+        description="Toplu bordro hesabı (CSV/JSONL). target_net verilen satırlar (teklif tabloları) "
+                    "toplu çözücüyle brüte çevrilir; çıktıda found_gross ve residual (net - hedef) yer alır."
+    )
+    parser.add_argument("input", help="Girdi dosyası (id, gross veya target_net, cum_base, type, month); '-' = stdin")
+    parser.add_argument("--output", "-o", default="-", help="Çıktı dosyası (Varsayılan: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Girdi biçimi (Varsayılan: uzantıdan)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Çıktı biçimi (Varsayılan: uzantıdan veya jsonl)")
+    parser.add_argument("--year", type=int, default=2026, help="Parametre yılı (Varsayılan: 2026)")
+    parser.add_argument("--chunk-size", type=int, default=roster.DEFAULT_CHUNK_SIZE, help="Parça büyüklüğü (satır)")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel işçi süreç sayısı (Varsayılan: 1)")
+
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size en az 1 olmalı")
+
+    year_params = params.get_year_params(args.year)
+    input_format = args.input_format or roster.detect_format(args.input)
+    output_format = args.output_format or roster.detect_format(args.output, default="jsonl")
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        started = time.perf_counter()
+        writer = roster.RosterWriter(dst, output_format)
+        count = roster.run_batch(
+            roster.read_records(src, input_format), year_params, writer, args.chunk_size, args.workers
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"{count} satır {elapsed:.2f} sn ({rate:,.0f} satır/sn)", file=sys.stderr)
+
+def run_scenario(argv):
+    """Parametre senaryolarını (overlay) bir çalışan listesi üzerinde karşılaştırır."""
+    import csv
+    from core import roster, scenario
+    from core.fixedpoint import format_kurus
+
+    parser = argparse.ArgumentParser(prog="cli.py scenario", description="Parametre senaryosu (what-if) karşılaştırması")
+    parser.add_argument("input", help="Çalışan listesi (id, gross, cum_base, type, month; CSV/JSONL)")
+    parser.add_argument("overlays", help='Senaryolar JSON dosyası: {"ad": {değişen anahtarlar}, ...}')
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Girdi biçimi (Varsayılan: uzantıdan)")
+    parser.add_argument("--year", type=int, default=2026, help="Temel parametre yılı (Varsayılan: 2026)")
+    parser.add_argument("--deltas", help="Çalışan başına farkların yazılacağı CSV dosyası")
+
+    args = parser.parse_args(argv)
+
+    with open(args.overlays, "r", encoding="utf-8") as f:
+        overlays = json.load(f, parse_float=Decimal)
+    with open(args.input, "r", encoding="utf-8", newline="") as f:
+        rows = list(roster.read_roster(f, args.input_format or roster.detect_format(args.input)))
+    for row in rows:
+        if row["error"] is not None or row["gross"] is None:
+            raise SystemExit(f"Satır {row['id']}: {row['error'] or 'gross gerekli'}")
+
+    result = scenario.run_scenarios(
+        [r["gross"] for r in rows], [r["cum_base"] for r in rows], [r["type"] for r in rows],
+        overlays, params.load_params(args.year), month=[r["month"] for r in rows]
+    )
+
+    summary = {
+        "baseline": result["baseline"]["totals"],
+        "scenarios": {s["name"]: {"totals": s["totals"], "delta": s["delta_totals"]} for s in result["scenarios"]},
+    }
+    print(json.dumps(summary, default=str, indent=2, ensure_ascii=False))
+
+    if args.deltas:
+        columns = ["id"] + [f"{s['name']}_{field}" for s in result["scenarios"] for field in scenario.DELTA_FIELDS]
+        deltas = [s["deltas"][field].tolist() for s in result["scenarios"] for field in scenario.DELTA_FIELDS]
+        with open(args.deltas, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for i, row in enumerate(rows):
+                writer.writerow([row["id"]] + [format_kurus(d[i]) for d in deltas])
+
+def run_analyze(argv):
+    """Klasör / glob altındaki bordro PDF'lerini toplu analiz eder (dosya başına bir JSONL kaydı)."""
+    from core import audit
+    from core.parallel import default_workers
+
+    parser = argparse.ArgumentParser(
+        prog="cli.py analyze",
+        description="Toplu PDF bordro analizi. Her dosya için bulgular, uyarılar ve okuma güveni JSONL olarak yazılır."
+    )
+    parser.add_argument("paths", nargs="+", help="PDF dosyaları, klasörler (alt klasörlerle) veya glob kalıpları")
+    parser.add_argument("--output", "-o", default="-", help="Çıktı JSONL dosyası (Varsayılan: stdout)")
+    parser.add_argument("--year", type=int, default=audit.DEFAULT_YEAR,
+                        help="Dönemi tespit edilemeyen bordrolar için parametre yılı (Varsayılan: 2026)")
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="Paralel işçi süreç sayısı (Varsayılan: CPU sayısı)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="PDF önbelleğini atla; her dosyayı yeniden oku ve parse et")
+    parser.add_argument("--no-templates", action="store_true",
+                        help="Yerleşim şablonlarını kullanma; bilinen formatları da tam metinden oku")
+    parser.add_argument("--tables", choices=["auto", "always", "never"], default="auto",
+                        help="Tablo çıkarma: auto = yalnızca metin katmanında kritik alan eksikse (Varsayılan)")
+    parser.add_argument("--split", action="store_true",
+                        help="Çok çalışanlı PDF'leri bordro başına kayıtlara ayır (sayfa aralığıyla)")
+    parser.add_argument("--page-workers", type=int, default=1,
+                        help="Tek bir büyük PDF'in sayfalarını paralel okuyacak işçi sayısı (Varsayılan: 1)")
+    parser.add_argument("--max-memory", type=float,
+                        help="Sayfa işçilerinin toplam bellek tavanı (MB); işçi sayısı buna göre düşürülür")
+
+    args = parser.parse_args(argv)
+
+    files = audit.find_pdfs(args.paths)
+    if not files:
+        raise SystemExit("PDF dosyası bulunamadı")
+
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    progress = sys.stderr.isatty()
+    failed = 0
+    stages = {}
+    try:
+        started = time.perf_counter()
+        records = audit.analyze_files(files, args.year, args.workers, use_cache=not args.no_cache, tables=args.tables,
+                                     split=args.split, page_workers=args.page_workers,
+                                     max_memory_mb=args.max_memory, use_templates=not args.no_templates)
+        count = 0
+        for record in records:
+            count += 1
+            failed += "error" in record
+            for stage, value in record.get("timings", {}).items():
+                stages[stage] = stages.get(stage, 0) + value
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if progress:
+                rate = count / (time.perf_counter() - started)
+                done = f"{count} bordro" if args.split else f"{count}/{len(files)} dosya"
+                print(f"\r{done} ({rate:,.1f} kayıt/sn)", end="", file=sys.stderr)
+        elapsed = time.perf_counter() - started
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+
+    if progress:
+        print(file=sys.stderr)
+    rate = count / elapsed if elapsed > 0 else 0
+    unit = "bordro" if args.split else "dosya"
+    print(f"{len(files)} dosya, {count} kayıt ({failed} hatalı) {elapsed:.2f} sn ({rate:,.1f} {unit}/sn)", file=sys.stderr)
+    if stages:
+        # İşçilerdeki toplam aşama süreleri (paralel koşuda duvar saatinden fazla olabilir)
+        summary = ", ".join(
+            f"{stage} {value:,.0f}" if stage == "table_pages" else f"{stage} {value / 1000:.2f} sn"
+            for stage, value in stages.items()
+        )
+        print(f"Aşamalar: {summary}", file=sys.stderr)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        return run_batch(argv[1:])
+    if argv and argv[0] == "scenario":
+        return run_scenario(argv[1:])
+    if argv and argv[0] == "analyze":
+        return run_analyze(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Türk Bordro Motoru CLI",
+        epilog="Toplu hesap için: cli.py batch <dosya>; senaryo karşılaştırması için: "
+               "cli.py scenario <dosya> <senaryolar.json>; toplu PDF analizi için: cli.py analyze <klasör> "
+               "(ayrıntı: --help)"
+    )
     parser.add_argument("--mode", choices=["gross_to_net", "net_to_gross"], required=True, help="Hesaplama modu")
     parser.add_argument("--amount", type=str, required=True, help="Tutar (Brüt veya Hedef Net)")
     parser.add_argument("--cum_base", type=str, default="0", help="Kümülatif GV Matrahı (Varsayılan: 0)")
     parser.add_argument("--type", choices=["normal_4a", "emekli_sgdp"], default="normal_4a", help="Çalışan Tipi")
+    parser.add_argument("--year", type=int, default=2026, help="Parametre yılı (Varsayılan: 2026)")
+    parser.add_argument("--month", type=int, default=1, help="Bordro ayı (1-12, Varsayılan: 1)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    year_params = params.load_params(2026)
+    year_params = params.get_year_params(args.year, args.month)
     amount = Decimal(args.amount)
     cum_base = Decimal(args.cum_base)
     
-    print(f"--- 2026 Bordro Hesabı ({args.mode}) ---")
+    print(f"--- {args.year}/{args.month:02d} Bordro Hesabı ({args.mode}) ---")
     print(f"Girdi Tutar: {amount}")
     print(f"Çalışan: {args.type}")
     print("-" * 30)
@@ -26,7 +201,8 @@ def main():
             gross=amount,
             cum_tax_base_prev=cum_base,
             employee_type=args.type,
-            year_params=year_params
+            year_params=year_params,
+            month=args.month
         )
         # Decimal'ları string'e çevirerek güzel basalım
         print(json.dumps(result, default=str, indent=2, ensure_ascii=False))
@@ -36,13 +212,14 @@ def main():
             target_net=amount,
             cum_tax_base_prev=cum_base,
             employee_type=args.type,
-            year_params=year_params
+            year_params=year_params,
+            month=args.month
         )
         print(f"Hedef Net: {amount} TL")
         print(f"Gereken Brüt: {gross} TL")
         print("-" * 30)
         print("Sağlama (Brütten Nete):")
-        result = payroll.calculate_pay_slip(gross, cum_base, args.type, year_params)
+        result = payroll.calculate_pay_slip(gross, cum_base, args.type, year_params, args.month)
         print(f"Hesaplanan Net: {result['net']} TL")
 
 if __name__ == "__main__":
@@ -6,10 +6,17 @@ hesaplama motoruyla karşılaştırır ve sade Türkçe yorumlar üretir.
 Karakter kodlama sorunu: Bazı PDF'lerde Türkçe harfler bozuk gelir.
 Ý→İ/I, Þ→Ş, Ð→Ğ, ý→ı  — Normalize fonksiyonu bunu düzeltir.
 """
+import os
 import re
-import pdfplumber
+import sqlite3
+import time
+from bisect import bisect_right
 from decimal import Decimal, InvalidOperation
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Iterator, Optional, List, Tuple, Union
+from core import params
+
+# Metin çıkarma veya parse kuralları değiştiğinde artırılır (önbellekteki eski sonuçlar kullanılmaz)
+ANALYZER_VERSION = "2"
 
 
 # ===== KARAKTERLERİ NORMALİZE ET =====
@@ -154,64 +161,342 @@ MONTH_NAMES_MAP = {
 }
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """PDF'den metin çıkarır ve Türkçe karakterleri normalize eder."""
-    full_text = ""
-    with pdfplumber.open(pdf_path) as pdf:
+# ===== DERLENMİŞ ALAN TARAYICISI =====
+# re.IGNORECASE'in eşit saydığı harfleri tek biçime indirir (İ/ı/I/i → i, ſ → s, Kelvin K → k)
+_CASE_FOLD = str.maketrans({"İ": "i", "ı": "i", "ſ": "s", "\u212a": "k", "\u212b": "å"})
+
+
+def _fold(text: str) -> str:
+    return text.translate(_CASE_FOLD).lower()
+
+
+def _required_literal(pattern: str) -> str:
+    """Kalıbın her eşleşmesinde geçmesi gereken en uzun düz harf dizisi (yoksa "")."""
+    if "|" in pattern:
+        return ""
+    runs, run, i = [], "", 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch.isalpha():
+            if i + 1 < len(pattern) and pattern[i + 1] in "?*{":
+                ch = ""  # isteğe bağlı harf
+            run += ch
+            if not ch:
+                runs.append(run)
+                run = ""
+            i += 1
+            continue
+        runs.append(run)
+        run = ""
+        if ch == "\\":
+            i += 2
+        elif ch == "[":
+            i = pattern.index("]", i + 1) + 1
+        else:
+            i += 1
+    runs.append(run)
+    return _fold(max(runs, key=len))
+
+
+# Alan → [(derlenmiş kalıp, zorunlu etiket harfleri)], öncelik sırasıyla
+_FIELD_REGEXES = {
+    field_name: [(re.compile(pattern, re.IGNORECASE), _required_literal(pattern)) for pattern in patterns]
+    for field_name, patterns in FIELD_PATTERNS.items()
+}
+
+
+# Okuma güvenini belirleyen alanlar
+CRITICAL_FIELDS = ("gross", "net", "sgk_employee", "income_tax")
+
+# Tablo çıkarma modları: "auto" kademeli, "always" her sayfada, "never" hiç
+TABLE_MODES = ("auto", "always", "never")
+
+
+def _page_tables(page) -> str:
+    lines = []
+    for table in page.extract_tables():
+        for row in table:
+            if row:
+                cells = [str(c).strip() if c else "" for c in row]
+                lines.append(" | ".join(cells) + "\n")
+    return "".join(lines)
+
+
+def _add_timing(timings: Dict[str, float], stage: str, value: float):
+    timings[stage] = timings.get(stage, 0) + value
+
+
+def _page_text(page, timings: Dict[str, float]) -> str:
+    """Sayfanın metin katmanı (normalize)."""
+    started = time.perf_counter()
+    text = page.extract_text()
+    _add_timing(timings, "text", time.perf_counter() - started)
+    return normalize_turkish(text + "\n") if text else ""
+
+
+def _missing_fields(text: str, fields: List[str]) -> List[str]:
+    folded = _fold(text)
+    return [f for f in fields if _find_field(text, f, folded) is None]
+
+
+def _join_with_tables(
+    pages: List[Any],
+    texts: List[str],
+    tables: str,
+    timings: Dict[str, float],
+    extracted: Optional[List[Optional[str]]] = None
+) -> str:
+    """
+    Sayfa grubunun (belge ya da tek bordro) metnini gerekiyorsa tablolarla birleştirir.
+    Tablo tespiti en pahalı aşama; "auto" modda yalnızca eksik kritik alan varken sayfa
+    sırasıyla yapılır. Sayfalar işi bitince kapatılır (önbellekleri boşaltılır).
+    extracted: işçilerde önceden çıkarılmış sayfa tabloları (None = çıkarılmadı).
+    """
+    started = time.perf_counter()
+    table_texts = [""] * len(pages)
+    missing = [] if tables == "never" else list(CRITICAL_FIELDS)
+    if tables == "auto":
+        missing = _missing_fields("".join(texts), missing)
+    for i, page in enumerate(pages):
+        if missing:
+            if extracted is not None and extracted[i] is not None:
+                table_texts[i] = extracted[i]
+            else:
+                table_texts[i] = normalize_turkish(_page_tables(page))
+                _add_timing(timings, "table_pages", 1)
+            if tables == "auto" and table_texts[i]:
+                missing = _missing_fields(table_texts[i], missing)
+        page.close()
+    _add_timing(timings, "tables", time.perf_counter() - started)
+    return "".join(text + table for text, table in zip(texts, table_texts))
+
+
+def _open_pdf(pdf_path: str, tables: str, timings: Dict[str, float]):
+    # pdfplumber (ve pdfminer) ağır; yalnızca PDF açıldığında yüklenir
+    import pdfplumber
+
+    if tables not in TABLE_MODES:
+        raise ValueError(f"Geçersiz tablo modu: {tables}")
+    started = time.perf_counter()
+    pdf = pdfplumber.open(pdf_path)
+    _add_timing(timings, "open", time.perf_counter() - started)
+    return pdf
+
+
+# ===== SAYFA PARALELLİĞİ =====
+# Bu sayıdan az sayfalı belgeler işçilere bölünmez (süreç başlatma maliyeti)
+PARALLEL_MIN_PAGES = 32
+# İşçi başına tahmini taban bellek (Python + pdfplumber), MB
+WORKER_MEMORY_MB = 64
+
+
+def page_workers(pdf_path: str, workers: int, max_memory_mb: Optional[float] = None) -> int:
+    """
+    Bellek tavanına sığan işçi sayısı. Her işçi dosyayı ayrıca açar ve sayfaları işledikçe
+    kapatır; işçi başına taban bellek + dosya boyutunun üç katı varsayılır.
+    """
+    if max_memory_mb is None or workers <= 1:
+        return max(1, workers)
+    per_worker = WORKER_MEMORY_MB + 3 * os.path.getsize(pdf_path) / (1024 * 1024)
+    return max(1, min(workers, int(max_memory_mb // per_worker)))
+
+
+def _extract_shard(job: Tuple[str, int, int, bool]) -> Tuple[List[str], List[Optional[str]], Dict[str, float]]:
+    """İşçi: sayfa aralığının (1 tabanlı, uçlar dahil) metinleri ve istenirse tabloları."""
+    import pdfplumber
+
+    pdf_path, first, last, with_tables = job
+    timings: Dict[str, float] = {}
+    texts: List[str] = []
+    table_texts: List[Optional[str]] = []
+    with pdfplumber.open(pdf_path, pages=range(first, last + 1)) as pdf:
         for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                full_text += text + "\n"
-            
-            # Tabloları da çıkar
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    if row:
-                        cells = [str(c).strip() if c else "" for c in row]
-                        full_text += " | ".join(cells) + "\n"
-    
-    # Türkçe karakter düzeltmesi
-    full_text = normalize_turkish(full_text)
-    return full_text
+            texts.append(_page_text(page, timings))
+            if with_tables:
+                started = time.perf_counter()
+                table_texts.append(normalize_turkish(_page_tables(page)))
+                _add_timing(timings, "tables", time.perf_counter() - started)
+                _add_timing(timings, "table_pages", 1)
+            else:
+                table_texts.append(None)
+            page.close()
+    return texts, table_texts, timings
+
+
+def _iter_pages(
+    pdf,
+    pdf_path: str,
+    tables: str,
+    timings: Dict[str, float],
+    workers: int = 1,
+    max_memory_mb: Optional[float] = None
+) -> Iterator[Tuple[Any, str, Optional[str]]]:
+    """
+    Belgenin sayfalarını sırayla (sayfa, metin, önceden çıkarılmış tablo) olarak verir.
+    workers > 1 ise sayfa aralıkları süreç havuzuna dağıtılır; sonuçlar sayfa sırasıyla
+    birleştirilir ve aynı anda yalnızca birkaç aralığın sonucu bellekte bekler.
+    """
+    from core.parallel import ordered_map
+
+    pages = pdf.pages
+    workers = page_workers(pdf_path, workers, max_memory_mb)
+    if workers <= 1 or len(pages) < PARALLEL_MIN_PAGES:
+        for page in pages:
+            yield page, _page_text(page, timings), None
+        return
+
+    # İşçi başına birkaç aralık: uzun sayfalar tek işçide birikmesin
+    size = max(PARALLEL_MIN_PAGES // 4, -(-len(pages) // (workers * 4)))
+    jobs = [(pdf_path, first, min(first + size - 1, len(pages)), tables == "always")
+            for first in range(1, len(pages) + 1, size)]
+    index = 0
+    for texts, table_texts, shard_timings in ordered_map(_extract_shard, jobs, workers):
+        for stage, value in shard_timings.items():
+            _add_timing(timings, stage, value)
+        for text, table in zip(texts, table_texts):
+            yield pages[index], text, table
+            index += 1
+
+
+def extract_text_from_pdf(
+    pdf_path: str,
+    tables: str = "auto",
+    timings: Optional[Dict[str, float]] = None,
+    workers: int = 1,
+    max_memory_mb: Optional[float] = None
+) -> str:
+    """
+    PDF'den metin çıkarır ve Türkçe karakterleri normalize eder.
+    tables: "auto" (kademeli) önce yalnızca metin katmanını okur; kritik alanlardan biri
+    bulunamazsa sayfa sırasıyla tablo çıkarır ve eksikler tamamlanınca durur.
+    "always" her sayfada tablo da çıkarır, "never" hiç çıkarmaz.
+    timings: verilirse aşama süreleri (sn) yazılır: "open", "text", "tables" ve "table_pages"
+    (paralel okumada işçilerin toplam süresi).
+    workers / max_memory_mb: büyük belgelerde sayfa aralıklarını paralel işleyecek işçi
+    sayısı ve tüm işçiler için bellek tavanı (MB).
+    """
+    timings = {} if timings is None else timings
+    timings.setdefault("table_pages", 0)
+    with _open_pdf(pdf_path, tables, timings) as pdf:
+        pages, texts, extracted = [], [], []
+        for page, text, table in _iter_pages(pdf, pdf_path, tables, timings, workers, max_memory_mb):
+            pages.append(page)
+            texts.append(text)
+            extracted.append(table)
+        return _join_with_tables(pages, texts, tables, timings, extracted)
+
+
+# Çalışan kimliği: aynı dosyadaki farklı çalışanların bordrolarını ayırmak için
+_EMPLOYEE_ID_RE = re.compile(r"T\.?\s*C\.?\s*K[İI]ML[İI]K\s*(?:NO)?\s*:?\s*(\d{11})", re.IGNORECASE)
+
+
+def employee_id(text: str) -> Optional[str]:
+    match = _EMPLOYEE_ID_RE.search(text)
+    return match.group(1) if match else None
+
+
+def iter_payslip_texts(
+    pdf_path: str,
+    tables: str = "auto",
+    timings: Optional[Dict[str, float]] = None,
+    workers: int = 1,
+    max_memory_mb: Optional[float] = None
+) -> Iterator[Tuple[int, int, str]]:
+    """
+    Çok çalışanlı (şirket) PDF'ini sayfa sayfa okur ve her bordroyu
+    (ilk sayfa, son sayfa, normalize metin) olarak sırayla verir.
+    Yeni bordro, sayfada mevcut bordroda zaten bulunmuş bir kritik alan (ör. ikinci bir
+    brüt) ya da farklı bir T.C. kimlik numarası görüldüğünde başlar; devam sayfaları
+    önceki bordroya eklenir. Bellekte yalnızca o anki bordronun sayfaları tutulur.
+    workers / max_memory_mb: `extract_text_from_pdf` ile aynı.
+    """
+    timings = {} if timings is None else timings
+    timings.setdefault("table_pages", 0)
+    with _open_pdf(pdf_path, tables, timings) as pdf:
+        pages: List[Any] = []
+        texts: List[str] = []
+        extracted: List[Optional[str]] = []
+        found: set = set()
+        employee: Optional[str] = None
+        for page, text, table in _iter_pages(pdf, pdf_path, tables, timings, workers, max_memory_mb):
+            page_found = set(CRITICAL_FIELDS) - set(_missing_fields(text, list(CRITICAL_FIELDS)))
+            page_employee = employee_id(text)
+
+            if pages and (page_found & found or (employee and page_employee and page_employee != employee)):
+                yield pages[0].page_number, pages[-1].page_number, _join_with_tables(pages, texts, tables, timings, extracted)
+                pages, texts, extracted, found, employee = [], [], [], set(), None
+
+            pages.append(page)
+            texts.append(text)
+            extracted.append(table)
+            found |= page_found
+            employee = employee or page_employee
+        if pages:
+            yield pages[0].page_number, pages[-1].page_number, _join_with_tables(pages, texts, tables, timings, extracted)
+
+
+_PERIOD_RE = re.compile(r"(\d{1,2})\s*/\s*(20\d{2})\s*AYI", re.IGNORECASE)
+_YEAR_RE = re.compile(r"20(2[4-9]|3[0-9])")
 
 
 def detect_period(text: str) -> Tuple[Optional[int], Optional[int]]:
     """Metinden bordro dönemini (ay/yıl) tespit eder."""
     # Format: 12/2025, 01/2026 vb.
-    match = re.search(r"(\d{1,2})\s*/\s*(20\d{2})\s*AYI", text, re.IGNORECASE)
+    match = _PERIOD_RE.search(text)
     if match:
         return int(match.group(1)), int(match.group(2))
     
+    year_match = _YEAR_RE.search(text)
+    year = int(year_match.group(0)) if year_match else None
+
     # Format: OCAK 2026
-    for name, num in MONTH_NAMES_MAP.items():
-        if name.upper() in text.upper():
-            year_match = re.search(r"20(2[4-9]|3[0-9])", text)
-            if year_match:
-                return num, int(year_match.group(0))
+    if year is not None:
+        upper_text = text.upper()
+        for name, num in MONTH_NAMES_MAP.items():
+            if name.upper() in upper_text:
+                return num, year
     
     # Sadece yıl
-    year_match = re.search(r"20(2[4-9]|3[0-9])", text)
-    year = int(year_match.group(0)) if year_match else None
     return None, year
 
 
-def parse_payslip(text: str) -> Dict:
-    """Bordro metnini parse ederek alanları çıkarır."""
+def _find_field(text: str, field_name: str, folded: Optional[str] = None, memo: Optional[Dict] = None) -> Optional[Decimal]:
+    """
+    Alanın ilk eşleşen (ve geçerli değer veren) kalıptaki değeri.
+    folded: metnin `_fold` hali; etiketi metinde hiç geçmeyen kalıplar taranmaz.
+    memo: aynı metinde birden çok alanda kullanılan kalıpların sonuçları.
+    """
+    folded = _fold(text) if folded is None else folded
+    for regex, literal in _FIELD_REGEXES[field_name]:
+        if literal not in folded:
+            continue
+        if memo is not None and regex.pattern in memo:
+            val = memo[regex.pattern]
+        else:
+            match = regex.search(text)
+            val = parse_money_turkish(match.group(1).strip()) if match else None
+            if memo is not None:
+                memo[regex.pattern] = val
+        if val is not None and val >= 0:
+            return val
+    return None
+
+
+def _scan_fields(text: str) -> Dict[str, Decimal]:
+    """Metindeki bilinen alanlar (her alan için öncelikli ilk geçerli eşleşme)."""
     result = {}
-    
-    for field_name, patterns in FIELD_PATTERNS.items():
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                raw_value = match.group(1).strip()
-                val = parse_money_turkish(raw_value)
-                if val is not None and val >= 0:
-                    result[field_name] = val
-                    break
-    
-    # Dönem tespiti
-    month, year = detect_period(text)
+    # Metin bir kez katlanır; her kalıp yalnızca etiketi metinde geçiyorsa çalışır
+    folded = _fold(text)
+    memo: Dict[str, Optional[Decimal]] = {}
+    for field_name in FIELD_PATTERNS:
+        val = _find_field(text, field_name, folded, memo)
+        if val is not None:
+            result[field_name] = val
+    return result
+
+
+def _finish_parsed(result: Dict, month: Optional[int], year: Optional[int], generic_pairs: List[Dict]) -> Dict:
+    """Alan değerlerine dönem, jenerik çiftler ve okuma güveni bilgisini ekler."""
     result["detected_month"] = month
     result["detected_year"] = year
     
@@ -223,26 +508,34 @@ def parse_payslip(text: str) -> Dict:
                 break
     
     # Jenerik etiket:değer çıkarma (tanınmayan formatlar için fallback)
-    result["_generic_pairs"] = extract_generic_pairs(text)
+    result["_generic_pairs"] = generic_pairs
     
     # Kritik alanların bulunma durumu
-    critical_fields = ["gross", "net", "sgk_employee", "income_tax"]
-    found_critical = sum(1 for f in critical_fields if f in result)
-    result["_parse_confidence"] = found_critical / len(critical_fields)
+    found_critical = sum(1 for f in CRITICAL_FIELDS if f in result)
+    result["_parse_confidence"] = found_critical / len(CRITICAL_FIELDS)
     result["_found_fields"] = [k for k in result if not k.startswith("_") and k not in ("detected_month", "detected_year") and isinstance(result[k], Decimal)]
-    result["_missing_critical"] = [f for f in critical_fields if f not in result]
+    result["_missing_critical"] = [f for f in CRITICAL_FIELDS if f not in result]
     
     return result
 
 
+def parse_payslip(text: str) -> Dict:
+    """Bordro metnini parse ederek alanları çıkarır."""
+    month, year = detect_period(text)
+    return _finish_parsed(_scan_fields(text), month, year, extract_generic_pairs(text))
+
+
+# Pattern: ETIKET: 1 234.56 veya ETİKET: 1.234,56
+_GENERIC_PAIR_RE = re.compile(r'([A-ZÇĞİÖŞÜa-zçğıöşü\.\s]{3,40})\s*:\s*([\d][\d\s\.\,]+\d)')
+MAX_GENERIC_PAIRS = 20
+
+
 def extract_generic_pairs(text: str) -> List[Dict]:
     """Metindeki tüm etiket:sayı çiftlerini jenerik olarak çıkarır.
     Tanınmayan bordro formatları için fallback olarak kullanılır."""
     pairs = []
-    # Pattern: ETIKET: 1 234.56 veya ETİKET: 1.234,56
-    pattern = r'([A-ZÇĞİÖŞÜa-zçğıöşü\.\s]{3,40})\s*:\s*([\d][\d\s\.\,]+\d)'
     
-    for match in re.finditer(pattern, text):
+    for match in _GENERIC_PAIR_RE.finditer(text):
         label = match.group(1).strip()
         raw_val = match.group(2).strip()
         val = parse_money_turkish(raw_val)
@@ -258,15 +551,31 @@ def extract_generic_pairs(text: str) -> List[Dict]:
                 "value": str(val),
                 "raw": raw_val
             })
+            # En fazla 20 çift döndür; gerisi taranmaz
+            if len(pairs) == MAX_GENERIC_PAIRS:
+                break
     
-    # En fazla 20 çift döndür
-    return pairs[:20]
+    return pairs
 
 
-def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
-    """Parse edilmiş bordroyu analiz eder ve yorumlar üretir."""
+def analyze_payslip(
+    parsed: Dict,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month: Optional[int] = None
+) -> Dict:
+    """
+    Parse edilmiş bordroyu analiz eder ve yorumlar üretir.
+    Beklenen değerler bordroda tespit edilen ayın (yoksa `month`un) dönem parametreleriyle hesaplanır.
+    """
     from core import payroll
     
+    month = parsed.get("detected_month") or month
+    year = parsed.get("detected_year")
+    year_params = params.as_year_params(year_params)
+    if month:
+        year_params = year_params.for_month(month)
+    expected_sgk_rate, expected_unemp_rate = year_params.employee_rates("normal_4a")
+    
     findings = []
     warnings = []
     explanations = []
@@ -290,10 +599,6 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
     unit_wage = parsed.get("unit_wage")
     net_paid = parsed.get("net_paid")
     
-    min_wage = Decimal(str(year_params.get("min_wage_gross", 0)))
-    month = parsed.get("detected_month")
-    year = parsed.get("detected_year")
-    
     MONTH_TR = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
                 'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
     
@@ -335,11 +640,10 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
             sgk_rate_actual = (sgk / sgk_base * 100).quantize(Decimal("0.1"))
             explanations.append(f"   → SGK matrahı: {sgk_base:,.2f} TL × %{sgk_rate_actual} = {sgk:,.2f} TL")
             
-            expected_sgk_rate = Decimal(str(year_params.get("rates", {}).get("normal_4a", {}).get("sgk_employee", "0.14")))
             expected_sgk = (sgk_base * expected_sgk_rate).quantize(Decimal("0.01"))
             diff = abs(sgk - expected_sgk)
             
-            sgk_ceiling = Decimal(str(year_params.get("sgk_ceiling_monthly", 0)))
+            sgk_ceiling = year_params.sgk_ceiling_monthly
             if sgk_base < gross and sgk_ceiling > 0:
                 if abs(sgk_base - sgk_ceiling) < Decimal("100"):
                     explanations.append(f"📌 Brüt geliriniz SGK tavanını aşıyor. SGK matrahı tavandan ({sgk_ceiling:,.2f} TL) hesaplanmış.")
@@ -354,7 +658,6 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
         explanations.append(f"📋 İşsizlik sigortası (işçi payı): **{unemp:,.2f} TL**")
         
         if sgk_base:
-            expected_unemp_rate = Decimal(str(year_params.get("rates", {}).get("normal_4a", {}).get("unemployment_employee", "0.01")))
             expected_unemp = (sgk_base * expected_unemp_rate).quantize(Decimal("0.01"))
             diff = abs(unemp - expected_unemp)
             if diff <= Decimal("5"):
@@ -374,31 +677,21 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
     
     # ===== KÜMÜLATİF VERGİ DİLİMİ =====
     if cum_base:
-        tariff = year_params.get("income_tax_tariff", [])
-        current_bracket = None
-        for i, bracket in enumerate(tariff):
-            limit = bracket.get("up_to")
-            rate = Decimal(str(bracket.get("rate", 0)))
-            if limit is None or cum_base <= Decimal(str(limit)):
-                current_bracket = (i + 1, rate)
-                break
+        tariff = year_params.tariff
+        i = tariff.bracket_index(cum_base)
+        bracket_num, bracket_rate = i + 1, tariff.rates[i]
+        pct = (bracket_rate * 100).quantize(Decimal("0.1"))
+        explanations.append(f"📈 Kümülatif GV matrahı: **{cum_base:,.2f} TL** → Şu an **{bracket_num}. dilimdesiniz (%{pct})**")
         
-        if current_bracket:
-            bracket_num, bracket_rate = current_bracket
-            pct = (bracket_rate * 100).quantize(Decimal("0.1"))
-            explanations.append(f"📈 Kümülatif GV matrahı: **{cum_base:,.2f} TL** → Şu an **{bracket_num}. dilimdesiniz (%{pct})**")
-            
-            # Sonraki dilime ne kadar kaldığını hesapla
-            for bracket in tariff:
-                limit = bracket.get("up_to")
-                if limit and cum_base < Decimal(str(limit)):
-                    remaining = Decimal(str(limit)) - cum_base
-                    next_rate = Decimal(str(bracket.get("rate", 0))) * 100
-                    explanations.append(f"   → Bir sonraki dilime (%{next_rate.quantize(Decimal('0.1'))}) **{remaining:,.2f} TL** kaldı.")
-                    break
-            
-            if bracket_num >= 2:
-                explanations.append("💡 Yılın başında %15 ile başlayan verginiz, kümülatif matrahınız arttıkça üst dilimlere geçer. Yıl sonuna doğru daha fazla vergi kesilmesi normaldir.")
+        # Sonraki dilime ne kadar kaldığını hesapla
+        j = bisect_right(tariff.bounds, cum_base)
+        if j < len(tariff.bounds):
+            remaining = tariff.bounds[j] - cum_base
+            next_rate = tariff.rates[j] * 100
+            explanations.append(f"   → Bir sonraki dilime (%{next_rate.quantize(Decimal('0.1'))}) **{remaining:,.2f} TL** kaldı.")
+        
+        if bracket_num >= 2:
+            explanations.append("💡 Yılın başında %15 ile başlayan verginiz, kümülatif matrahınız arttıkça üst dilimlere geçer. Yıl sonuna doğru daha fazla vergi kesilmesi normaldir.")
     
     # ===== DAMGA VERGİSİ =====
     if stamp_tax:
@@ -407,13 +700,13 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
             explanations.append(f"🛡️ DV istisnası (asgari ücret): **{dv_exemption:,.2f} TL**")
         
         if gross:
-            stamp_rate = Decimal(str(year_params.get("stamp_rate", "0.00759")))
+            stamp_rate = year_params.stamp_rate
             expected_dv_gross = (gross * stamp_rate).quantize(Decimal("0.01"))
             
             if dv_exemption:
                 expected_dv_net = max(expected_dv_gross - dv_exemption, Decimal("0"))
             else:
-                min_wage_dv = (min_wage * stamp_rate).quantize(Decimal("0.01"))
+                min_wage_dv = year_params.stamp_exemption.quantize(Decimal("0.01"))
                 expected_dv_net = max(expected_dv_gross - min_wage_dv, Decimal("0"))
             
             diff = abs(stamp_tax - expected_dv_net)
@@ -431,6 +724,8 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
     
     # ===== DOĞRULAMA =====
     if gross and sgk and income_tax:
+        if not month:
+            warnings.append("⚠️ Bordro dönemi (ay) tespit edilemedi; doğrulama hesabı Ocak ayı parametreleriyle yapıldı.")
         try:
             # Motor ile hesapla
             calc_result = payroll.calculate_pay_slip(
@@ -502,3 +797,117 @@ def analyze_payslip(parsed: Dict, year_params: Dict) -> Dict:
         "generic_pairs": generic_pairs if confidence < 0.75 else [],
         "parse_confidence": confidence,
     }
+
+
+def _read_with_templates(pdf_path: str, store, tables: str, timings: Dict[str, float]) -> Tuple[str, Dict]:
+    """
+    Kısa belgelerde önce kelime kutularından yerleşim şablonu aranır; uyan şablon varsa
+    alanlar yalnızca şablon bölgelerinden okunur. Yoksa aynı sayfalardan tam okuma yapılır
+    (kelimeler için yorumlanan sayfa düzeni metin katmanında yeniden kullanılır) ve güven
+    1.0 ise şablon öğrenilir.
+    """
+    from core import layout
+
+    timings.setdefault("table_pages", 0)
+    with _open_pdf(pdf_path, tables, timings) as pdf:
+        pages = pdf.pages
+        words = None
+        if len(pages) <= layout.MAX_PAGES:
+            started = time.perf_counter()
+            words = [layout.page_words(page) for page in pages]
+            _add_timing(timings, "words", time.perf_counter() - started)
+            started = time.perf_counter()
+            found = store.lookup(words)
+            if found is not None:
+                fields, (month, year) = found
+                text = layout.document_text(words)
+                _add_timing(timings, "template", time.perf_counter() - started)
+                return text, _finish_parsed(fields, month, year, [])
+            _add_timing(timings, "template", time.perf_counter() - started)
+        text = _join_with_tables(pages, [_page_text(page, timings) for page in pages], tables, timings)
+
+    started = time.perf_counter()
+    parsed = parse_payslip(text)
+    timings["parse"] = time.perf_counter() - started
+    if words is not None and parsed["_parse_confidence"] == 1.0:
+        started = time.perf_counter()
+        try:
+            store.learn(words, text)
+        except sqlite3.Error:
+            pass
+        timings["learn"] = time.perf_counter() - started
+    return text, parsed
+
+
+def read_payslip(
+    pdf_path: str,
+    cache: Any = True,
+    tables: str = "auto",
+    timings: Optional[Dict[str, float]] = None,
+    workers: int = 1,
+    max_memory_mb: Optional[float] = None,
+    templates: Any = True
+) -> Tuple[str, Dict]:
+    """
+    PDF'in normalize metnini ve parse sonucunu döner.
+    cache: True → varsayılan önbellek, False/None → önbelleği atla, ya da bir `PdfCache`.
+    Önbellekte varsa PDF hiç açılmaz (anahtar: içerik özeti + ANALYZER_VERSION + tablo modu).
+    tables / timings / workers / max_memory_mb: `extract_text_from_pdf` seçenekleri;
+    timings'e ayrıca "parse" (ya da önbellekten okunduysa "cache") süresi yazılır.
+    templates: True → varsayılan yerleşim şablonları, False/None → kullanma, ya da bir
+    `layout.TemplateStore`. Şablonlar tablo modu "always" iken ve paralel okumada kullanılmaz.
+    """
+    from core import layout, pdf_cache
+
+    timings = {} if timings is None else timings
+    if cache is True:
+        cache = pdf_cache.get_default_cache()
+
+    key = None
+    if cache:
+        started = time.perf_counter()
+        key = f"{pdf_cache.file_digest(pdf_path)}:{ANALYZER_VERSION}:{tables}"
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            timings["cache"] = time.perf_counter() - started
+            return cached
+
+    if tables == "always" or workers > 1:
+        templates = None
+    elif templates is True:
+        templates = layout.get_default_store()
+
+    if templates:
+        text, parsed = _read_with_templates(pdf_path, templates, tables, timings)
+    else:
+        text = extract_text_from_pdf(pdf_path, tables, timings, workers, max_memory_mb)
+        started = time.perf_counter()
+        parsed = parse_payslip(text)
+        timings["parse"] = time.perf_counter() - started
+
+    if key is not None:
+        try:
+            cache.put(key, text, parsed)
+        except sqlite3.Error:
+            pass  # Önbellek yazılamazsa analiz yine de sürer
+    return text, parsed
+
+
+def analyze_pdf(
+    pdf_path: str,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    cache: Any = True,
+    month: Optional[int] = None
+) -> Dict:
+    """PDF bordroyu okur, alanlarını çıkarır ve analiz eder (month: dönem tespit edilemezse kullanılacak ay)."""
+    raw_text, parsed = read_payslip(pdf_path, cache)
+    if not raw_text or len(raw_text.strip()) < 20:
+        raise ValueError("PDF'den metin çıkarılamadı. Dosya taranmış bir görüntü olabilir.")
+
+    analysis = analyze_payslip(parsed, year_params, month)
+    analysis["raw_text_preview"] = raw_text[:2000]  # İlk 2000 karakter
+    analysis["filename"] = os.path.basename(pdf_path)
+    return analysis
@@ -0,0 +1,169 @@
+"""
+Toplu PDF Bordro Denetimi
+Bir klasördeki (veya glob kalıbına uyan) tüm bordro PDF'lerini süreç havuzunda
+analiz eder: `extract_text_from_pdf` → `parse_payslip` → `analyze_payslip`.
+Sonuçlar girdi sırasıyla, dosya başına bir kayıt olarak akar; okunamayan bir dosya
+yalnızca kendi kaydında `error` ile işaretlenir, işin geri kalanı sürer.
+
+Her dosya, bordrodan tespit edilen dönemin (yıl / ay) parametreleriyle analiz edilir;
+dönem bulunamazsa ya da o yılın parametre dosyası yoksa varsayılan yıl kullanılır.
+
+Bordro sağlayıcılarının çok çalışanlı (şirket) PDF'leri `split=True` ile çalışan başına
+ayrılır: sayfalar sırayla okunur, her bordro tamamlandığında analiz edilip kaydı verilir.
+"""
+import glob
+import os
+import time
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core import analyzer, params
+from core.parallel import ordered_map
+
+DEFAULT_YEAR = 2026
+
+
+def find_pdfs(paths: Iterable[str]) -> List[str]:
+    """Klasörleri (alt klasörlerle), glob kalıplarını ve dosyaları sıralı, tekil PDF listesine açar."""
+    found: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, "**", "*"), recursive=True)
+        elif glob.has_magic(path):
+            matches = glob.glob(path, recursive=True)
+        else:
+            matches = [path]
+        found += sorted(m for m in matches if m.lower().endswith(".pdf") and not os.path.isdir(m))
+    return list(dict.fromkeys(found))
+
+
+def period_params(parsed: Dict[str, Any], default_year: int = DEFAULT_YEAR) -> params.YearParams:
+    """Bordroda tespit edilen dönemin parametreleri (yoksa varsayılan yıl)."""
+    year = parsed.get("detected_year")
+    if year not in params.get_registry().years():
+        year = default_year
+    return params.get_year_params(year, parsed.get("detected_month") or 1)
+
+
+def analyze_file(
+    path: str,
+    default_year: int = DEFAULT_YEAR,
+    cache: Any = True,
+    tables: str = "auto",
+    page_workers: int = 1,
+    max_memory_mb: Optional[float] = None,
+    templates: Any = True
+) -> Dict[str, Any]:
+    """
+    Tek PDF'i analiz eder; hata durumunda `error` alanlı kayıt döner.
+    cache / tables: `analyzer.read_payslip` seçenekleri (cache=False: her dosyayı yeniden oku).
+    page_workers / max_memory_mb: büyük belgenin sayfalarını paralel okuyacak işçi sayısı
+    ve bellek tavanı (MB).
+    templates: yerleşim şablonları (`analyzer.read_payslip`; False: her dosyayı tam oku).
+    Kayıttaki "timings" aşama sürelerini (ms) içerir.
+    """
+    record: Dict[str, Any] = {"file": path}
+    timings: Dict[str, float] = {}
+    try:
+        text, parsed = analyzer.read_payslip(path, cache, tables, timings, page_workers, max_memory_mb, templates)
+        return _analyzed(record, text, parsed, default_year)
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+    finally:
+        record["timings"] = _timings_ms(timings)
+
+
+def _timings_ms(timings: Dict[str, float]) -> Dict[str, float]:
+    return {stage: value if stage == "table_pages" else round(value * 1000, 2) for stage, value in timings.items()}
+
+
+def _analyzed(record: Dict[str, Any], text: str, parsed: Dict[str, Any], default_year: int) -> Dict[str, Any]:
+    if not text or len(text.strip()) < 20:
+        raise ValueError("PDF'den metin çıkarılamadı. Dosya taranmış bir görüntü olabilir.")
+    analysis = analyzer.analyze_payslip(parsed, period_params(parsed, default_year))
+    record.update(
+        detected_month=analysis["detected_month"],
+        detected_year=analysis["detected_year"],
+        parse_confidence=analysis["parse_confidence"],
+        missing_critical=parsed["_missing_critical"],
+        parsed_fields=analysis["parsed_fields"],
+        findings=analysis["findings"],
+        warnings=analysis["warnings"],
+    )
+    return record
+
+
+def iter_file_payslips(
+    path: str,
+    default_year: int = DEFAULT_YEAR,
+    tables: str = "auto",
+    page_workers: int = 1,
+    max_memory_mb: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Çok çalışanlı PDF'teki her bordro için (sayfa aralığı ve varsa T.C. kimlik no ile)
+    bir kayıt verir. Dosya okunamazsa ya da okuma yarıda kesilirse `error` kaydı verilir.
+    Sabit bellek: bir anda yalnızca işlenen bordronun sayfaları tutulur.
+    page_workers / max_memory_mb: `analyze_file` ile aynı.
+    """
+    timings: Dict[str, float] = {}
+    previous: Dict[str, float] = {}
+    try:
+        for first_page, last_page, text in analyzer.iter_payslip_texts(path, tables, timings, page_workers, max_memory_mb):
+            record: Dict[str, Any] = {"file": path, "pages": [first_page, last_page]}
+            employee = analyzer.employee_id(text)
+            if employee:
+                record["employee_id"] = employee
+            started = time.perf_counter()
+            try:
+                _analyzed(record, text, analyzer.parse_payslip(text), default_year)
+            except ValueError as e:
+                record["error"] = str(e)
+            timings["analyze"] = timings.get("analyze", 0) + time.perf_counter() - started
+            # Bu bordroya düşen aşama süreleri (belge açılışı ilk bordroya yazılır)
+            record["timings"] = _timings_ms({k: v - previous.get(k, 0) for k, v in timings.items()})
+            previous = dict(timings)
+            yield record
+    except Exception as e:
+        yield {"file": path, "error": str(e)}
+
+
+def _file_payslips(path: str, **options) -> List[Dict[str, Any]]:
+    return list(iter_file_payslips(path, **options))
+
+
+def analyze_files(
+    paths: Iterable[str],
+    default_year: int = DEFAULT_YEAR,
+    workers: int = 1,
+    max_pending: Optional[int] = None,
+    use_cache: bool = True,
+    tables: str = "auto",
+    split: bool = False,
+    page_workers: int = 1,
+    max_memory_mb: Optional[float] = None,
+    use_templates: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    PDF'leri `workers` süreçte analiz eder; kayıtlar girdi sırasıyla döner.
+    use_cache: varsayılan PDF önbelleği kullanılsın mı (her işçi kendi bağlantısını açar).
+    use_templates: bilinen bordro yerleşimleri şablonla okunsun mu (`core.layout`).
+    tables: tablo çıkarma modu (`analyzer.TABLE_MODES`).
+    split: çok çalışanlı PDF'leri bordro başına kayıtlara ayır (önbellek kullanılmaz).
+    Tek süreçte kayıtlar okundukça akar; paralel koşuda bir dosyanın kayıtları dosya
+    bitince birlikte gelir.
+    page_workers / max_memory_mb: tek bir büyük belgenin sayfalarını paralel okuma
+    (genellikle workers=1 ile, az sayıda çok büyük dosya için).
+    """
+    options = dict(default_year=default_year, tables=tables, page_workers=page_workers, max_memory_mb=max_memory_mb)
+    if not split:
+        job = partial(analyze_file, cache=use_cache, templates=use_templates, **options)
+        yield from ordered_map(job, paths, workers, max_pending=max_pending)
+    elif workers <= 1:
+        for path in paths:
+            yield from iter_file_payslips(path, **options)
+    else:
+        job = partial(_file_payslips, **options)
+        for records in ordered_map(job, paths, workers, max_pending=max_pending):
+            yield from records
@@ -0,0 +1,455 @@
+"""
+Toplu Bordro Motoru (NumPy)
+Tüm çalışan dizisi için `payroll.calculate_pay_slip` ile aynı alanları sütun dizileri
+olarak üretir. Hesaplar `core.fixedpoint` ölçekleriyle int64 tamsayılarla yapılır;
+böylece her satır Decimal motoruyla kuruşu kuruşuna aynı sonucu verir.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core import params
+from core.fixedpoint import (
+    FIELDS, KURUS, TARIFF_RATE_SCALE, U1, U2, ShadowGuard, from_kurus, get_fixed_params, scaled,
+)
+
+# Çalışan tipi kodları (dizi girişlerinde tip yerine indeks verilebilir)
+EMPLOYEE_TYPES = tuple(params.SGK_RATE_KEYS)
+
+
+class BatchParams:
+    """`FixedParams`in dizi işlemlerine hazır (NumPy) hali."""
+    __slots__ = (
+        "ceiling", "sgk_rates", "unemployment_rates", "valid_types", "stamp_rate",
+        "stamp_exemptions", "income_tax_exemptions", "bounds", "lowers", "tariff_rates",
+        "prefix_tax",
+    )
+
+    def __init__(self, year_params: params.YearParams):
+        fp = get_fixed_params(year_params)
+        self.ceiling = fp.ceiling
+
+        sgk_rates = np.zeros(len(EMPLOYEE_TYPES), dtype=np.int64)
+        unemployment_rates = np.zeros(len(EMPLOYEE_TYPES), dtype=np.int64)
+        valid_types = np.zeros(len(EMPLOYEE_TYPES), dtype=bool)
+        for code, employee_type in enumerate(EMPLOYEE_TYPES):
+            if employee_type in fp.rates:
+                sgk_rates[code], unemployment_rates[code] = fp.rates[employee_type]
+                valid_types[code] = True
+        self.sgk_rates = sgk_rates
+        self.unemployment_rates = unemployment_rates
+        self.valid_types = valid_types
+
+        self.stamp_rate = fp.stamp_rate
+        # Aylık istisna çizelgesi (indeks = ay)
+        self.stamp_exemptions = np.array(fp.stamp_exemptions, dtype=np.int64)
+        self.income_tax_exemptions = np.array(fp.income_tax_exemptions, dtype=np.int64)
+        self.bounds = np.array(fp.bounds, dtype=np.int64)
+        self.lowers = np.array(fp.lowers, dtype=np.int64)
+        self.tariff_rates = np.array(fp.tariff_rates, dtype=np.int64)
+        self.prefix_tax = np.array(fp.prefix_tax, dtype=np.int64)
+
+    def liability(self, cumulative_base: np.ndarray) -> np.ndarray:
+        """Kümülatif matrahların (U1) toplam vergisi (U2); `CompiledTariff.liability` ile aynı."""
+        k = np.searchsorted(self.bounds, cumulative_base, side="left")
+        return self.prefix_tax[k] + (cumulative_base - self.lowers[k]) * self.tariff_rates[k]
+
+
+@lru_cache(maxsize=8)
+def _batch_params(year_params: params.YearParams) -> BatchParams:
+    return BatchParams(year_params)
+
+
+def get_batch_params(year_params: Union[Dict[str, Any], params.YearParams]) -> BatchParams:
+    """`YearParams` başına bir kez derlenen toplu motor parametreleri."""
+    year_params = params.as_year_params(year_params)
+    return _batch_params(year_params)
+
+
+def round_half_up(values: np.ndarray, divisor: int) -> np.ndarray:
+    """Tamsayıları `divisor`a bölerek ROUND_HALF_UP (sıfırdan uzağa) yuvarlar."""
+    half = divisor // 2
+    return np.where(values < 0, -((-values + half) // divisor), (values + half) // divisor)
+
+
+# Ara tutarlar kuruş × U2 ölçeğinde int64 tutulur; taşmaması için tutar sınırı (kuruş).
+# Brüt + kümülatif matrah toplamına ve netten brüte arama aralığına pay bırakılmıştır.
+MAX_KURUS = np.iinfo(np.int64).max // (U2 * 8)
+
+
+def _out_of_range(value) -> ValueError:
+    return ValueError(f"Tutar desteklenen aralığın dışında: {value} (en fazla {MAX_KURUS // KURUS} TL)")
+
+
+def check_kurus(values: np.ndarray) -> np.ndarray:
+    """Kuruş dizisinin int64 hesaplarda taşmayacak aralıkta olduğunu doğrular."""
+    if values.size:
+        bad = (values > MAX_KURUS) | (values < -MAX_KURUS)
+        if bad.any():
+            raise _out_of_range(from_kurus(int(values[bad][0])))
+    return values
+
+
+def to_kurus(values) -> np.ndarray:
+    """
+    Tutarları (Decimal, str, int, float; TL) kuruş cinsinden int64 diziye çevirir.
+    Sayı olmayan, sonsuz / NaN ya da `MAX_KURUS` sınırını aşan tutarlarda ValueError.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        if not np.isfinite(values).all():
+            raise ValueError(f"Geçersiz tutar: {values[~np.isfinite(values)][0]}")
+        # Diğer yollar gibi yarım kuruş sıfırdan uzağa yuvarlanır (ROUND_HALF_UP)
+        scaled = np.abs(values) * KURUS
+        kurus = np.floor(scaled + 0.5)
+        if kurus.size and kurus.max() > MAX_KURUS:
+            raise _out_of_range(values[kurus > MAX_KURUS][0])
+        # Yarım kuruşa çok yakın değerler (ör. 1.005 × 100 = 100.4999…) ikili gösterimden
+        # etkilenir; bunlar liste yoluyla aynı olması için metinden (Decimal) yuvarlanır
+        near = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-12 * np.maximum(scaled, 1.0)
+        kurus = np.copysign(kurus, values).astype(np.int64)
+        if near.any():
+            kurus[near] = _decimal_kurus(values[near].tolist())
+        return kurus
+    return _decimal_kurus(values)
+
+
+def _decimal_kurus(values) -> np.ndarray:
+    result = []
+    for v in values:
+        try:
+            amount = Decimal(str(v))
+        except InvalidOperation:
+            raise ValueError(f"Geçersiz tutar: {v}")
+        if not amount.is_finite():
+            raise ValueError(f"Geçersiz tutar: {v}")
+        kurus = int((amount * KURUS).to_integral_value(rounding=ROUND_HALF_UP))
+        if abs(kurus) > MAX_KURUS:
+            raise _out_of_range(v)
+        result.append(kurus)
+    return np.array(result, dtype=np.int64)
+
+
+def type_codes(employee_types) -> np.ndarray:
+    """Çalışan tiplerini (isim veya kod) `EMPLOYEE_TYPES` indekslerine çevirir."""
+    if isinstance(employee_types, str):
+        raise TypeError("Çalışan tipleri dizi olarak verilmelidir")
+    if isinstance(employee_types, np.ndarray) and employee_types.dtype.kind in "iu":
+        codes = employee_types.astype(np.int64)
+    else:
+        index = {name: code for code, name in enumerate(EMPLOYEE_TYPES)}
+        try:
+            codes = np.array([index[t] for t in employee_types], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Geçersiz çalışan tipi: {e.args[0]}")
+    if codes.size and (codes.min() < 0 or codes.max() >= len(EMPLOYEE_TYPES)):
+        raise ValueError("Geçersiz çalışan tipi kodu")
+    return codes
+
+
+def calculate_pay_slips(
+    gross,
+    cum_tax_base_prev,
+    employee_types,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month=1,
+    shadow: Optional[ShadowGuard] = None,
+    kurus: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    `calculate_pay_slip`in dizi karşılığı.
+    `gross` ve `cum_tax_base_prev` TL tutar dizileridir (kurus=True ise kuruş cinsinden
+    tamsayı dizileri, ör. `to_kurus` çıktısı); `employee_types` isim veya kod dizisidir.
+    `month` tek ay veya satır başına ay dizisidir.
+    Tüm çıktı sütunları kuruş cinsinden int64 dizilerdir.
+    `shadow` verilirse satırların bir örneklemi Decimal motoruyla denetlenir.
+    Yıl içinde parametreler değişiyorsa her satır, ayında geçerli dönemle hesaplanır.
+    """
+    year_params = params.as_year_params(year_params)
+    gross = as_kurus(gross, kurus)
+    cum_prev = as_kurus(cum_tax_base_prev, kurus)
+    codes = type_codes(employee_types)
+    if not (gross.shape == cum_prev.shape == codes.shape):
+        raise ValueError("Brüt, kümülatif matrah ve çalışan tipi dizileri aynı uzunlukta olmalı")
+    months = _months(month, gross.shape)
+
+    groups = _period_rows(year_params, months)
+    if len(groups) == 1:
+        return _pay_slips(gross, cum_prev, codes, groups[0][0], months, shadow)
+    result: Dict[str, np.ndarray] = {}
+    for period, rows in groups:
+        part = _pay_slips(gross[rows], cum_prev[rows], codes[rows], period, months[rows], shadow)
+        for field, column in part.items():
+            result.setdefault(field, np.empty(gross.shape, dtype=np.int64))[rows] = column
+    return result
+
+
+def _period_rows(year_params: params.YearParams, months: np.ndarray) -> List[Tuple[params.YearParams, Optional[np.ndarray]]]:
+    """
+    Satırları aylarında geçerli döneme göre gruplar: (dönem, satır indeksleri).
+    Tüm satırlar tek döneme düşüyorsa indeksler None'dır.
+    """
+    if months.ndim == 0:
+        return [(year_params.for_month(int(months)), None)]
+    starts = np.array(year_params.period_starts, dtype=np.int64)
+    index = np.searchsorted(starts, months, side="right") - 1
+    found = np.unique(index)
+    if len(found) <= 1:
+        start = int(starts[found[0]]) if len(found) else 1
+        return [(year_params.for_month(start), None)]
+    return [(year_params.for_month(int(starts[k])), np.flatnonzero(index == k)) for k in found]
+
+
+def _check_types(bp: BatchParams, codes: np.ndarray):
+    if codes.size and not bp.valid_types[codes].all():
+        invalid = EMPLOYEE_TYPES[int(codes[~bp.valid_types[codes]][0])]
+        raise ValueError(f"Geçersiz çalışan tipi: {invalid}")
+
+
+def _pay_slips(
+    gross: np.ndarray,
+    cum_prev: np.ndarray,
+    codes: np.ndarray,
+    year_params: params.YearParams,
+    months: np.ndarray,
+    shadow: Optional[ShadowGuard]
+) -> Dict[str, np.ndarray]:
+    """Tek bir dönemin satırları için `calculate_pay_slips`."""
+    bp = get_batch_params(year_params)
+    _check_types(bp, codes)
+
+    # PEK, SGK / İşsizlik kesintileri ve gelir vergisi matrahı (U1)
+    pek, sgk, unemployment, base_month = _deductions(bp, gross, codes)
+
+    # Kümülatif takip (U1)
+    cum_prev_u1 = cum_prev * U1
+    cum_new = cum_prev_u1 + base_month
+
+    # Gelir vergisi ve asgari ücret istisnası (U2)
+    tax_prev = bp.liability(cum_prev_u1)
+    income_tax_gross = bp.liability(cum_new) - tax_prev
+    income_tax_exemption = np.broadcast_to(bp.income_tax_exemptions[months], gross.shape)
+    income_tax_net = np.maximum(income_tax_gross - income_tax_exemption, 0)
+
+    # Damga vergisi (U1)
+    stamp_gross = gross * bp.stamp_rate
+    stamp_exemption = np.broadcast_to(bp.stamp_exemptions[months], gross.shape)
+    stamp_net = round_half_up(np.maximum(stamp_gross - stamp_exemption, 0), U1)
+
+    # Net (U2 → kuruş)
+    net = (gross * U2 - (sgk + unemployment) * TARIFF_RATE_SCALE
+           - income_tax_net - stamp_net * U2)
+
+    result = {
+        "gross": gross,
+        "pek": pek,
+        "sgk_employee": round_half_up(sgk, U1),
+        "unemployment_employee": round_half_up(unemployment, U1),
+        "income_tax_base_month": round_half_up(base_month, U1),
+        "cum_tax_base_prev": cum_prev,
+        "cum_tax_base_new": round_half_up(cum_new, U1),
+        "income_tax_gross": round_half_up(income_tax_gross, U2),
+        "income_tax_exemption": round_half_up(income_tax_exemption, U2),
+        "income_tax_net": round_half_up(income_tax_net, U2),
+        "stamp_tax_gross": round_half_up(stamp_gross, U1),
+        "stamp_tax_exemption": round_half_up(stamp_exemption, U1),
+        "stamp_tax_net": stamp_net,
+        "net": round_half_up(net, U2),
+    }
+
+    if shadow is not None:
+        for i in shadow.sample_indices(len(gross)):
+            shadow.compare(
+                row(result, i), from_kurus(int(gross[i])), from_kurus(int(cum_prev[i])),
+                EMPLOYEE_TYPES[int(codes[i])], year_params,
+                int(months[i]) if months.ndim else int(months)
+            )
+    return result
+
+
+def _months(month, shape) -> np.ndarray:
+    """Tek ay veya satır başına ay dizisini doğrular."""
+    months = np.asarray(month, dtype=np.int64)
+    if months.ndim and months.shape != shape:
+        raise ValueError("Ay dizisi brüt dizisiyle aynı uzunlukta olmalı")
+    if months.size and (months.min() < 1 or months.max() > 12):
+        invalid = int(months.min() if months.min() < 1 else months.max())
+        raise ValueError(f"Geçersiz ay: {invalid}")
+    return months
+
+
+def _deductions(bp: BatchParams, gross: np.ndarray, codes: np.ndarray):
+    """PEK (kuruş), SGK, işsizlik ve aylık gelir vergisi matrahı (U1)."""
+    pek = np.minimum(gross, bp.ceiling)
+    sgk = pek * bp.sgk_rates[codes]
+    unemployment = pek * bp.unemployment_rates[codes]
+    return pek, sgk, unemployment, gross * U1 - sgk - unemployment
+
+
+def find_gross_salaries(
+    target_net,
+    cum_tax_base_prev,
+    employee_types,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month=1,
+    kurus: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    `find_gross_salary`nin dizi karşılığı: tüm satırlar için netten brüte.
+    Kuruş cinsinden tüm satırlarda aynı anda ikili arama yapılır; her adımda yalnızca
+    net hesaplanır. Brüt asgari ücretin altına inmez.
+    "gross", "net" (ulaşılan net) ve "residual" (net - hedef) kuruş int64 dizileri döner.
+    Yıl içinde parametreler değişiyorsa her satır, ayında geçerli dönemle çözülür.
+    kurus: `calculate_pay_slips` ile aynı.
+    """
+    year_params = params.as_year_params(year_params)
+    target = as_kurus(target_net, kurus)
+    cum_prev = as_kurus(cum_tax_base_prev, kurus)
+    codes = type_codes(employee_types)
+    if not (target.shape == cum_prev.shape == codes.shape):
+        raise ValueError("Hedef net, kümülatif matrah ve çalışan tipi dizileri aynı uzunlukta olmalı")
+    months = _months(month, target.shape)
+
+    groups = _period_rows(year_params, months)
+    if len(groups) == 1:
+        return _solve_gross(target, cum_prev, codes, groups[0][0], months)
+    result: Dict[str, np.ndarray] = {}
+    for period, rows in groups:
+        for field, column in _solve_gross(target[rows], cum_prev[rows], codes[rows], period, months[rows]).items():
+            result.setdefault(field, np.empty(target.shape, dtype=np.int64))[rows] = column
+    return result
+
+
+def _solve_gross(
+    target: np.ndarray,
+    cum_prev: np.ndarray,
+    codes: np.ndarray,
+    year_params: params.YearParams,
+    months: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Tek bir dönemin satırları için `find_gross_salaries`."""
+    bp = get_batch_params(year_params)
+    _check_types(bp, codes)
+
+    cum_prev_u1 = cum_prev * U1
+    tax_prev = bp.liability(cum_prev_u1)
+    income_tax_exemption = bp.income_tax_exemptions[months]
+    stamp_exemption = bp.stamp_exemptions[months]
+
+    def net_for(gross: np.ndarray) -> np.ndarray:
+        _, sgk, unemployment, base_month = _deductions(bp, gross, codes)
+        income_tax_gross = bp.liability(cum_prev_u1 + base_month) - tax_prev
+        income_tax_net = np.maximum(income_tax_gross - income_tax_exemption, 0)
+        stamp_net = round_half_up(np.maximum(gross * bp.stamp_rate - stamp_exemption, 0), U1)
+        net = (gross * U2 - (sgk + unemployment) * TARIFF_RATE_SCALE
+               - income_tax_net - stamp_net * U2)
+        return round_half_up(net, U2)
+
+    # Arama aralığı: kesintiler negatif olmadığından brüt >= net; en yüksek kesinti
+    # oranlarıyla net >= brüt × (1 - oranlar) olduğundan üst sınır buradan bulunur
+    min_wage = scaled(year_params.min_wage_gross, KURUS)
+    max_rate = (int((bp.sgk_rates + bp.unemployment_rates).max()) * TARIFF_RATE_SCALE
+                + int(bp.tariff_rates.max()) * U1 + bp.stamp_rate * TARIFF_RATE_SCALE)
+    if max_rate >= U2:
+        raise ValueError("Kesinti oranları netten brüte çözüme izin vermiyor")
+    low = np.maximum(target, min_wage)
+    high = np.maximum(target * U2 // (U2 - max_rate) + KURUS, low)
+
+    # Değişmez: net(low) < hedef <= net(high); alt sınır zaten yetiyorsa sonuç odur
+    done = net_for(low) >= target
+    high = np.where(done, low, high)
+    while True:
+        active = high - low > 1
+        if not active.any():
+            break
+        mid = (low + high) // 2
+        reached = net_for(mid) >= target
+        high = np.where(active & reached, mid, high)
+        low = np.where(active & ~reached, mid, low)
+
+    # Kuruş yuvarlaması nedeniyle bir alttaki brüt hedefe daha yakın olabilir
+    net_high = net_for(high)
+    net_low = net_for(low)
+    use_low = ~done & (low >= min_wage) & (np.abs(net_low - target) < np.abs(net_high - target))
+    gross = np.where(use_low, low, high)
+    net = np.where(use_low, net_low, net_high)
+    return {"gross": gross, "net": net, "residual": net - target}
+
+
+def project_annual(
+    gross,
+    employee_types,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    cum_tax_base_start=None,
+    extras: Optional[Dict[int, Any]] = None,
+    kurus: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Tüm çalışanlar için 12 aylık bordro projeksiyonu.
+    gross: çalışan başına aylık brüt (N) veya ay ay brüt matrisi (N × 12; zam senaryoları için).
+    extras: ay (1-12) → o ay brüte eklenecek tutarlar (N veya tek tutar; ikramiye, yakacak vb.).
+    cum_tax_base_start: yıl başı (Ocak öncesi) kümülatif matrah (Varsayılan: 0).
+    kurus=True: tüm tutarlar kuruş cinsinden tamsayıdır.
+    Her alan için kuruş cinsinden N × 12 int64 matris döner (`calculate_pay_slips` alanları).
+    Kümülatif matrah, `calculate_pay_slip`i ay ay zincirlemekle aynı şekilde taşınır;
+    yıl içi dönemlerde her ay kendi döneminin parametreleriyle hesaplanır.
+    """
+    year_params = params.as_year_params(year_params)
+    codes = type_codes(employee_types)
+    n = len(codes)
+
+    if isinstance(gross, np.ndarray) and gross.ndim == 2:
+        monthly = as_kurus(gross.ravel(), kurus).reshape(gross.shape)
+    else:
+        monthly = np.repeat(as_kurus(gross, kurus)[:, None], 12, axis=1)
+    if monthly.shape != (n, 12):
+        raise ValueError("Brüt matrisi çalışan sayısı × 12 boyutunda olmalı")
+    monthly = monthly.copy()
+
+    for month, amounts in (extras or {}).items():
+        if not 1 <= month <= 12:
+            raise ValueError(f"Geçersiz ay: {month}")
+        if np.ndim(amounts) == 0:
+            amounts = [amounts] * n
+        monthly[:, month - 1] += as_kurus(amounts, kurus)
+
+    if cum_tax_base_start is None:
+        cum_start = np.zeros(n, dtype=np.int64)
+    else:
+        cum_start = as_kurus(cum_tax_base_start, kurus)
+
+    # Devreden matrah kuruşa yuvarlanmış olarak taşındığından aylık matrahların
+    # kuruş yuvarlanmış kümülatif toplamı her ayın başlangıç matrahını verir
+    base_month = np.empty(monthly.shape, dtype=np.int64)
+    for period, columns in _period_rows(year_params, np.arange(1, 13, dtype=np.int64)):
+        columns = slice(None) if columns is None else columns
+        _, _, _, base_month[:, columns] = _deductions(get_batch_params(period), monthly[:, columns], codes[:, None])
+    carried = np.cumsum(round_half_up(base_month, U1), axis=1)
+    cum_prev = cum_start[:, None] + np.concatenate([np.zeros((n, 1), dtype=np.int64), carried[:, :-1]], axis=1)
+
+    months = np.tile(np.arange(1, 13, dtype=np.int64), n)
+    flat = calculate_pay_slips(
+        monthly.ravel(), cum_prev.ravel(), np.repeat(codes, 12), year_params, month=months, kurus=True
+    )
+    return {field: column.reshape(n, 12) for field, column in flat.items()}
+
+
+def as_kurus(values, kurus: bool = False) -> np.ndarray:
+    """
+    Tutarları kuruş int64 diziye çevirir.
+    kurus=False: değerler TL'dir (tamsayı diziler de TL sayılır).
+    kurus=True: değerler zaten kuruş cinsinden tamsayıdır (ör. `to_kurus` çıktısı); yalnızca
+    aralık denetlenir.
+    """
+    if not kurus:
+        return to_kurus(values)
+    values = np.asarray(values)
+    if values.dtype.kind not in "iu":
+        raise ValueError("Kuruş dizisi tamsayı olmalı")
+    return check_kurus(values.astype(np.int64, copy=False))
+
+
+def row(result: Dict[str, np.ndarray], i: int) -> Dict[str, Decimal]:
+    """Toplu sonucun bir satırını `calculate_pay_slip` çıktısı biçiminde döndürür."""
+    return {field: from_kurus(int(result[field][i])) for field in FIELDS}
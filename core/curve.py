@@ -0,0 +1,184 @@
+"""
+Brüt → Net Eğrisi
+Sabit kümülatif matrah ve çalışan tipi için net maaş, brütün parçalı doğrusal
+bir fonksiyonudur. Kırılma noktaları: SGK tavanı, kümülatif matrahla kaydırılmış
+tarife sınırları, asgari ücret istisnasının doyduğu nokta ve damga istisnası.
+Her parça için net = a × brüt + b katsayıları tam (Decimal) olarak tutulur.
+
+Etkileşimli kullanım (kaydırıcı, tuş vuruşu) için eğriler `get_net_curve` ile
+sınırlı boyutlu bir önbellekte tutulur; ileri ve ters yön bordro motoruna inmeden
+eğri üzerinden hesaplanır.
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, List, Union
+from core import params
+from core.tax import round_decimal
+
+# Önbellekte tutulacak en fazla eğri sayısı
+CURVE_CACHE_SIZE = 256
+
+
+class NetCurve:
+    """Bir (parametre seti, kümülatif matrah, çalışan tipi) için brüt → net eğrisi."""
+    __slots__ = (
+        "starts", "slopes", "intercepts", "stamp_rate", "stamp_exemption",
+        "stamp_threshold",
+    )
+
+    def __init__(
+        self,
+        year_params: Union[Dict[str, Any], params.YearParams],
+        cum_tax_base_prev: Decimal,
+        employee_type: str,
+        month: int = 1
+    ):
+        # Ayın dönemi çözülür (dönem zaten çözülmüşse kendisi döner)
+        year_params = params.as_year_params(year_params).for_month(month)
+        tariff = year_params.tariff
+        rate_sgk, rate_unemp = year_params.employee_rates(employee_type)
+        deduction_rate = rate_sgk + rate_unemp
+        ceiling = year_params.sgk_ceiling_monthly
+        cum = cum_tax_base_prev
+
+        tax_prev = tariff.liability(cum)
+        exemption = year_params.exemptions.income_tax_exemption(month)
+
+        self.stamp_rate = year_params.stamp_rate
+        self.stamp_exemption = year_params.exemptions.stamp_exemption(month)
+        self.stamp_threshold = (
+            self.stamp_exemption / self.stamp_rate if self.stamp_rate > 0 else None
+        )
+
+        def gross_for_base(base: Decimal) -> Decimal:
+            # Aylık matrahı veren brüt (tavan altında matrah = brüt × (1 - kesinti oranı))
+            if base <= ceiling * (1 - deduction_rate):
+                return base / (1 - deduction_rate)
+            return base + ceiling * deduction_rate
+
+        # Kırılma noktaları (brüt cinsinden)
+        breakpoints = {ceiling}
+        if self.stamp_threshold is not None:
+            breakpoints.add(self.stamp_threshold)
+        for bound in tariff.bounds:
+            if bound > cum:
+                breakpoints.add(gross_for_base(bound - cum))
+        saturation = self._exemption_saturation(tariff, cum, tax_prev + exemption)
+        if saturation is not None:
+            breakpoints.add(gross_for_base(saturation))
+
+        starts = [Decimal("0")] + sorted(x for x in breakpoints if x > 0)
+        slopes: List[Decimal] = []
+        intercepts: List[Decimal] = []
+
+        for i, start in enumerate(starts):
+            # Parçanın rejimi (tavan, dilim, istisna) iç noktadan belirlenir
+            if i + 1 < len(starts):
+                probe = (start + starts[i + 1]) / 2
+            else:
+                probe = start + 1
+
+            if probe < ceiling:
+                base_slope, base_intercept = 1 - deduction_rate, Decimal("0")
+            else:
+                base_slope, base_intercept = Decimal("1"), -ceiling * deduction_rate
+
+            base = base_slope * probe + base_intercept
+            if tariff.liability(cum + base) - tax_prev > exemption:
+                k = tariff.bracket_index(cum + base)
+                rate = tariff.rates[k]
+                slopes.append(base_slope * (1 - rate))
+                intercepts.append(
+                    base_intercept
+                    - ((cum + base_intercept - tariff.lowers[k]) * rate
+                       + tariff.prefix_tax[k] - tax_prev - exemption)
+                )
+            else:
+                slopes.append(base_slope)
+                intercepts.append(base_intercept)
+
+        self.starts = tuple(starts)
+        self.slopes = tuple(slopes)
+        self.intercepts = tuple(intercepts)
+
+    @staticmethod
+    def _exemption_saturation(tariff, cum: Decimal, target_liability: Decimal):
+        """Brüt gelir vergisinin istisnaya eşitlendiği aylık matrah (tarifenin tersi)."""
+        for k in range(len(tariff.rates) - 1, -1, -1):
+            if tariff.prefix_tax[k] <= target_liability and tariff.rates[k] > 0:
+                total_base = tariff.lowers[k] + (target_liability - tariff.prefix_tax[k]) / tariff.rates[k]
+                return total_base - cum if total_base > cum else None
+        return None
+
+    def _segment(self, gross: Decimal) -> int:
+        return max(bisect_right(self.starts, gross) - 1, 0)
+
+    def _stamp_linear(self, gross: Decimal) -> Decimal:
+        return max(Decimal("0"), gross * self.stamp_rate - self.stamp_exemption)
+
+    def net(self, gross: Decimal) -> Decimal:
+        """Brütün neti; `payroll.calculate_pay_slip` ile kuruşu kuruşuna aynıdır."""
+        i = self._segment(gross)
+        before_stamp = self.slopes[i] * gross + self.intercepts[i]
+        return round_decimal(before_stamp - round_decimal(self._stamp_linear(gross)))
+
+    def gross_for_net(self, target_net: Decimal) -> Decimal:
+        """
+        Hedef neti veren brüt (yuvarlanmamış).
+        Damga vergisinin kuruş yuvarlaması hariç tutulur; kalan fark en fazla birkaç kuruştur.
+        """
+        def full_net(i: int, gross: Decimal) -> Decimal:
+            return self.slopes[i] * gross + self.intercepts[i] - self._stamp_linear(gross)
+
+        # Net brütle artan olduğundan hedefi içeren son parça aranır
+        i = 0
+        for j in range(1, len(self.starts)):
+            if full_net(j, self.starts[j]) <= target_net:
+                i = j
+            else:
+                break
+
+        start = self.starts[i]
+        stamp_slope = self.stamp_rate if self.stamp_threshold is not None and start >= self.stamp_threshold else Decimal("0")
+        stamp_intercept = -self.stamp_exemption if stamp_slope else Decimal("0")
+        return (target_net - self.intercepts[i] + stamp_intercept) / (self.slopes[i] - stamp_slope)
+
+
+_curve_cache: "OrderedDict[tuple, NetCurve]" = OrderedDict()
+_curve_cache_lock = threading.Lock()
+
+
+def get_net_curve(
+    year_params: Union[Dict[str, Any], params.YearParams],
+    cum_tax_base_prev: Decimal,
+    employee_type: str,
+    month: int = 1
+) -> NetCurve:
+    """
+    (parametre seti, çalışan tipi, kümülatif matrah, ay) için eğriyi ilk istekte kurar,
+    sonra önbellekten döndürür.
+    Anahtar parametrelerin içeriğinden türetildiğinden parametreler değişince eski
+    eğriler kullanılmaz; en uzun süredir kullanılmayanlar atılır.
+    """
+    year_params = params.as_year_params(year_params).for_month(month)
+    key = (year_params.fingerprint, employee_type, cum_tax_base_prev, month)
+
+    with _curve_cache_lock:
+        curve = _curve_cache.get(key)
+        if curve is not None:
+            _curve_cache.move_to_end(key)
+            return curve
+
+    curve = NetCurve(year_params, cum_tax_base_prev, employee_type, month)
+    with _curve_cache_lock:
+        _curve_cache[key] = curve
+        if len(_curve_cache) > CURVE_CACHE_SIZE:
+            _curve_cache.popitem(last=False)
+    return curve
+
+
+def clear_curve_cache():
+    with _curve_cache_lock:
+        _curve_cache.clear()
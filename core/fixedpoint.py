@@ -0,0 +1,255 @@
+"""
+Sabit Noktalı (Tamsayı Kuruş) Bordro Motoru
+Tüm parasal değerler kuruş cinsinden tamsayı, oranlar ölçekli tamsayı olarak tutulur;
+yuvarlama açıkça ROUND_HALF_UP (sıfırdan uzağa) yapılır. Sonuçlar Decimal motoruyla
+kuruşu kuruşuna aynıdır. Tekil (`calculate_pay_slip(..., fast=True)`) ve toplu
+(`core.batch`) hesaplar aynı ölçekli parametreleri kullanır.
+
+Birimler:
+  kuruş              = TL × 10^2   (brüt, tavan, çıktılar)
+  ara tutar (U1)     = kuruş × 10^5 (oran × kuruş: SGK, işsizlik, matrah, damga)
+  vergi tutarı (U2)  = U1 × 10^3    (tarife oranı × matrah)
+"""
+from bisect import bisect_left
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core import params
+
+# Ölçekler
+KURUS = 100
+RATE_SCALE = 10 ** 5
+TARIFF_RATE_SCALE = 10 ** 3
+U1 = RATE_SCALE
+U2 = RATE_SCALE * TARIFF_RATE_SCALE
+
+# `calculate_pay_slip` ile aynı sırada çıktı alanları
+FIELDS = (
+    "gross", "pek", "sgk_employee", "unemployment_employee", "income_tax_base_month",
+    "cum_tax_base_prev", "cum_tax_base_new", "income_tax_gross", "income_tax_exemption",
+    "income_tax_net", "stamp_tax_gross", "stamp_tax_exemption", "stamp_tax_net", "net",
+)
+
+
+def scaled(value: Decimal, scale: int) -> int:
+    """Decimal değeri tam sayı ölçeğine çevirir; tam temsil edilemiyorsa hata verir."""
+    product = value * scale
+    integral = product.to_integral_value()
+    if product != integral:
+        raise ValueError(f"{value} değeri 1/{scale} hassasiyetinde tam temsil edilemiyor")
+    return int(integral)
+
+
+def to_kurus(value: Decimal) -> Optional[int]:
+    """Tutarı kuruşa çevirir; kuruş altı hassasiyet varsa None döner."""
+    try:
+        return scaled(value, KURUS)
+    except ValueError:
+        return None
+
+
+def from_kurus(value: int) -> Decimal:
+    return Decimal(value).scaleb(-2)
+
+
+def format_kurus(value: int) -> str:
+    """Kuruş tutarını Decimal'a çevirmeden "1234.56" biçiminde yazar."""
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    return f"{sign}{value // 100}.{value % 100:02d}"
+
+
+def round_half_up(value: int, divisor: int) -> int:
+    """Tamsayıyı `divisor`a bölerek ROUND_HALF_UP (sıfırdan uzağa) yuvarlar."""
+    half = divisor // 2
+    if value < 0:
+        return -((-value + half) // divisor)
+    return (value + half) // divisor
+
+
+class FixedParams:
+    """Bir `YearParams` setinin ölçekli tamsayı hali."""
+    __slots__ = (
+        "ceiling", "rates", "stamp_rate", "stamp_exemptions", "income_tax_exemptions",
+        "bounds", "lowers", "tariff_rates", "prefix_tax",
+    )
+
+    def __init__(self, year_params: params.YearParams):
+        self.ceiling = scaled(year_params.sgk_ceiling_monthly, KURUS)
+        self.rates: Dict[str, Tuple[int, int]] = {
+            employee_type: (scaled(rate_sgk, RATE_SCALE), scaled(rate_unemp, RATE_SCALE))
+            for employee_type, (rate_sgk, rate_unemp) in year_params.rates.items()
+        }
+        self.stamp_rate = scaled(year_params.stamp_rate, RATE_SCALE)
+        # Aylık asgari ücret istisnaları (indeks = ay): damga U1, gelir vergisi U2
+        schedule = year_params.exemptions
+        self.stamp_exemptions: List[int] = [scaled(e, KURUS * U1) for e in schedule.stamp]
+        self.income_tax_exemptions: List[int] = [scaled(e, KURUS * U2) for e in schedule.income_tax]
+
+        tariff = year_params.tariff
+        self.bounds: List[int] = [scaled(b, KURUS * U1) for b in tariff.bounds]
+        self.lowers: List[int] = [scaled(b, KURUS * U1) for b in tariff.lowers]
+        self.tariff_rates: List[int] = [scaled(r, TARIFF_RATE_SCALE) for r in tariff.rates]
+        self.prefix_tax: List[int] = [scaled(p, KURUS * U2) for p in tariff.prefix_tax]
+
+    def employee_rates(self, employee_type: str) -> Tuple[int, int]:
+        try:
+            return self.rates[employee_type]
+        except KeyError:
+            raise ValueError(f"Geçersiz çalışan tipi: {employee_type}")
+
+    def exemptions(self, month: int) -> Tuple[int, int]:
+        """O ayın gelir vergisi (U2) ve damga vergisi (U1) istisnaları."""
+        if not 1 <= month <= 12:
+            raise ValueError(f"Geçersiz ay: {month}")
+        return self.income_tax_exemptions[month], self.stamp_exemptions[month]
+
+    def liability(self, cumulative_base: int) -> int:
+        """Kümülatif matrahın (U1) toplam vergisi (U2)."""
+        k = bisect_left(self.bounds, cumulative_base)
+        return self.prefix_tax[k] + (cumulative_base - self.lowers[k]) * self.tariff_rates[k]
+
+
+@lru_cache(maxsize=8)
+def _fixed_params(year_params: params.YearParams) -> FixedParams:
+    return FixedParams(year_params)
+
+
+def get_fixed_params(year_params: Union[Dict[str, Any], params.YearParams]) -> FixedParams:
+    """`YearParams` başına bir kez derlenen ölçekli parametreler."""
+    return _fixed_params(params.as_year_params(year_params))
+
+
+def is_representable(year_params: Union[Dict[str, Any], params.YearParams]) -> bool:
+    """Parametreler (tüm dönemleriyle) sabit noktalı ölçeklerde tam temsil edilebiliyor mu?"""
+    year_params = params.as_year_params(year_params)
+    try:
+        for start in year_params.period_starts:
+            get_fixed_params(year_params.for_month(start))
+    except ValueError:
+        return False
+    return True
+
+
+def calculate_pay_slip_kurus(
+    gross: int,
+    cum_tax_base_prev: int,
+    employee_type: str,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month: int = 1
+) -> Dict[str, int]:
+    """
+    `calculate_pay_slip`in tamsayı karşılığı.
+    Girdi ve çıktılar kuruş cinsinden tamsayıdır.
+    """
+    fp = get_fixed_params(params.as_year_params(year_params).for_month(month))
+    rate_sgk, rate_unemp = fp.employee_rates(employee_type)
+    income_tax_exemption, stamp_exemption = fp.exemptions(month)
+
+    # PEK ve SGK / İşsizlik kesintileri (U1)
+    pek = min(gross, fp.ceiling)
+    sgk = pek * rate_sgk
+    unemployment = pek * rate_unemp
+
+    # Gelir vergisi matrahı ve kümülatif takip (U1)
+    base_month = gross * U1 - sgk - unemployment
+    cum_prev = cum_tax_base_prev * U1
+    cum_new = cum_prev + base_month
+
+    # Gelir vergisi ve asgari ücret istisnası (U2)
+    tax_prev = fp.liability(cum_prev)
+    income_tax_gross = fp.liability(cum_new) - tax_prev
+    income_tax_net = max(0, income_tax_gross - income_tax_exemption)
+
+    # Damga vergisi (U1)
+    stamp_gross = gross * fp.stamp_rate
+    stamp_net = round_half_up(max(0, stamp_gross - stamp_exemption), U1)
+
+    # Net (U2 → kuruş)
+    net = gross * U2 - (sgk + unemployment) * TARIFF_RATE_SCALE - income_tax_net - stamp_net * U2
+
+    return {
+        "gross": gross,
+        "pek": pek,
+        "sgk_employee": round_half_up(sgk, U1),
+        "unemployment_employee": round_half_up(unemployment, U1),
+        "income_tax_base_month": round_half_up(base_month, U1),
+        "cum_tax_base_prev": cum_tax_base_prev,
+        "cum_tax_base_new": round_half_up(cum_new, U1),
+        "income_tax_gross": round_half_up(income_tax_gross, U2),
+        "income_tax_exemption": round_half_up(income_tax_exemption, U2),
+        "income_tax_net": round_half_up(income_tax_net, U2),
+        "stamp_tax_gross": round_half_up(stamp_gross, U1),
+        "stamp_tax_exemption": round_half_up(stamp_exemption, U1),
+        "stamp_tax_net": stamp_net,
+        "net": round_half_up(net, U2),
+    }
+
+
+class ShadowGuard:
+    """
+    Gölge (parite) denetimi: hızlı yolun sonuçlarından bir örneklemi Decimal
+    motoruyla yeniden hesaplar ve farkları kaydeder.
+    sample_rate: 0..1 arası örnekleme oranı (1.0 = her satır).
+    """
+
+    def __init__(self, sample_rate: float = 0.01, seed: Optional[int] = None, max_records: int = 100):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate 0 ile 1 arasında olmalı")
+        self.sample_rate = sample_rate
+        self.max_records = max_records
+        self.checked = 0
+        self.divergence_count = 0
+        self.divergences: List[Dict[str, Any]] = []
+        import random  # yalnızca gölge denetimi kullanıldığında yüklenir
+
+        self._random = random.Random(seed)
+
+    def should_check(self) -> bool:
+        return self.sample_rate > 0 and self._random.random() < self.sample_rate
+
+    def sample_indices(self, size: int) -> List[int]:
+        """Toplu sonuçlar için denetlenecek satır indeksleri."""
+        if self.sample_rate >= 1:
+            return list(range(size))
+        return [i for i in range(size) if self.should_check()]
+
+    def compare(
+        self,
+        fast_result: Dict[str, Decimal],
+        gross: Decimal,
+        cum_tax_base_prev: Decimal,
+        employee_type: str,
+        year_params: Union[Dict[str, Any], params.YearParams],
+        month: int = 1
+    ) -> bool:
+        """Decimal motoruyla karşılaştırır; fark yoksa True döner."""
+        from core.payroll import calculate_pay_slip
+
+        expected = calculate_pay_slip(gross, cum_tax_base_prev, employee_type, year_params, month)
+        self.checked += 1
+        diff = {
+            field: {"decimal": str(expected[field]), "fixed": str(fast_result[field])}
+            for field in FIELDS if expected[field] != fast_result[field]
+        }
+        if not diff:
+            return True
+
+        self.divergence_count += 1
+        if len(self.divergences) < self.max_records:
+            self.divergences.append({
+                "gross": str(gross),
+                "cum_tax_base_prev": str(cum_tax_base_prev),
+                "employee_type": employee_type,
+                "month": month,
+                "fields": diff,
+            })
+        return False
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "divergence_count": self.divergence_count,
+            "divergences": list(self.divergences),
+        }
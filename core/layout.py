@@ -0,0 +1,317 @@
+"""
+Yerleşim Şablonları
+Bordroların çoğu yerleşimi hiç değişmeyen birkaç bordro yazılımından gelir. Tam okunan
+(güven 1.0) bir bordrodan, alan etiketlerinin sayfadaki kelime konumları (parmak izi) ve
+her alanın değer bölgesi (satır bandı + x aralığı) öğrenilir. Aynı etiketler aynı
+konumlarda bulunan sonraki belgelerde değerler yalnızca bu bölgelerdeki kelimelerden
+okunur: sayfa metni düzeni, tablo tespiti ve tüm metin üzerinde kalıp taraması atlanır.
+
+Şablon yalnızca öğrenildiği belgede tam okumayla birebir aynı sonucu veriyorsa saklanır;
+uygulamada bir alan okunamazsa None dönülür ve belge tam yoldan okunur.
+
+Şablonlar PDF önbelleğiyle aynı klasörde, ayrı bir SQLite dosyasında tutulur.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core import analyzer, pdf_cache
+
+STORE_NAME = "layout_templates.sqlite3"
+# Şablon en fazla bu kadar sayfalı belgelere uygulanır (tek çalışan bordrosu)
+MAX_PAGES = 2
+MAX_TEMPLATES = 200
+# Aynı satırdaki kelimelerin üst koordinat farkı (pt)
+LINE_TOLERANCE = 2.0
+# Aynı kelimedeki ardışık karakterler arasındaki en büyük boşluk (pt; pdfplumber varsayılanı)
+WORD_GAP = 3.0
+
+# (metin, x0, x1, top)
+Word = Tuple[str, float, float, float]
+
+
+def _layout_chars(objects) -> Iterator:
+    for obj in objects:
+        if hasattr(obj, "_objs"):
+            yield from _layout_chars(obj._objs)
+        elif hasattr(obj, "get_text") and getattr(obj, "upright", False):
+            yield obj
+
+
+def page_words(page) -> List[Word]:
+    """
+    Sayfanın kelime kutuları (metin normalize).
+    pdfplumber'ın karakter sözlükleri (sayfa maliyetinin çoğu) yerine doğrudan pdfminer
+    düzen nesnelerinden kurulur. Düzen sayfada saklanır: tam okumaya düşülürse belge
+    yeniden yorumlanmaz.
+    """
+    layout = page.layout
+    chars = [(c.get_text(), c.x0, c.x1, layout.y1 - c.y1) for c in _layout_chars(layout._objs)]
+    words: List[Word] = []
+    for _, line in _lines(chars):
+        current = None
+        for text, x0, x1, top in line:
+            if text.isspace():
+                current = None
+            elif current is not None and x0 - current[2] <= WORD_GAP:
+                current = (current[0] + text, current[1], x1, current[3])
+                words[-1] = current
+            else:
+                current = (text, x0, x1, top)
+                words.append(current)
+    return [(analyzer.normalize_turkish(w[0]), w[1], w[2], w[3]) for w in words]
+
+
+def _lines(words: List[Word]) -> List[Tuple[float, List[Word]]]:
+    """Kelimeleri satırlara ayırır: (satır üstü, soldan sağa kelimeler)."""
+    lines: List[Tuple[float, List[Word]]] = []
+    for word in sorted(words, key=lambda w: (w[3], w[1])):
+        if lines and word[3] - lines[-1][0] <= LINE_TOLERANCE:
+            lines[-1][1].append(word)
+        else:
+            lines.append((word[3], [word]))
+    for _, line in lines:
+        line.sort(key=lambda w: w[1])
+    return lines
+
+
+def _line_text(line: List[Word]) -> str:
+    return " ".join(w[0] for w in line)
+
+
+def document_text(pages: List[List[Word]]) -> str:
+    """Kelimelerden satır satır kurulan belge metni."""
+    return "".join(
+        "".join(_line_text(line) + "\n" for _, line in _lines(words))
+        for words in pages
+    )
+
+
+def _has_digit(text: str) -> bool:
+    return any(c.isdigit() for c in text)
+
+
+def _fingerprint(words: List[List[Word]]) -> set:
+    return {(page, w[0], round(w[1]), round(w[3])) for page, ws in enumerate(words) for w in ws}
+
+
+def _locate(line: List[Word], field: str, value) -> Optional[Tuple[List[Word], float, float]]:
+    """
+    Alanın satırdaki eşleşmesi: (etiket kelimeleri, bölge başı, bölge sonu).
+    Bölge etiketin ilk kelimesinden, eşleşmeden sonraki ilk kelimeye (ya da satır sonuna) kadar.
+    """
+    text = _line_text(line)
+    starts, offset = [], 0
+    for word in line:
+        starts.append(offset)
+        offset += len(word[0]) + 1
+
+    for regex, _ in analyzer._FIELD_REGEXES[field]:
+        match = regex.search(text)
+        if not match:
+            continue
+        if analyzer.parse_money_turkish(match.group(1).strip()) != value:
+            return None
+        span = [i for i, s in enumerate(starts) if s < match.end() and s + len(line[i][0]) > match.start()]
+        labels = [line[i] for i in span if not _has_digit(line[i][0])]
+        if not labels:
+            return None
+        after = span[-1] + 1
+        end = line[after][1] if after < len(line) else float("inf")
+        return labels, line[span[0]][1] - 0.5, end
+    return None
+
+
+def learn(pages: List[List[Word]], text: str) -> Optional[Dict[str, Any]]:
+    """
+    Tam okunan belgeden şablon çıkarır; her alan ve dönem tek bir satırda bulunamazsa
+    ya da şablon belgeye uygulandığında tam okumayla aynı sonucu vermezse None.
+    """
+    fields = analyzer._scan_fields(text)
+    period = analyzer.detect_period(text)
+    if None in period:
+        return None
+
+    anchors = set()
+    regions: Dict[str, List[float]] = {}
+    period_region = None
+    for page, words in enumerate(pages):
+        for top, line in _lines(words):
+            if period_region is None and analyzer.detect_period(_line_text(line)) == period:
+                period_region = [page, top]
+            for field, value in fields.items():
+                if field in regions:
+                    continue
+                located = _locate(line, field, value)
+                if located is not None:
+                    labels, start, end = located
+                    anchors.update((page, w[0], round(w[1]), round(w[3])) for w in labels)
+                    regions[field] = [page, top, start, end]
+    if period_region is None or len(regions) < len(fields):
+        return None
+
+    template = {
+        "pages": len(pages),
+        "anchors": sorted(anchors),
+        "fields": regions,
+        "period": period_region,
+    }
+    if apply(template, pages) != (fields, period):
+        return None
+    return template
+
+
+def _region_text(lines_by_page: List[List[Tuple[float, List[Word]]]], page: int, top: float,
+                 start: float = float("-inf"), end: float = float("inf")) -> Optional[str]:
+    for line_top, line in lines_by_page[page]:
+        if abs(line_top - top) <= LINE_TOLERANCE:
+            return _line_text([w for w in line if start <= w[1] < end])
+    return None
+
+
+def apply(template: Dict[str, Any], pages: List[List[Word]]) -> Optional[Tuple[Dict, Tuple]]:
+    """
+    Şablon bölgelerinden (alanlar, (ay, yıl)); bir alan okunamazsa ya da belgede şablonda
+    olmayan bir alan varsa None.
+    """
+    lines_by_page = [_lines(words) for words in pages]
+    fields = {}
+    for field, (page, top, start, end) in template["fields"].items():
+        region = _region_text(lines_by_page, page, top, start, end)
+        value = analyzer._find_field(region, field) if region else None
+        if value is None:
+            return None
+        fields[field] = value
+
+    page, top = template["period"]
+    region = _region_text(lines_by_page, page, top)
+    period = analyzer.detect_period(region) if region else (None, None)
+    if None in period:
+        return None
+
+    # Şablonda olmayan bir alan belgede okunabiliyorsa (ör. BES ya da kesinti satırı eklenmişse)
+    # şablon eksik sonuç verir: tam okumaya düşülür. Etiketi geçmeyen alanlar taranmaz.
+    text = "".join(_line_text(line) + "\n" for lines in lines_by_page for _, line in lines)
+    folded = analyzer._fold(text)
+    for field in analyzer.FIELD_PATTERNS:
+        if field not in fields and analyzer._find_field(text, field, folded) is not None:
+            return None
+    # Alanlar tam okumadaki sırayla (FIELD_PATTERNS)
+    return {f: fields[f] for f in analyzer.FIELD_PATTERNS if f in fields}, period
+
+
+class TemplateStore:
+    """Parmak izi → alan bölgeleri şablonları (SQLite + bellek)."""
+
+    def __init__(self, path: Optional[str] = None, max_templates: int = MAX_TEMPLATES):
+        self.path = path or os.path.join(pdf_cache.default_cache_dir(), STORE_NAME)
+        self.max_templates = max_templates
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS templates ("
+            " key TEXT PRIMARY KEY, data TEXT NOT NULL, version TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        # Son kullanılan başta; (anahtar, etiket kümesi, şablon)
+        self._templates: List[Tuple[str, frozenset, Dict[str, Any]]] = []
+        self._last_rowid = 0
+        self._reload()
+
+    def _reload(self):
+        # Başka süreçlerin (toplu analiz işçileri) öğrendiği şablonları da al
+        rows = self._conn.execute(
+            "SELECT rowid, key, data FROM templates WHERE rowid > ? AND version = ? ORDER BY rowid",
+            (self._last_rowid, analyzer.ANALYZER_VERSION)
+        ).fetchall()
+        known = {key for key, _, _ in self._templates}
+        for rowid, key, data in rows:
+            self._last_rowid = max(self._last_rowid, rowid)
+            if key not in known:
+                template = json.loads(data)
+                anchors = frozenset(tuple(a) for a in template["anchors"])
+                self._templates.insert(0, (key, anchors, template))
+
+    def lookup(self, pages: List[List[Word]]) -> Optional[Tuple[Dict, Tuple]]:
+        """Belgeye uyan şablonla okunan (alanlar, dönem); uyan şablon yoksa None."""
+        with self._lock:
+            fingerprint = _fingerprint(pages)
+            for retry in (False, True):
+                if retry:
+                    self._reload()
+                for i, (key, anchors, template) in enumerate(self._templates):
+                    if template["pages"] == len(pages) and anchors <= fingerprint:
+                        result = apply(template, pages)
+                        if result is None:
+                            continue
+                        self._templates.insert(0, self._templates.pop(i))
+                        self.hits += 1
+                        return result
+            self.misses += 1
+            return None
+
+    def learn(self, pages: List[List[Word]], text: str) -> Optional[str]:
+        """Tam okunan belgeden şablon öğrenir; anahtarını (öğrenilemezse None) döner."""
+        template = learn(pages, text)
+        if template is None:
+            return None
+        data = json.dumps(template, sort_keys=True)
+        key = hashlib.sha1(json.dumps(template["anchors"]).encode("utf-8")).hexdigest()
+        with self._lock:
+            if any(k == key for k, _, _ in self._templates):
+                return key
+            self._conn.execute(
+                "INSERT OR REPLACE INTO templates (key, data, version) VALUES (?, ?, ?)",
+                (key, data, analyzer.ANALYZER_VERSION)
+            )
+            # En eski öğrenilenler silinir
+            self._conn.execute(
+                "DELETE FROM templates WHERE rowid NOT IN (SELECT rowid FROM templates ORDER BY rowid DESC LIMIT ?)",
+                (self.max_templates,)
+            )
+            self._conn.commit()
+            anchors = frozenset(tuple(a) for a in template["anchors"])
+            self._templates.insert(0, (key, anchors, template))
+            del self._templates[self.max_templates:]
+        return key
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._templates)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM templates")
+            self._conn.commit()
+            self._templates.clear()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default: Optional[TemplateStore] = None
+_default_pid: Optional[int] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> Optional[TemplateStore]:
+    """Varsayılan konumdaki şablon deposu; açılamıyorsa None (şablonsuz çalışılır)."""
+    global _default, _default_pid
+    with _default_lock:
+        path = os.path.join(pdf_cache.default_cache_dir(), STORE_NAME)
+        # Süreç başına (havuz işçileri) ve klasör değiştiyse (BORDRO_CACHE_DIR) yeniden açılır
+        if _default is None or _default_pid != os.getpid() or _default.path != path:
+            try:
+                _default = TemplateStore(path)
+            except (OSError, sqlite3.Error):
+                return None
+            _default_pid = os.getpid()
+        return _default
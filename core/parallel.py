@@ -0,0 +1,46 @@
+"""
+Süreç Havuzu Yardımcıları
+Büyük işleri parçalar halinde süreç havuzuna dağıtır. Sonuçlar girdi sırasıyla
+döner; aynı anda havuzda bekleyen parça sayısı sınırlıdır, böylece ne girdi ne de
+sonuçlar ana süreçte bütünüyle biriktirilir.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def ordered_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+    max_pending: Optional[int] = None
+) -> Iterator[Any]:
+    """
+    `func`ı her elemana uygular, sonuçları girdi sırasıyla verir.
+    workers <= 1 ise aynı süreçte çalışır. `initializer(*initargs)` her işçide
+    bir kez çağrılır (ör. yıl parametrelerini işçiye bir kez aktarmak için).
+    max_pending: havuzda aynı anda bekleyen en fazla iş (Varsayılan: 2 × workers).
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=tuple(initargs)) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,7 +1,11 @@
+import copy
 import json
 import os
-from decimal import Decimal
-from typing import Dict, Any, Optional
+import threading
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+from core.tax import CompiledTariff, ExemptionSchedule
 
 # Rakamları Decimal'a çevirmek için yardımcı
 def _decimal_hook(obj):
@@ -14,14 +18,24 @@ def _decimal_hook(obj):
              pass
     return obj
 
-def load_params(year: int, data_dir: str = None) -> Dict[str, Any]:
+def _default_data_dir() -> str:
+    # Varsayılan olarak projenin 'data' klasörüne bak
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, "data")
+
+def _read_params_file(file_path: str) -> Dict[str, Any]:
+    # Standart json.load float döndürür; parse_float ile parasal değerler doğrudan Decimal olur
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f, parse_float=Decimal)
+
+def load_params(year: int, data_dir: str = None, compiled: bool = False) -> Union[Dict[str, Any], "YearParams"]:
     """
     Belirtilen yıl için parametre dosyasını yükler.
+    compiled=True ise ham sözlük yerine önceden çözümlenmiş `YearParams` döner.
+    Tekrarlanan yüklemeler için önbellekli `get_year_params` tercih edilmelidir.
     """
     if data_dir is None:
-        # Varsayılan olarak projenin 'data' klasörüne bak
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_dir = os.path.join(base_path, "data")
+        data_dir = _default_data_dir()
     
     filename = f"params_{year}.json"
     file_path = os.path.join(data_dir, filename)
@@ -29,16 +43,10 @@ def load_params(year: int, data_dir: str = None) -> Dict[str, Any]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Parametre dosyası bulunamadı: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # JSON verilerini Decimal'a dönüştürme (float hassasiyet kaybını önlemek için manuel parsing önerilir 
-    # ancak basitlik adına burada recursive dönüşüm yapacağız veya parse_float kullanacağız)
-    # Standart json.load float döndürür. Decimal için parse_float argümanı en temizidir.
-    
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f, parse_float=Decimal)
+    data = _read_params_file(file_path)
     
+    if compiled:
+        return YearParams(data)
     return data
 
 def get_rate(params: Dict, employee_type: str, rate_key: str) -> Decimal:
@@ -60,3 +68,311 @@ def get_tariff(params: Dict) -> list:
         rate = Decimal(str(dilute["rate"]))
         tariff.append({"up_to": up_to, "rate": rate})
     return tariff
+
+@lru_cache(maxsize=32)
+def _compile_tariff_cached(key: tuple) -> CompiledTariff:
+    return CompiledTariff(get_tariff({"income_tax_tariff": [{"up_to": up_to, "rate": rate} for up_to, rate in key]}))
+
+def get_compiled_tariff(params: Union[Dict, "YearParams"]) -> CompiledTariff:
+    """
+    Derlenmiş vergi tarifesini döndürür.
+    Aynı tarife için tekrar derlenmez; tarife değiştiğinde anahtar da değişir.
+    `YearParams` kendi derlenmiş tarifesini taşır; ham sözlükte anahtar ham değerlerdir
+    (Decimal'a çevirme yalnızca ilk derlemede yapılır).
+    """
+    if isinstance(params, YearParams):
+        return params.tariff
+    key = tuple((b["up_to"], b["rate"]) for b in params["income_tax_tariff"])
+    return _compile_tariff_cached(key)
+
+
+def _decimalize(value, key: str, numeric: bool = False):
+    """
+    Sayısal değerleri Decimal'a çevirir. Sayı olmayan metinler (ör. "notes") olduğu gibi
+    kalır; ancak temel değeri sayısal olan bir anahtarın (numeric=True) değeri sayı olmalıdır.
+    """
+    if isinstance(value, dict):
+        return {k: _decimalize(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decimalize(v, key) for v in value]
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, str):
+        try:
+            number = Decimal(value.strip())
+        except InvalidOperation:
+            number = None
+        if number is not None and number.is_finite():
+            return number
+        if numeric:
+            raise ValueError(f"Geçersiz sayısal değer: {key}={value}")
+    return value
+
+def apply_overlay(raw: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ham parametre sözlüğünün üzerine değişiklikleri uygular (temel sözlük değişmez).
+    İç içe sözlükler (ör. rates) anahtar anahtar birleştirilir; listeler (tarife) tümüyle değiştirilir.
+    """
+    merged = copy.deepcopy(raw)
+
+    def merge(target: Dict[str, Any], changes: Dict[str, Any]):
+        for key, value in changes.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                merge(target[key], value)
+            elif key in ("year", "up_to", "effective_from") or value is None:
+                target[key] = value
+            else:
+                target[key] = _decimalize(value, key, isinstance(target.get(key), (int, float, Decimal)))
+
+    merge(merged, overlay)
+    return merged
+
+# Yıl içi dönemler: "periods": [{"effective_from": "2026-07-01", <değişen anahtarlar>}, ...]
+# Her dönem, kendinden önceki dönemlerin üzerine uygulanır; Ocak ayı temel değerlerle başlar.
+def _period_month(period: Dict[str, Any]) -> int:
+    try:
+        month = int(str(period["effective_from"]).split("-")[1])
+    except (KeyError, IndexError, ValueError):
+        raise ValueError(f"Geçersiz dönem başlangıcı: {period.get('effective_from')}")
+    if not 1 <= month <= 12:
+        raise ValueError(f"Geçersiz dönem başlangıcı: {period['effective_from']}")
+    return month
+
+def period_starts(raw: Dict[str, Any]) -> Tuple[int, ...]:
+    """Yıl içindeki dönemlerin başlangıç ayları (her zaman 1 ile başlar)."""
+    return tuple(sorted({1} | {_period_month(p) for p in raw.get("periods") or []}))
+
+def effective_params(raw: Dict[str, Any], month: int) -> Dict[str, Any]:
+    """Verilen ayda geçerli parametreler (dönem değişiklikleri uygulanmış, 'periods' hariç)."""
+    if not 1 <= month <= 12:
+        raise ValueError(f"Geçersiz ay: {month}")
+    effective = {k: v for k, v in raw.items() if k != "periods"}
+    periods = sorted(raw.get("periods") or [], key=_period_month)
+    for period in periods:
+        if _period_month(period) <= month:
+            overlay = {k: v for k, v in period.items() if k != "effective_from"}
+            effective = apply_overlay(effective, overlay)
+    return effective
+
+# Çalışan tipine göre SGK işçi payı oranının anahtarı
+SGK_RATE_KEYS = {
+    "normal_4a": "sgk_employee",
+    "emekli_sgdp": "sgdp_employee",
+}
+
+def _to_decimal(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class YearParams:
+    """
+    Bir yılın (veya yıl içi bir dönemin) parametre seti; tüm değerler bir kez Decimal'a
+    çevrilmiş ve türetilen büyüklükler (tarife, asgari ücret matrahı, damga istisnası)
+    önceden hesaplanmıştır.
+    `month` verilirse o ayda geçerli dönemin değerleri kullanılır; asgari ücret istisna
+    çizelgesi her ay için o ayın asgari ücretiyle kurulur.
+    Değiştirilemez; hesaplama fonksiyonları ham sözlük yerine bunu da kabul eder.
+    """
+    __slots__ = (
+        "year", "min_wage_gross", "stamp_rate", "sgk_ceiling_monthly",
+        "rates", "tariff", "min_wage_tax_base", "stamp_exemption", "exemptions", "fingerprint",
+        "effective_from", "period_starts", "raw", "_periods",
+    )
+
+    def __init__(self, raw: Dict[str, Any], month: int = 1):
+        starts = period_starts(raw)
+        effective_from = max(start for start in starts if start <= month)
+        # Dönem başına geçerli değerler (ayrıca her ayın asgari ücret istisnası için)
+        by_period = {start: _period_values(effective_params(raw, start)) for start in starts}
+        values = by_period[effective_from]
+
+        set_ = object.__setattr__
+        set_(self, "raw", raw)
+        set_(self, "year", raw.get("year"))
+        set_(self, "effective_from", effective_from)
+        set_(self, "period_starts", starts)
+        set_(self, "_periods", {effective_from: self})
+        set_(self, "min_wage_gross", values["min_wage_gross"])
+        set_(self, "stamp_rate", values["stamp_rate"])
+        set_(self, "sgk_ceiling_monthly", values["sgk_ceiling_monthly"])
+        set_(self, "rates", values["rates"])
+        set_(self, "tariff", values["tariff"])
+        set_(self, "min_wage_tax_base", values["min_wage_tax_base"])
+        set_(self, "stamp_exemption", values["stamp_exemption"])
+
+        # Ay m'nin istisnası, m'de geçerli asgari ücretle ve asgari ücretlinin yıl içi
+        # kümülatif matrahıyla hesaplanır
+        monthly = [by_period[max(s for s in starts if s <= m)] for m in range(1, 13)]
+        min_wage_bases = [v["min_wage_tax_base"] for v in monthly]
+        set_(self, "exemptions", ExemptionSchedule(
+            self.tariff, min_wage_bases, [v["stamp_exemption"] for v in monthly]
+        ))
+        # Hesabı etkileyen değerlerin anahtarı; içerik değişince önbellekler yeni anahtar görür
+        set_(self, "fingerprint", (
+            self.year, effective_from, self.min_wage_gross, self.stamp_rate, self.sgk_ceiling_monthly,
+            tuple(sorted(self.rates.items())), tuple(zip(self.tariff.bounds, self.tariff.rates)),
+            tuple(min_wage_bases),
+            # Yılın tüm dönemlerinin değerleri (aynı Ocak değerli farklı yıl içi değişiklikler ayrışır)
+            tuple(
+                (start, v["min_wage_gross"], v["stamp_rate"], v["sgk_ceiling_monthly"],
+                 tuple(sorted(v["rates"].items())), tuple(zip(v["tariff"].bounds, v["tariff"].rates)))
+                for start, v in sorted(by_period.items())
+            ),
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("YearParams değiştirilemez")
+
+    def __delattr__(self, name):
+        raise AttributeError("YearParams değiştirilemez")
+
+    def __reduce__(self):
+        # Süreçler arası aktarımda ham sözlükten yeniden kurulur
+        return (YearParams, (self.raw, self.effective_from))
+
+    def __repr__(self):
+        if len(self.period_starts) > 1:
+            return f"YearParams(year={self.year}, effective_from={self.effective_from})"
+        return f"YearParams(year={self.year})"
+
+    def for_month(self, month: int) -> "YearParams":
+        """Verilen ayda geçerli dönemin parametreleri (dönem yoksa kendisi)."""
+        if not 1 <= month <= 12:
+            raise ValueError(f"Geçersiz ay: {month}")
+        start = max(s for s in self.period_starts if s <= month)
+        period = self._periods.get(start)
+        if period is None:
+            period = YearParams(self.raw, start)
+            # Aynı yılın dönemleri tek önbelleği paylaşır
+            object.__setattr__(period, "_periods", self._periods)
+            self._periods[start] = period
+        return period
+
+    def employee_rates(self, employee_type: str) -> Tuple[Decimal, Decimal]:
+        """(SGK/SGDP işçi payı, işsizlik işçi payı) oranlarını döndürür."""
+        try:
+            return self.rates[employee_type]
+        except KeyError:
+            raise ValueError(f"Geçersiz çalışan tipi: {employee_type}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Ham parametre sözlüğünü döndürür."""
+        return self.raw
+
+
+def _period_values(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Tek bir dönemin ham değerlerinden çözümlenmiş büyüklükler."""
+    min_wage_gross = _to_decimal(raw["min_wage_gross"])
+    stamp_rate = _to_decimal(raw["stamp_rate"])
+
+    # Çalışan tipi -> (SGK/SGDP işçi payı, işsizlik işçi payı)
+    rates = {}
+    for employee_type, sgk_key in SGK_RATE_KEYS.items():
+        type_rates = raw.get("rates", {}).get(employee_type)
+        if type_rates is None or sgk_key not in type_rates or "unemployment_employee" not in type_rates:
+            continue
+        rates[employee_type] = (
+            _to_decimal(type_rates[sgk_key]),
+            _to_decimal(type_rates["unemployment_employee"]),
+        )
+
+    # Asgari ücretin GV matrahı standart çalışan (4/a) kesinti oranlarıyla bulunur
+    if "normal_4a" not in rates:
+        raise ValueError("Asgari ücret matrahı için normal_4a oranları gerekli")
+
+    return {
+        "min_wage_gross": min_wage_gross,
+        "stamp_rate": stamp_rate,
+        "sgk_ceiling_monthly": _to_decimal(raw["sgk_ceiling_monthly"]),
+        "rates": rates,
+        "tariff": get_compiled_tariff(raw),
+        "min_wage_tax_base": min_wage_gross * (1 - sum(rates["normal_4a"])),
+        # Asgari ücrete isabet eden damga vergisi
+        "stamp_exemption": min_wage_gross * stamp_rate,
+    }
+
+
+# Ham sözlüklerden kurulan son `YearParams`lar (içerik metni -> nesne)
+_RESOLVED_MAX = 32
+_resolved: Dict[str, YearParams] = {}
+_resolved_lock = threading.Lock()
+
+
+def as_year_params(year_params: Union[Dict[str, Any], YearParams]) -> YearParams:
+    """
+    Ham sözlük veya `YearParams` alır, her zaman `YearParams` döndürür.
+    Aynı içerikli sözlükler aynı nesneye çözülür; böylece nesne başına önbellekler
+    (`get_fixed_params`, `get_batch_params`) ham sözlükle de isabet eder.
+    """
+    if isinstance(year_params, YearParams):
+        return year_params
+    key = repr(year_params)
+    with _resolved_lock:
+        resolved = _resolved.get(key)
+        if resolved is None:
+            if len(_resolved) >= _RESOLVED_MAX:
+                del _resolved[next(iter(_resolved))]
+            # Çağıranın sözlüğü sonradan değişse de önbellekteki nesne etkilenmez
+            resolved = _resolved[key] = YearParams(copy.deepcopy(year_params))
+        return resolved
+
+
+class ParamsRegistry:
+    """
+    `data/params_*.json` dosyalarının bellekteki kaydı.
+    Dosyalar ilk istekte okunur; sonraki isteklerde yalnızca değişiklik zamanı (mtime)
+    kontrol edilir, dosya değişmişse yeniden okunur. (yıl, ay) için o ayda geçerli
+    dönemin `YearParams`ı döner; aynı dönemin ayları aynı nesneyi paylaşır.
+    """
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir or _default_data_dir()
+        self._entries: Dict[int, Tuple[Tuple[int, int], YearParams]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, year: int) -> str:
+        return os.path.join(self.data_dir, f"params_{year}.json")
+
+    def years(self) -> List[int]:
+        """Parametre dosyası bulunan yıllar."""
+        years = []
+        for name in os.listdir(self.data_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == ".json" and stem.startswith("params_") and stem[len("params_"):].isdigit():
+                years.append(int(stem[len("params_"):]))
+        return sorted(years)
+
+    def get(self, year: int, month: int = 1) -> YearParams:
+        file_path = self._path(year)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Parametre dosyası bulunamadı: {file_path}")
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(year)
+        if entry is None or entry[0] != version:
+            with self._lock:
+                entry = self._entries.get(year)
+                if entry is None or entry[0] != version:
+                    entry = (version, YearParams(_read_params_file(file_path)))
+                    self._entries[year] = entry
+        return entry[1].for_month(month)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_registry: Optional[ParamsRegistry] = None
+
+def get_registry() -> ParamsRegistry:
+    """Varsayılan `data` klasörünün paylaşılan kaydı."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ParamsRegistry()
+    return _default_registry
+
+def get_year_params(year: int, month: int = 1) -> YearParams:
+    """(yıl, ay) için geçerli parametreler; dosya değişmedikçe bellekten gelir."""
+    return get_registry().get(year, month)
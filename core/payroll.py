@@ -1,42 +1,49 @@
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Any, Optional
-from core import params, tax
+from decimal import Decimal
+from typing import Dict, Any, Optional, Union
+from core import fixedpoint, params, tax
+from core.curve import get_net_curve
+from core.tax import round_decimal
 
-def round_decimal(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+# Netten brüte çözümde kuruş düzeltmesi için taranan aralık (TL)
+GROSS_ROUNDING_WINDOW = Decimal("0.10")
 
 def calculate_pay_slip(
     gross: Decimal,
     cum_tax_base_prev: Decimal,
     employee_type: str,
-    year_params: Dict[str, Any],
-    month: int = 1
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month: int = 1,
+    fast: bool = False,
+    shadow: Optional[fixedpoint.ShadowGuard] = None
 ) -> Dict[str, Any]:
     """
     Belirli bir brüt maaş ve kümülatif matrah için aylık bordro hesaplar.
+    `year_params` ham sözlük veya önceden çözümlenmiş `YearParams` olabilir.
+    fast=True ise tamsayı kuruş motoru kullanılır (kuruş altı girdilerde Decimal'a düşer);
+    `shadow` verilirse örneklenen hesaplar Decimal motoruyla denetlenir.
     """
-    # 1. Sabitler ve Oranlar
-    constants = year_params
-    rates = params.get_rate
+    if fast:
+        gross_kurus = fixedpoint.to_kurus(gross)
+        cum_kurus = fixedpoint.to_kurus(cum_tax_base_prev)
+        if gross_kurus is not None and cum_kurus is not None:
+            fixed = fixedpoint.calculate_pay_slip_kurus(gross_kurus, cum_kurus, employee_type, year_params, month)
+            result = {field: fixedpoint.from_kurus(value) for field, value in fixed.items()}
+            if shadow is not None and shadow.should_check():
+                shadow.compare(result, gross, cum_tax_base_prev, employee_type, year_params, month)
+            return result
+
+    # 1. Sabitler ve Oranlar (yıl içi dönem varsa o ayda geçerli olanlar)
+    constants = params.as_year_params(year_params).for_month(month)
     
-    sgk_ceiling = Decimal(str(constants["sgk_ceiling_monthly"]))
-    min_wage_gross = Decimal(str(constants["min_wage_gross"]))
-    stamp_rate = Decimal(str(constants["stamp_rate"]))
-    tariff = params.get_tariff(constants)
+    sgk_ceiling = constants.sgk_ceiling_monthly
+    stamp_rate = constants.stamp_rate
+    tariff = constants.tariff
     
     # 2. PEK (Prime Esas Kazanç)
     pek = min(gross, sgk_ceiling)
     
     # 3. SGK ve İşsizlik Kesintileri
-    rate_unemp = rates(constants, employee_type, "unemployment_employee")
-    
-    if employee_type == "normal_4a":
-        rate_sgk = rates(constants, employee_type, "sgk_employee")
-    elif employee_type == "emekli_sgdp":
-        rate_sgk = rates(constants, employee_type, "sgdp_employee")
-    else:
-        # Varsayılan veya hata
-        raise ValueError(f"Geçersiz çalışan tipi: {employee_type}")
+    rate_sgk, rate_unemp = constants.employee_rates(employee_type)
     
     sgk_amount = pek * rate_sgk
     unemployment_amount = pek * rate_unemp
@@ -57,15 +64,9 @@ def calculate_pay_slip(
     )
     
     # 7. Asgari Ücret Vergi İstisnası (Kümülatif Mantıkla)
-    # 2026 Varsayımı: Standart çalışan oranlarıyla (14% + 1%) asgari ücretin matrahı bulunur.
-    min_wage_tax_base = min_wage_gross * (1 - Decimal("0.14") - Decimal("0.01"))
-    
-    # İstisna tutarı = Asgari ücretlinin (o kümülatif noktada) ödeyeceği vergi
-    income_tax_exemption = tax.calculate_income_tax_cumulative(
-        cum_tax_base_prev,
-        min_wage_tax_base,
-        tariff
-    )
+    # İstisna tutarı = Asgari ücretlinin o aydaki kümülatif konumunda ödeyeceği vergi
+    # (yıl başına bir kez hesaplanan aylık çizelgeden)
+    income_tax_exemption = constants.exemptions.income_tax_exemption(month)
     
     # Ödenecek Gelir Vergisi (Eksiye düşemez)
     income_tax_net = max(Decimal("0"), income_tax_gross - income_tax_exemption)
@@ -76,7 +77,7 @@ def calculate_pay_slip(
     stamp_tax_calc = tax.calculate_stamp_tax(
         gross, 
         stamp_rate, 
-        exemption_amount=(min_wage_gross * stamp_rate)
+        exemption_amount=constants.exemptions.stamp_exemption(month)
     )
     
     # 9. Net Maaş
@@ -103,36 +104,35 @@ def find_gross_salary(
     target_net: Decimal,
     cum_tax_base_prev: Decimal,
     employee_type: str,
-    year_params: Dict[str, Any],
+    year_params: Union[Dict[str, Any], params.YearParams],
     month: int = 1,
     tolerance: Decimal = Decimal("0.01")
 ) -> Decimal:
     """
-    Netten brüte hesaplama (Binary Search).
+    Netten brüte hesaplama.
+    Net, brütün parçalı doğrusal bir fonksiyonu olduğundan hedefin düştüğü parça
+    bulunup doğrudan ters çevrilir; ikili arama yalnızca son kuruş yuvarlaması için
+    dar bir aralıkta yapılır.
     """
-    # Alt sınır: Hedef net (Vergisiz olsa bile net brütten büyük olamaz -istisnalar hariç ama genelde böyle-)
-    # Üst sınır: Hedef netin 3 katı (Güvenli aralık)
-    low = target_net
-    high = target_net * 3
-    
+    year_params = params.as_year_params(year_params).for_month(month)
+    curve = get_net_curve(year_params, cum_tax_base_prev, employee_type, month)
+
     # Brüt asgari ücretin altında olamaz
-    min_wage = Decimal(str(year_params["min_wage_gross"]))
-    if low < min_wage:
-        low = min_wage # En azından asgari ücreti dene
-        if high < min_wage: 
-            high = min_wage * 2
+    min_wage = year_params.min_wage_gross
+    estimate = max(round_decimal(curve.gross_for_net(target_net)), min_wage)
 
-    # Binary search (max 50 iterasyon)
-    best_gross = low
-    min_diff = Decimal("999999")
-    
-    for _ in range(50):
-        mid = (low + high) / 2
-        # Virgülden sonra 2 hane ile çalışalım ki sonsuz döngü olmasın
-        mid = round_decimal(mid)
-        
-        result = calculate_pay_slip(mid, cum_tax_base_prev, employee_type, year_params, month)
-        net_calc = result["net"]
+    best_gross = estimate
+    min_diff = abs(curve.net(estimate) - target_net)
+    if min_diff <= tolerance:
+        return estimate
+
+    # Damga vergisinin kuruş yuvarlaması neti birkaç kuruş kaydırabilir
+    low = max(estimate - GROSS_ROUNDING_WINDOW, min_wage)
+    high = estimate + GROSS_ROUNDING_WINDOW
+
+    while high - low > Decimal("0.01"):
+        mid = round_decimal((low + high) / 2)
+        net_calc = curve.net(mid)
         
         diff = net_calc - target_net
         
@@ -149,3 +149,26 @@ def find_gross_salary(
             high = mid
             
     return best_gross
+
+
+def preview(
+    mode: str,
+    amount: Decimal,
+    cum_tax_base_prev: Decimal,
+    employee_type: str,
+    year_params: Union[Dict[str, Any], params.YearParams],
+    month: int = 1
+) -> Dict[str, Decimal]:
+    """
+    Etkileşimli arayüzler için yalnızca brüt ve net.
+    Önbellekteki brüt → net eğrisi üzerinden hesaplanır (tam bordroya inmez);
+    sonuç `calculate_pay_slip` ve `find_gross_salary` ile aynıdır.
+    """
+    curve = get_net_curve(year_params, cum_tax_base_prev, employee_type, month)
+    if mode == "gross_to_net":
+        gross = amount
+    elif mode == "net_to_gross":
+        gross = find_gross_salary(amount, cum_tax_base_prev, employee_type, year_params, month)
+    else:
+        raise ValueError(f"Geçersiz mod: {mode}")
+    return {"gross": gross, "net": curve.net(gross)}
@@ -0,0 +1,145 @@
+"""
+PDF Okuma Önbelleği
+PDF'den çıkarılan normalize metni ve `parse_payslip` sonucunu, dosya içeriğinin özeti
+(sha256) ve analiz modülü sürümüyle anahtarlanmış yerel bir SQLite veritabanında tutar.
+Aynı bordro yeniden açıldığında (ya da parametreler değişip yeniden analiz edildiğinde)
+pdfplumber hiç çalışmaz; yalnızca `analyze_payslip` yeniden koşar.
+
+Önbellek boyutla sınırlıdır: toplam boyut aşılınca en uzun süredir kullanılmayan
+kayıtlar silinir (LRU). Birden çok süreç (toplu analiz işçileri) aynı dosyayı
+paylaşabilir.
+
+Konum: BORDRO_CACHE_DIR ortam değişkeni; yoksa kullanıcı önbellek klasörü
+(Windows: %LOCALAPPDATA%\\bordro, diğerleri: $XDG_CACHE_HOME/bordro veya ~/.cache/bordro).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+CACHE_NAME = "pdf_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    if os.environ.get("BORDRO_CACHE_DIR"):
+        return os.environ["BORDRO_CACHE_DIR"]
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return os.path.join(os.environ["LOCALAPPDATA"], "bordro")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "bordro")
+
+
+def file_digest(path: str) -> str:
+    """Dosya içeriğinin sha256 özeti (hex)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dump_parsed(parsed: Dict[str, Any]) -> str:
+    return json.dumps(parsed, default=str, ensure_ascii=False)
+
+
+def _load_parsed(data: str) -> Dict[str, Any]:
+    # Üst düzeydeki metin değerleri (alanlar) Decimal olarak saklanmıştı
+    parsed = json.loads(data)
+    return {
+        k: Decimal(v) if isinstance(v, str) and not k.startswith("_") else v
+        for k, v in parsed.items()
+    }
+
+
+class PdfCache:
+    """İçerik özeti → (normalize metin, parse sonucu) önbelleği."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(default_cache_dir(), CACHE_NAME)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, text TEXT NOT NULL, parsed TEXT NOT NULL,"
+            " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT text, parsed FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return row[0], _load_parsed(row[1])
+
+    def put(self, key: str, text: str, parsed: Dict[str, Any]):
+        data = _dump_parsed(parsed)
+        size = len(text.encode("utf-8")) + len(data.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, text, parsed, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, text, data, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default: Optional[PdfCache] = None
+_default_pid: Optional[int] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[PdfCache]:
+    """
+    Varsayılan konumdaki önbellek; klasör yazılamıyorsa None (önbelleksiz çalışılır).
+    Bağlantı süreç başına açılır (havuz işçileri üst sürecin bağlantısını kullanmaz).
+    """
+    global _default, _default_pid
+    with _default_lock:
+        path = os.path.join(default_cache_dir(), CACHE_NAME)
+        # Süreç başına (havuz işçileri) ve klasör değiştiyse (BORDRO_CACHE_DIR) yeniden açılır
+        if _default is None or _default_pid != os.getpid() or _default.path != path:
+            try:
+                _default = PdfCache(path)
+            except (OSError, sqlite3.Error):
+                return None
+            _default_pid = os.getpid()
+        return _default
@@ -0,0 +1,362 @@
+"""
+Toplu Bordro Koşusu (Roster)
+CSV veya JSONL çalışan listesini satır satır okur, sınırlı büyüklükte parçalar
+halinde hesaplar ve sonuçları akış halinde yazar; bellek kullanımı girdi
+boyutundan bağımsızdır.
+
+Girdi sütunları: id, gross veya target_net, cum_base, type, month
+"""
+import csv
+import io
+import json
+import os
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from core import batch, params
+from core.parallel import ordered_map
+from core.fixedpoint import FIELDS, format_kurus
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Çıktı sütunları (CSV başlığı)
+OUTPUT_COLUMNS = ("id", "employee_type", "month", "target_net", "found_gross", "residual") + FIELDS + ("error",)
+
+
+def detect_format(path: str, default: str = "csv") -> str:
+    """Dosya uzantısından biçimi (csv / jsonl) tahmin eder."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext == ".csv":
+        return "csv"
+    return default
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, Decimal):
+        return value
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Geçersiz tutar: {value}")
+    # Sonsuz / NaN ve toplu motorun int64 kuruş aralığını aşan tutarlar satır hatasıdır
+    if not amount.is_finite():
+        raise ValueError(f"Geçersiz tutar: {value}")
+    if abs(amount) * batch.KURUS > batch.MAX_KURUS:
+        raise ValueError(f"Tutar desteklenen aralığın dışında: {value}")
+    return amount
+
+
+def normalize_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ham girdi satırını hesaplamaya hazır hale getirir.
+    Okunamayan satırlar (`read_records`in verdiği hatalar dahil) koşuyu durdurmaz;
+    `error` alanıyla işaretlenir.
+    """
+    valid = isinstance(raw, dict)
+    reason = str(raw) if isinstance(raw, ValueError) else "Geçersiz satır: nesne bekleniyordu"
+    if not valid:
+        raw = {}
+    row = {
+        "id": raw.get("id"),
+        "gross": None,
+        "target_net": None,
+        "cum_base": Decimal("0"),
+        "type": raw.get("type") or "normal_4a",
+        "month": 1,
+        "error": None,
+    }
+    if not valid:
+        row["error"] = reason
+        return row
+    try:
+        row["gross"] = _to_decimal(raw.get("gross"))
+        row["target_net"] = _to_decimal(raw.get("target_net"))
+        row["cum_base"] = _to_decimal(raw.get("cum_base")) or Decimal("0")
+        row["month"] = int(raw.get("month") or 1)
+        if not 1 <= row["month"] <= 12:
+            raise ValueError(f"Geçersiz ay: {row['month']}")
+    except (ValueError, TypeError) as e:
+        row["error"] = str(e)
+    return row
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Union[Dict[str, Any], ValueError]]:
+    """
+    Girdiyi ham kayıtlar halinde satır satır okur (tamamı belleğe alınmaz).
+    Çözümlenemeyen JSONL satırı yerine hata verilir; `normalize_row` onu hata satırına çevirir.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line, parse_float=Decimal)
+            except ValueError:
+                yield ValueError(f"Geçersiz JSON satırı: {number}")
+    else:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+
+
+def read_roster(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Çalışan listesini hesaplamaya hazır satırlar halinde okur."""
+    for raw in read_records(stream, fmt):
+        yield normalize_row(raw)
+
+
+def chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Satırları en fazla `size` elemanlı listeler halinde verir."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _output_row(row: Dict[str, Any], payslip: Optional[Dict[str, Decimal]] = None, **extra) -> Dict[str, Any]:
+    out = {"id": row["id"], "employee_type": row["type"], "month": row["month"]}
+    out.update(extra)
+    if payslip is not None:
+        out.update(payslip)
+    return out
+
+
+def process_chunk(rows: List[Dict[str, Any]], year_params: params.YearParams) -> List[Dict[str, Any]]:
+    """
+    Bir parçayı hesaplar; çıktı sırası girdi sırasıyla aynıdır.
+    Netten brüte satırlar toplu çözücüyle brüte çevrilir, ardından tüm satırların
+    bordrosu tek seferde toplu (NumPy) motorla hesaplanır.
+    Hatalı satırlar koşuyu durdurmaz, `error` alanıyla döner.
+    """
+    if len(year_params.period_starts) == 1:
+        return _process_rows(rows, year_params)
+
+    # Yıl içinde parametreler değişiyorsa satırlar, aylarında geçerli döneme göre hesaplanır
+    groups: Dict[params.YearParams, List[int]] = {}
+    for i, row in enumerate(rows):
+        period = year_params.for_month(row["month"] if row["error"] is None else 1)
+        groups.setdefault(period, []).append(i)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    for period, indices in groups.items():
+        for i, result in zip(indices, _process_rows([rows[i] for i in indices], period)):
+            results[i] = result
+    return results
+
+
+def _process_rows(rows: List[Dict[str, Any]], year_params: params.YearParams) -> List[Dict[str, Any]]:
+    try:
+        return _process_vectorized(rows, year_params)
+    except Exception as e:
+        if len(rows) == 1:
+            return [_output_row(rows[0], error=str(e))]
+        # Toplu hesap tek bir satır yüzünden düşerse satırlar tek tek hesaplanır
+        return [result for row in rows for result in _process_rows([row], year_params)]
+
+
+def _process_vectorized(rows: List[Dict[str, Any]], year_params: params.YearParams) -> List[Dict[str, Any]]:
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    gross_rows = []
+    target_rows = []
+
+    for i, row in enumerate(rows):
+        if row["error"] is not None:
+            results[i] = _output_row(row, error=row["error"])
+        elif row["gross"] is None and row["target_net"] is None:
+            results[i] = _output_row(row, error="gross veya target_net gerekli")
+        elif row["type"] not in year_params.rates:
+            results[i] = _output_row(row, error=f"Geçersiz çalışan tipi: {row['type']}")
+        elif row["gross"] is not None:
+            gross_rows.append(i)
+        else:
+            target_rows.append(i)
+
+    indices = gross_rows + target_rows
+    if not indices:
+        return results
+
+    gross = batch.to_kurus([rows[i]["gross"] for i in gross_rows])
+    residuals = [None] * len(gross_rows)
+    if target_rows:
+        solved = batch.find_gross_salaries(
+            [rows[i]["target_net"] for i in target_rows],
+            [rows[i]["cum_base"] for i in target_rows],
+            [rows[i]["type"] for i in target_rows],
+            year_params,
+            month=[rows[i]["month"] for i in target_rows],
+        )
+        gross = np.concatenate([gross, solved["gross"]])
+        residuals += [format_kurus(r) for r in solved["residual"].tolist()]
+
+    columns = batch.calculate_pay_slips(
+        gross,
+        batch.to_kurus([rows[i]["cum_base"] for i in indices]),
+        [rows[i]["type"] for i in indices],
+        year_params,
+        month=[rows[i]["month"] for i in indices],
+        kurus=True,
+    )
+    # Çıktı metne yazılacağı için kuruşlar doğrudan biçimlendirilir
+    values = [columns[field].tolist() for field in FIELDS]
+    for j, i in enumerate(indices):
+        payslip = {field: format_kurus(col[j]) for field, col in zip(FIELDS, values)}
+        if residuals[j] is None:
+            results[i] = _output_row(rows[i], payslip)
+        else:
+            results[i] = _output_row(
+                rows[i], payslip, target_net=rows[i]["target_net"],
+                found_gross=payslip["gross"], residual=residuals[j]
+            )
+
+    return results
+
+
+def item_row(index: Any, item: Dict[str, Any], default_year: int = 2026) -> Dict[str, Any]:
+    """
+    API öğesini ({"mode", "amount", "cum_base", "employee_type", "month", "year"}) hesaplanacak
+    satıra çevirir; geçersiz öğe, mod ve yıl `error` alanıyla işaretlenir.
+    """
+    if not isinstance(item, dict):
+        row = normalize_row(None)
+        row["id"], row["mode"], row["year"] = index, None, default_year
+        return row
+    mode = item.get("mode")
+    record = {
+        "id": index,
+        "cum_base": item.get("cum_base", "0"),
+        "type": item.get("employee_type", "normal_4a"),
+        "month": item.get("month", 1),
+    }
+    if mode == "gross_to_net":
+        record["gross"] = item.get("amount")
+    elif mode == "net_to_gross":
+        record["target_net"] = item.get("amount")
+    row = normalize_row(record)
+    if mode not in ("gross_to_net", "net_to_gross"):
+        row["error"] = "Geçersiz mod"
+    row["mode"] = mode
+    try:
+        row["year"] = int(item.get("year", default_year))
+    except (ValueError, TypeError):
+        row["year"] = default_year
+        row["error"] = f"Geçersiz yıl: {item.get('year')}"
+    return row
+
+
+def process_items(rows: List[Dict[str, Any]], year_params: params.YearParams) -> List[Dict[str, Any]]:
+    """`item_row` satırlarını hesaplar; sonuçlarda mod yer alır, boş alanlar atılır."""
+    results = []
+    for row, result in zip(rows, process_chunk(rows, year_params)):
+        result["mode"] = row["mode"]
+        results.append({k: v for k, v in result.items() if v is not None})
+    return results
+
+
+def process_item_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    `item_row` satırlarını yıllarına göre gruplayıp hesaplar; sonuçlar girdi sırasıyla döner.
+    Parametresi olmayan yılın satırları `error` alanıyla döner.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    by_year: Dict[int, List[int]] = {}
+    for i, row in enumerate(rows):
+        by_year.setdefault(row["year"], []).append(i)
+
+    for year, indices in by_year.items():
+        try:
+            year_params = params.get_year_params(year)
+        except FileNotFoundError:
+            for i in indices:
+                results[i] = {"id": rows[i]["id"], "mode": rows[i]["mode"], "error": f"{year} parametreleri bulunamadı"}
+            continue
+        for i, result in zip(indices, process_items([rows[i] for i in indices], year_params)):
+            results[i] = result
+    return results
+
+
+def calculate_items(items: List[Dict[str, Any]], default_year: int = 2026) -> List[Dict[str, Any]]:
+    """
+    API öğelerini (her biri isteğe bağlı "year" ile) yıla göre gruplayıp hesaplar;
+    sonuçlar girdi sırasıyla döner.
+    """
+    return process_item_rows([item_row(i, item, default_year) for i, item in enumerate(items)])
+
+
+def format_results(results: Iterable[Dict[str, Any]], fmt: str) -> str:
+    """Sonuçları CSV (başlıksız) veya JSONL metnine çevirir."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=OUTPUT_COLUMNS, extrasaction="ignore")
+        for result in results:
+            writer.writerow({k: ("" if v is None else str(v)) for k, v in result.items()})
+        return buffer.getvalue()
+    if fmt == "jsonl":
+        return "".join(json.dumps(result, default=str, ensure_ascii=False) + "\n" for result in results)
+    raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+
+
+class RosterWriter:
+    """Sonuçları CSV veya JSONL olarak akış halinde yazar."""
+
+    def __init__(self, stream: TextIO, fmt: str):
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            csv.DictWriter(stream, fieldnames=OUTPUT_COLUMNS).writeheader()
+
+    def write(self, results: Iterable[Dict[str, Any]]):
+        self.stream.write(format_results(results, self.fmt))
+
+    def write_text(self, text: str):
+        self.stream.write(text)
+
+
+# İşçi süreçlerde yıl parametreleri ve çıktı biçimi bir kez aktarılır ve burada tutulur
+_worker_year_params: Optional[params.YearParams] = None
+_worker_output_format: Optional[str] = None
+
+
+def _init_worker(year_params: params.YearParams, output_format: str):
+    global _worker_year_params, _worker_output_format
+    _worker_year_params = year_params
+    _worker_output_format = output_format
+
+
+def _run_chunk(records: List[Dict[str, Any]]) -> Tuple[int, str]:
+    # Ayrıştırma, hesap ve biçimlendirme işçide yapılır; ana süreç yalnızca yazar
+    results = process_chunk([normalize_row(r) for r in records], _worker_year_params)
+    return len(results), format_results(results, _worker_output_format)
+
+
+def run_batch(
+    records: Iterable[Dict[str, Any]],
+    year_params: params.YearParams,
+    writer: RosterWriter,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1
+) -> int:
+    """
+    Ham kayıtları (`read_records`) parça parça hesaplayıp yazar; işlenen satır sayısını döndürür.
+    workers > 1 ise parçalar süreç havuzuna dağıtılır; çıktı sırası girdiyle aynıdır.
+    """
+    count = 0
+    chunks = ordered_map(
+        _run_chunk, chunked(records, chunk_size), workers,
+        initializer=_init_worker, initargs=(year_params, writer.fmt)
+    )
+    for chunk_count, text in chunks:
+        writer.write_text(text)
+        count += chunk_count
+    return count
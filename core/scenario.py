@@ -0,0 +1,107 @@
+"""
+Parametre Senaryoları (What-if)
+Bir çalışan listesini, temel parametrelerin üzerine uygulanan değişiklik setleriyle
+(overlay) yeniden hesaplar. Liste bir kez kuruş dizilerine çevrilir ve tüm senaryolar
+tarafından paylaşılır; her senaryo yalnızca değişen parametreleri yeniden derler
+(tarife değişmediyse derlenmiş tarife önbellekten gelir). Sabit noktalı ölçeklerden
+ince bir değer içeren senaryo (ör. "stamp_rate": "0.007595") Decimal motoruyla hesaplanır.
+
+Overlay örnekleri:
+  {"min_wage_gross": "36000", "sgk_ceiling_monthly": "270000"}
+  {"rates": {"normal_4a": {"sgk_employee": "0.15"}}}
+  {"income_tax_tariff": [{"up_to": 200000, "rate": 0.15}, ...]}
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core import batch, fixedpoint, params, payroll
+from core.fixedpoint import FIELDS, from_kurus
+from core.params import apply_overlay
+
+# Toplamı alınan alanlar; "withholding" = ödenecek gelir vergisi + damga vergisi
+TOTAL_FIELDS = (
+    "gross", "sgk_employee", "unemployment_employee", "income_tax_net", "stamp_tax_net", "net",
+)
+DELTA_FIELDS = ("net", "withholding")
+
+
+def _totals(result: Dict[str, np.ndarray]) -> Dict[str, Decimal]:
+    totals = {field: from_kurus(int(result[field].sum())) for field in TOTAL_FIELDS}
+    totals["withholding"] = totals["income_tax_net"] + totals["stamp_tax_net"]
+    return totals
+
+
+def _decimal_pay_slips(gross, cum_prev, codes, year_params: params.YearParams, month) -> Dict[str, np.ndarray]:
+    # Satır satır Decimal motoru; sonuçlar toplu motorla aynı biçimde (kuruş dizileri) döner
+    months = np.broadcast_to(month, gross.shape).tolist()
+    slips = [
+        payroll.calculate_pay_slip(from_kurus(g), from_kurus(c), batch.EMPLOYEE_TYPES[t], year_params, m)
+        for g, c, t, m in zip(gross.tolist(), cum_prev.tolist(), codes.tolist(), months)
+    ]
+    return {field: batch.to_kurus([slip[field] for slip in slips]) for field in FIELDS}
+
+
+def run_scenarios(
+    gross,
+    cum_tax_base_prev,
+    employee_types,
+    overlays: Union[Dict[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]],
+    base_params: Optional[Dict[str, Any]] = None,
+    month=1,
+    kurus: bool = False
+) -> Dict[str, Any]:
+    """
+    Çalışan listesini temel parametrelerle ve her senaryoyla hesaplar.
+    gross / cum_tax_base_prev / employee_types / month / kurus: `batch.calculate_pay_slips` girdileri.
+    overlays: senaryo adı → değişiklik sözlüğü.
+    base_params: ham parametre sözlüğü (Varsayılan: 2026).
+
+    Dönüş: {"baseline": {"totals"}, "scenarios": [{"name", "totals", "delta_totals", "deltas", "engine"}]}
+    Toplamlar TL (Decimal); "deltas" çalışan başına kuruş cinsinden int64 fark dizileridir
+    ("net", "withholding"). "engine": "batch" veya (parametreler kuruş ölçeğine sığmıyorsa) "decimal".
+    """
+    if base_params is None:
+        base_params = params.load_params(2026)
+    if isinstance(base_params, params.YearParams):
+        base_params = base_params.to_dict()
+
+    # Liste bir kez çözülür; tüm senaryolar aynı dizileri kullanır
+    gross = batch.as_kurus(gross, kurus)
+    cum_prev = batch.as_kurus(cum_tax_base_prev, kurus)
+    codes = batch.type_codes(employee_types)
+    if not np.ndim(month):
+        month = int(month)
+    elif not isinstance(month, np.ndarray):
+        month = np.asarray(month, dtype=np.int64)
+
+    def evaluate(year_params: params.YearParams) -> Tuple[Dict[str, np.ndarray], str]:
+        if fixedpoint.is_representable(year_params):
+            result, engine = batch.calculate_pay_slips(gross, cum_prev, codes, year_params, month=month, kurus=True), "batch"
+        else:
+            result, engine = _decimal_pay_slips(gross, cum_prev, codes, year_params, month), "decimal"
+        result["withholding"] = result["income_tax_net"] + result["stamp_tax_net"]
+        return result, engine
+
+    baseline = evaluate(params.YearParams(base_params))[0]
+    baseline_totals = _totals(baseline)
+
+    items = overlays.items() if isinstance(overlays, dict) else overlays
+    scenarios: List[Dict[str, Any]] = []
+    for name, overlay in items:
+        try:
+            year_params = params.YearParams(apply_overlay(base_params, overlay))
+        except (ValueError, KeyError) as e:
+            raise ValueError(f"Senaryo '{name}': {e}")
+        result, engine = evaluate(year_params)
+        totals = _totals(result)
+        scenarios.append({
+            "name": name,
+            "totals": totals,
+            "delta_totals": {field: totals[field] - baseline_totals[field] for field in totals},
+            "deltas": {field: result[field] - baseline[field] for field in DELTA_FIELDS},
+            "engine": engine,
+        })
+
+    return {"baseline": {"totals": baseline_totals}, "scenarios": scenarios}
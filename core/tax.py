@@ -1,15 +1,117 @@
+from bisect import bisect_left
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
 
 def round_decimal(value: Decimal) -> Decimal:
     """Standart 2 hane yuvarlama."""
     return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-def calculate_total_tax_liability(cumulative_base: Decimal, tariff: list) -> Decimal:
+class CompiledTariff:
+    """
+    Bir parametre seti için bir kez derlenen vergi tarifesi.
+    Her dilimin alt sınırında birikmiş vergi (prefix) önceden hesaplanır;
+    herhangi bir kümülatif matrahın vergisi tek bisect + tek çarpma-toplama ile bulunur.
+    """
+    __slots__ = ("bounds", "lowers", "rates", "prefix_tax")
+
+    def __init__(self, tariff: list):
+        bounds: List[Decimal] = []
+        lowers: List[Decimal] = []
+        rates: List[Decimal] = []
+        prefix_tax: List[Decimal] = []
+
+        previous_limit = Decimal("0")
+        accumulated = Decimal("0")
+        for bracket in tariff:
+            limit = bracket["up_to"]
+            rate = bracket["rate"]
+            lowers.append(previous_limit)
+            rates.append(rate)
+            prefix_tax.append(accumulated)
+            if limit is None:
+                break
+            bounds.append(limit)
+            accumulated += (limit - previous_limit) * rate
+            previous_limit = limit
+        else:
+            # Tarife sınırsız dilimle bitmiyorsa son sınırın üstü vergilenmez
+            lowers.append(previous_limit)
+            rates.append(Decimal("0"))
+            prefix_tax.append(accumulated)
+
+        self.bounds: Tuple[Decimal, ...] = tuple(bounds)
+        self.lowers: Tuple[Decimal, ...] = tuple(lowers)
+        self.rates: Tuple[Decimal, ...] = tuple(rates)
+        self.prefix_tax: Tuple[Decimal, ...] = tuple(prefix_tax)
+
+    def bracket_index(self, cumulative_base: Decimal) -> int:
+        """Matrahın düştüğü dilimin indeksi (dilim sınırı o dilime dahildir)."""
+        return bisect_left(self.bounds, cumulative_base)
+
+    def liability(self, cumulative_base: Decimal) -> Decimal:
+        """Sıfırdan başlayarak kümülatif matrahın toplam vergisi."""
+        i = self.bracket_index(cumulative_base)
+        return self.prefix_tax[i] + (cumulative_base - self.lowers[i]) * self.rates[i]
+
+
+def compile_tariff(tariff: list) -> CompiledTariff:
+    """`params.get_tariff` çıktısından derlenmiş tarife üretir."""
+    return CompiledTariff(tariff)
+
+
+class ExemptionSchedule:
+    """
+    Asgari ücret istisnalarının ay ay (1-12) çizelgesi.
+    Gelir vergisi istisnası, asgari ücretlinin o aydaki kümülatif konumunda ödeyeceği
+    vergidir; çalışanın kendi matrahından bağımsızdır. Yıl parametreleri başına bir
+    kez hesaplanır ve o yılın tüm bordroları tarafından paylaşılır.
+    """
+    __slots__ = ("income_tax", "stamp")
+
+    def __init__(
+        self,
+        tariff: CompiledTariff,
+        min_wage_tax_bases: Sequence[Decimal],
+        stamp_exemptions: Sequence[Decimal]
+    ):
+        if len(min_wage_tax_bases) != 12 or len(stamp_exemptions) != 12:
+            raise ValueError("İstisna çizelgesi 12 ay içermelidir")
+
+        # İndeks = ay (0. eleman kullanılmaz)
+        income_tax = [Decimal("0")]
+        cumulative = Decimal("0")
+        for base in min_wage_tax_bases:
+            income_tax.append(calculate_income_tax_cumulative(cumulative, base, tariff))
+            cumulative += base
+
+        self.income_tax: Tuple[Decimal, ...] = tuple(income_tax)
+        self.stamp: Tuple[Decimal, ...] = (Decimal("0"),) + tuple(stamp_exemptions)
+
+    @staticmethod
+    def _check_month(month: int):
+        if not 1 <= month <= 12:
+            raise ValueError(f"Geçersiz ay: {month}")
+
+    def income_tax_exemption(self, month: int) -> Decimal:
+        """O ay için asgari ücret gelir vergisi istisnası."""
+        self._check_month(month)
+        return self.income_tax[month]
+
+    def stamp_exemption(self, month: int) -> Decimal:
+        """O ay için asgari ücret damga vergisi istisnası."""
+        self._check_month(month)
+        return self.stamp[month]
+
+
+def calculate_total_tax_liability(cumulative_base: Decimal, tariff) -> Decimal:
     """
     Sıfırdan başlayarak verilen kümülatif matrahın toplam vergisini hesaplar.
     Bu yöntem dilim geçişlerini otomatik yönetir.
+    `tariff` bir dilim listesi veya `CompiledTariff` olabilir.
     """
+    if isinstance(tariff, CompiledTariff):
+        return tariff.liability(cumulative_base)
+
     total_tax = Decimal("0")
     remaining_base = cumulative_base
     previous_limit = Decimal("0")
@@ -43,7 +145,7 @@ def calculate_total_tax_liability(cumulative_base: Decimal, tariff: list) -> Dec
 def calculate_income_tax_cumulative(
     cum_base_prev: Decimal, 
     current_month_base: Decimal, 
-    tariff: list
+    tariff
 ) -> Decimal:
     """
     Kümülatif yönteme göre o ayın vergisini hesaplar.
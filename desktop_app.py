@@ -9,7 +9,6 @@ import os
 import webbrowser
 from decimal import Decimal
 from core import payroll, params
-from core.analyzer import extract_text_from_pdf, parse_payslip, analyze_payslip
 
 # Global referans (dosya diyalogu için)
 _window = None
@@ -23,7 +22,7 @@ class BordroAPI:
     
     def _get_params(self, year=2026):
         if self._year_params is None:
-            self._year_params = params.load_params(year)
+            self._year_params = params.get_year_params(year)
         return self._year_params
     
     def _get_params_path(self, year=2026):
@@ -32,25 +31,26 @@ class BordroAPI:
             self._params_path = os.path.join(base, "data", f"params_{year}.json")
         return self._params_path
     
-    def calculate(self, mode, amount, cum_base, employee_type):
+    def calculate(self, mode, amount, cum_base, employee_type, month=1):
         try:
             year_params = self._get_params()
             amount = Decimal(str(amount))
             cum_base = Decimal(str(cum_base))
+            month = int(month)
             
             if mode == 'gross_to_net':
                 result = payroll.calculate_pay_slip(
                     gross=amount, cum_tax_base_prev=cum_base,
-                    employee_type=employee_type, year_params=year_params
+                    employee_type=employee_type, year_params=year_params, month=month
                 )
             elif mode == 'net_to_gross':
                 gross = payroll.find_gross_salary(
                     target_net=amount, cum_tax_base_prev=cum_base,
-                    employee_type=employee_type, year_params=year_params
+                    employee_type=employee_type, year_params=year_params, month=month
                 )
                 result = payroll.calculate_pay_slip(
                     gross=gross, cum_tax_base_prev=cum_base,
-                    employee_type=employee_type, year_params=year_params
+                    employee_type=employee_type, year_params=year_params, month=month
                 )
                 result['found_gross'] = str(gross)
             else:
@@ -61,6 +61,16 @@ class BordroAPI:
         except Exception as e:
             return json.dumps({"success": False, "error": str(e)})
     
+    def preview(self, mode, amount, cum_base, employee_type, month=1):
+        """Yazarken anlık net/brüt; önbellekteki eğriden hesaplanır."""
+        try:
+            result = payroll.preview(
+                mode, Decimal(str(amount)), Decimal(str(cum_base)), employee_type, self._get_params(), int(month)
+            )
+            return json.dumps({"success": True, "data": {k: str(v) for k, v in result.items()}})
+        except Exception as e:
+            return json.dumps({"success": False, "error": str(e)})
+    
     def calculate_annual(self, gross, employee_type):
         try:
             year_params = self._get_params()
@@ -83,7 +93,7 @@ class BordroAPI:
     def get_params_info(self):
         try:
             p = self._get_params()
-            return json.dumps(p, default=str)
+            return json.dumps(p.to_dict(), default=str)
         except Exception as e:
             return json.dumps({"error": str(e)})
     
@@ -123,33 +133,21 @@ class BordroAPI:
     
     def analyze_pdf(self, pdf_path):
         """PDF bordro dosyasını analiz eder."""
+        # Analiz modülü (pdfplumber) yalnızca ilk PDF açıldığında yüklenir
+        from core.analyzer import analyze_pdf
         try:
             if not os.path.exists(pdf_path):
                 return json.dumps({"success": False, "error": "Dosya bulunamadı"})
             
-            # 1. PDF'den metin çıkar
-            raw_text = extract_text_from_pdf(pdf_path)
-            if not raw_text or len(raw_text.strip()) < 20:
-                return json.dumps({
-                    "success": False,
-                    "error": "PDF'den metin çıkarılamadı. Dosya taranmış bir görüntü olabilir."
-                })
-            
-            # 2. Alanları parse et
-            parsed = parse_payslip(raw_text)
-            
-            # 3. Analiz ve yorumla
-            year_params = self._get_params()
-            analysis = analyze_payslip(parsed, year_params)
-            analysis["raw_text_preview"] = raw_text[:2000]  # İlk 2000 karakter
-            analysis["filename"] = os.path.basename(pdf_path)
-            
+            # Metin çıkarma, alanları parse etme, analiz ve yorum
+            analysis = analyze_pdf(pdf_path, self._get_params())
             return json.dumps({"success": True, "data": analysis})
         except Exception as e:
             return json.dumps({"success": False, "error": str(e)})
     
     def analyze_manual(self, values_json):
         """Kullanıcının manuel girdiği değerlerle analiz yapar."""
+        from core.analyzer import analyze_payslip
         try:
             vals = json.loads(values_json)
             
@@ -172,7 +170,8 @@ class BordroAPI:
                     "error": "En az bir alan doldurulmalıdır."
                 })
             
-            parsed["detected_month"] = None
+            # Dönem formda seçilen aydan alınır
+            parsed["detected_month"] = int(vals["month"]) if vals.get("month") else None
             parsed["detected_year"] = None
             parsed["_generic_pairs"] = []
             
@@ -27,6 +27,9 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     });
 
+    // Ay seçimi (istisna ve dönem parametreleri aya göre); varsayılan içinde bulunulan ay
+    document.getElementById('month').value = new Date().getMonth() + 1;
+
     // Form Submittion
     const form = document.getElementById('calcForm');
     const resultPanel = document.getElementById('resultPanel');
@@ -0,0 +1,9 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Testler kullanıcı önbellek klasörüne (PDF önbelleği, şablonlar) yazmaz
+if not os.environ.get("BORDRO_CACHE_DIR"):
+    os.environ["BORDRO_CACHE_DIR"] = tempfile.mkdtemp(prefix="bordro-test-")
+    atexit.register(shutil.rmtree, os.environ["BORDRO_CACHE_DIR"], True)
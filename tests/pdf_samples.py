@@ -0,0 +1,102 @@
+"""
+Testler için küçük bordro PDF'leri üretir (harici kütüphane gerektirmez).
+Metin standart Helvetica yazı tipiyle yazılır; Türkçe harfler yerine ASCII karşılıkları
+kullanılır (kalıplar [ÜU], [İI] gibi her iki yazımı da kabul eder).
+"""
+from typing import List, Optional, Sequence, Tuple
+
+# Tam okunan (güven 1.0) örnek bordro
+PAYSLIP_LINES = [
+    "OCAK 2026 AYI UCRET BORDROSU",
+    "TOPLAM BRUT GELIR: 85000.00",
+    "SGK MATRAHI: 85000.00",
+    "SGK PRIMI: 11900.00",
+    "ISSIZ.SIG.ISCI PRIM: 850.00",
+    "GELIR VERGISI: 8000.00",
+    "DAMGA VERGISI: 450.00",
+    "NET UCRET: 63800.00",
+]
+
+
+def payslip_lines(gross: str = "85000.00", net: str = "63800.00", header: str = "OCAK 2026 AYI UCRET BORDROSU") -> List[str]:
+    lines = list(PAYSLIP_LINES)
+    lines[0] = header
+    lines[1] = f"TOPLAM BRUT GELIR: {gross}"
+    lines[-1] = f"NET UCRET: {net}"
+    return lines
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(lines: Sequence[str], table: Optional[Sequence[Sequence[str]]]) -> bytes:
+    ops = ["BT /F1 11 Tf"]
+    y = 800
+    for line in lines:
+        ops.append(f"1 0 0 1 50 {y} Tm ({_escape(line)}) Tj")
+        y -= 18
+    ops.append("ET")
+
+    if table:
+        # Çizgili tablo: pdfplumber tabloyu çizgilerden tanır
+        col_width, row_height = 160, 20
+        top = y - 20
+        cols = len(table[0])
+        ops.append("0.5 w")
+        for r in range(len(table) + 1):
+            ops.append(f"50 {top - r * row_height} m {50 + cols * col_width} {top - r * row_height} l S")
+        for c in range(cols + 1):
+            ops.append(f"{50 + c * col_width} {top} m {50 + c * col_width} {top - len(table) * row_height} l S")
+        ops.append("BT /F1 10 Tf")
+        for r, row in enumerate(table):
+            for c, cell in enumerate(row):
+                ops.append(f"1 0 0 1 {55 + c * col_width} {top - (r + 1) * row_height + 6} Tm ({_escape(cell)}) Tj")
+        ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def make_pdf(path: str, pages: Sequence[Sequence[str]], tables: Sequence[Optional[Sequence[Sequence[str]]]] = ()) -> str:
+    """Her sayfası verilen satırlardan (ve isteğe bağlı bir tablodan) oluşan PDF yazar."""
+    tables = list(tables) + [None] * (len(pages) - len(tables))
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # sayfa ağacı aşağıda doldurulur
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids: List[int] = []
+    for lines, table in zip(pages, tables):
+        stream = _page_stream(lines, table)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+    return path
+
+
+def make_payslip_pdf(path: str, **kwargs) -> str:
+    return make_pdf(path, [payslip_lines(**kwargs)])
+
+
+def make_company_pdf(path: str, employees: Sequence[Tuple[str, str]], header: str = "OCAK 2026 AYI UCRET BORDROSU") -> str:
+    """Her çalışanın bordrosu ayrı sayfada olan çok çalışanlı PDF (brüt, net çiftleri)."""
+    return make_pdf(path, [payslip_lines(gross, net, header) for gross, net in employees])
@@ -0,0 +1,150 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from core import analyzer, params, payroll
+from pdf_samples import PAYSLIP_LINES, make_pdf, payslip_lines
+
+TABLE = [["KALEM", "TUTAR"], ["YEMEK", "1500.00"], ["YOL", "750.00"]]
+
+class TestTieredExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def pdf(self, name, pages):
+        return make_pdf(os.path.join(self.tmp.name, name), pages, [TABLE] * len(pages))
+
+    def test_text_layer_sufficient_skips_tables(self):
+        path = self.pdf("tam.pdf", [PAYSLIP_LINES, ["EK SAYFA"]])
+        timings = {}
+        text = analyzer.extract_text_from_pdf(path, timings=timings)
+        self.assertEqual(timings["table_pages"], 0)
+        self.assertNotIn("YEMEK | 1500.00", text)
+        self.assertTrue(set(timings) >= {"open", "text", "tables"})
+
+        full = analyzer.extract_text_from_pdf(path, "always")
+        self.assertIn("YEMEK | 1500.00", full)
+        self.assertEqual(analyzer.parse_payslip(text)["_parse_confidence"],
+                         analyzer.parse_payslip(full)["_parse_confidence"])
+
+    def test_missing_critical_field_falls_back_to_tables(self):
+        lines = [line for line in PAYSLIP_LINES if not line.startswith("GELIR VERGISI")]
+        path = self.pdf("eksik.pdf", [lines, ["EK SAYFA"]])
+        timings = {}
+        text = analyzer.extract_text_from_pdf(path, timings=timings)
+        self.assertEqual(timings["table_pages"], 2)
+        self.assertEqual(text, analyzer.extract_text_from_pdf(path, "always"))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            analyzer.extract_text_from_pdf(self.pdf("x.pdf", [PAYSLIP_LINES]), "bazen")
+
+class TestPayslipStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_boundaries(self):
+        first = payslip_lines("50000.00", "40000.00")
+        pages = [
+            ["T.C. KIMLIK NO: 11111111111"] + first[:4],   # 1. çalışan, 2 sayfa
+            first[4:] + ["ACIKLAMA"],
+            ["T.C. KIMLIK NO: 22222222222", "OCAK 2026"],  # 2. çalışan: yalnızca kimlik değişir
+            payslip_lines("60000.00", "45000.00")[1:],
+            payslip_lines("70000.00", "52000.00"),         # 3. çalışan: yinelenen brüt
+        ]
+        path = make_pdf(os.path.join(self.tmp.name, "sirket.pdf"), pages)
+        payslips = list(analyzer.iter_payslip_texts(path))
+        self.assertEqual([(a, b) for a, b, _ in payslips], [(1, 2), (3, 4), (5, 5)])
+
+        parsed = [analyzer.parse_payslip(text) for _, _, text in payslips]
+        self.assertEqual([p["gross"] for p in parsed], [Decimal("50000.00"), Decimal("60000.00"), Decimal("70000.00")])
+        self.assertEqual([p["_parse_confidence"] for p in parsed], [1.0, 1.0, 1.0])
+        self.assertEqual(analyzer.employee_id(payslips[1][2]), "22222222222")
+
+    def test_single_payslip_matches_extract(self):
+        path = make_pdf(os.path.join(self.tmp.name, "tek.pdf"), [PAYSLIP_LINES, ["EK SAYFA"]])
+        (first, last, text), = analyzer.iter_payslip_texts(path)
+        self.assertEqual((first, last), (1, 2))
+        self.assertEqual(text, analyzer.extract_text_from_pdf(path))
+
+class TestParallelPages(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        pages = [payslip_lines(f"{50000 + i}.00", f"{40000 + i}.00") for i in range(analyzer.PARALLEL_MIN_PAGES + 3)]
+        self.path = make_pdf(os.path.join(self.tmp.name, "buyuk.pdf"), pages, [TABLE] * len(pages))
+
+    def test_parallel_matches_serial(self):
+        for tables in ("auto", "always"):
+            timings = {}
+            parallel = analyzer.extract_text_from_pdf(self.path, tables, timings, workers=2)
+            self.assertEqual(parallel, analyzer.extract_text_from_pdf(self.path, tables))
+            self.assertEqual(timings["table_pages"], 0 if tables == "auto" else analyzer.PARALLEL_MIN_PAGES + 3)
+
+        serial = list(analyzer.iter_payslip_texts(self.path))
+        self.assertEqual(list(analyzer.iter_payslip_texts(self.path, workers=2)), serial)
+        self.assertEqual(len(serial), analyzer.PARALLEL_MIN_PAGES + 3)
+
+    def test_memory_ceiling_limits_workers(self):
+        self.assertEqual(analyzer.page_workers(self.path, 8), 8)
+        self.assertEqual(analyzer.page_workers(self.path, 8, max_memory_mb=2.5 * analyzer.WORKER_MEMORY_MB), 2)
+        self.assertEqual(analyzer.page_workers(self.path, 8, max_memory_mb=10), 1)
+
+class TestFieldScanner(unittest.TestCase):
+
+    def test_pattern_priority_and_case_folding(self):
+        text = "brüt ücret: 70000.00\nToplam Brüt Gelır: 85 000.00\nNET ÖDENEN: 61000.00\nNet Ücret: 0\ngelir vergisi: 8000.00"
+        parsed = analyzer.parse_payslip(text)
+        # İlk kalıp (TOPLAM BRÜT GELİR) metindeki konumundan bağımsız olarak önceliklidir
+        self.assertEqual(parsed["gross"], Decimal("85000.00"))
+        self.assertEqual(parsed["net"], Decimal("61000.00"))
+        self.assertEqual(parsed["net_paid"], Decimal("61000.00"))
+        self.assertEqual(parsed["income_tax"], Decimal("8000.00"))
+        self.assertNotIn("sgk_employee", parsed)
+        self.assertEqual(parsed["_missing_critical"], ["sgk_employee"])
+
+    def test_required_literals_match_ignorecase(self):
+        for field_name, regexes in analyzer._FIELD_REGEXES.items():
+            for regex, literal in regexes:
+                self.assertTrue(literal, regex.pattern)
+
+        self.assertEqual(analyzer._fold("GELİR VERGİSİ"), analyzer._fold("gelır vergısı"))
+
+    def test_generic_pairs_limit(self):
+        text = "".join(f"KALEM {chr(65 + i % 26)}: {100 + i}.00\n" for i in range(50))
+        pairs = analyzer.extract_generic_pairs(text)
+        self.assertEqual(len(pairs), analyzer.MAX_GENERIC_PAIRS)
+        self.assertEqual(pairs[0]["value"], "100.00")
+
+class TestAnalyzePayslip(unittest.TestCase):
+
+    def test_uses_period_of_month(self):
+        raw = params.load_params(2026)
+        raw["periods"] = [{"effective_from": "2026-07-01", "sgk_ceiling_monthly": "270000.00"}]
+        january = params.YearParams(raw)
+        slip = payroll.calculate_pay_slip(Decimal("300000"), Decimal("0"), "normal_4a", january, 7)
+        parsed = {
+            "gross": slip["gross"], "net": slip["net"], "sgk_employee": slip["sgk_employee"],
+            "unemployment_employee": slip["unemployment_employee"], "income_tax": slip["income_tax_net"],
+            "stamp_tax": slip["stamp_tax_net"], "sgk_base": slip["pek"], "detected_month": None,
+        }
+
+        analysis = analyzer.analyze_payslip(parsed, january, month=7)
+        self.assertEqual(analysis["warnings"], [])
+        self.assertTrue(any("tavan" in e for e in analysis["explanations"]))
+
+        # Bordroda tespit edilen ay, verilen aydan önceliklidir
+        analysis = analyzer.analyze_payslip(dict(parsed, detected_month=7), january, month=1)
+        self.assertEqual(analysis["warnings"], [])
+
+        # Ay bilinmiyorsa Ocak varsayıldığı uyarısı verilir
+        analysis = analyzer.analyze_payslip(parsed, january)
+        self.assertTrue(any("tespit edilemedi" in w for w in analysis["warnings"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import unittest
+from decimal import Decimal
+import app as app_module
+from app import app
+from core import params, payroll
+
+class TestBatchEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.year_params = params.get_year_params(2026)
+
+    def test_mixed_items_in_order(self):
+        items = [
+            {"mode": "gross_to_net", "amount": "85000", "cum_base": "120000", "month": 3},
+            {"mode": "net_to_gross", "amount": "60000"},
+            {"mode": "gross_to_net", "amount": "abc"},
+            {"mode": "unknown", "amount": "1000"},
+        ]
+        response = self.client.post('/calculate/batch', json={"items": items})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()["data"]
+        self.assertEqual([d["id"] for d in data], [0, 1, 2, 3])
+
+        expected = payroll.calculate_pay_slip(Decimal("85000"), Decimal("120000"), "normal_4a", self.year_params, 3)
+        self.assertEqual(data[0]["net"], str(expected["net"]))
+        self.assertLessEqual(abs(Decimal(data[1]["net"]) - Decimal("60000")), Decimal("0.01"))
+        self.assertIn("error", data[2])
+        self.assertIn("error", data[3])
+
+    def test_invalid_items_are_item_errors(self):
+        items = [
+            {"mode": "gross_to_net", "amount": "1e30"},
+            {"mode": "net_to_gross", "amount": "Infinity"},
+            {"mode": "gross_to_net", "amount": "NaN"},
+            [1, 2],
+            "50000",
+            {"mode": "gross_to_net", "amount": "50000", "year": "abc"},
+            {"mode": "gross_to_net", "amount": "50000", "year": None},
+            {"mode": "gross_to_net", "amount": "50000"},
+        ]
+        response = self.client.post('/calculate/batch', json={"items": items})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()["data"]
+        self.assertEqual([d["id"] for d in data], list(range(len(items))))
+        self.assertTrue(all("error" in d for d in data[:-1]))
+        self.assertNotIn("error", data[-1])
+
+        response = self.client.post('/calculate/batch', json={"items": {"mode": "gross_to_net"}})
+        self.assertEqual(response.status_code, 400)
+
+    def test_item_limit(self):
+        items = [{"mode": "gross_to_net", "amount": "50000"}] * (app_module.MAX_BATCH_ITEMS + 1)
+        response = self.client.post('/calculate/batch', json={"items": items})
+        self.assertEqual(response.status_code, 400)
+
+class TestIndexPage(unittest.TestCase):
+
+    def test_form_sends_month(self):
+        """İstisna aya bağlı olduğundan hesap formu ayı da göndermeli."""
+        page = app.test_client().get('/').get_data(as_text=True)
+        self.assertIn('name="month"', page)
+
+class TestOffersEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.year_params = params.get_year_params(2026)
+
+    def test_solves_rows_with_row_errors(self):
+        rows = [
+            {"target_net": "60000", "cum_base": "120000", "month": 3},
+            {"cum_base": "0"},
+            [1, 2],
+            {"target_net": "60000", "employee_type": "memur"},
+            {"target_net": "60000", "month": 13},
+            {"target_net": "1e30"},
+            {"target_net": "45000", "employee_type": "emekli_sgdp"},
+        ]
+        response = self.client.post('/calculate/offers', json={"rows": rows})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()["data"]
+        self.assertEqual(len(data), len(rows))
+
+        slip = payroll.calculate_pay_slip(Decimal(data[0]["gross"]), Decimal("120000"), "normal_4a", self.year_params, 3)
+        self.assertEqual(data[0]["net"], str(slip["net"]))
+        self.assertLessEqual(abs(slip["net"] - Decimal("60000")), Decimal("0.01"))
+        self.assertEqual(data[0]["target_net"], "60000")
+        self.assertEqual(Decimal(data[0]["net"]) - Decimal("60000"), Decimal(data[0]["residual"]))
+        self.assertTrue(all("error" in d for d in data[1:6]))
+        self.assertNotIn("error", data[6])
+
+    def test_limits(self):
+        rows = [{"target_net": "50000"}] * (app_module.MAX_BATCH_ITEMS + 1)
+        self.assertEqual(self.client.post('/calculate/offers', json={"rows": rows}).status_code, 400)
+        self.assertEqual(self.client.post('/calculate/offers', json={"rows": [], "year": 1990}).status_code, 400)
+
+class TestStreamEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_ndjson_stream_matches_batch(self):
+        items = [{"mode": "gross_to_net", "amount": str(40000 + i * 1000), "cum_base": str(i * 5000)} for i in range(7)]
+        items.append({"mode": "net_to_gross", "amount": "60000"})
+        body = "\n".join(json.dumps(item) for item in items) + "\n{bozuk\n"
+
+        response = self.client.post('/calculate/stream?chunk_size=3', data=body.encode("utf-8"),
+                                    content_type='application/x-ndjson')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        expected = self.client.post('/calculate/batch', json={"items": items}).get_json()["data"]
+        self.assertEqual(streamed[:-1], expected)
+        self.assertIn("error", streamed[-1])
+
+    def test_item_year_matches_batch(self):
+        items = [{"mode": "gross_to_net", "amount": "50000", "year": 2025},
+                 {"mode": "gross_to_net", "amount": "50000", "year": "abc"},
+                 {"mode": "gross_to_net", "amount": "50000", "year": 2026}]
+        body = "\n".join(json.dumps(item) for item in items)
+        response = self.client.post('/calculate/stream', data=body.encode("utf-8"), content_type='application/x-ndjson')
+        streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        expected = self.client.post('/calculate/batch', json={"items": items}).get_json()["data"]
+        self.assertEqual(streamed, expected)
+        self.assertEqual(streamed[0]["error"], "2025 parametreleri bulunamadı")
+        self.assertIn("error", streamed[1])
+        self.assertNotIn("error", streamed[2])
+
+    def test_invalid_items_become_error_lines(self):
+        lines = ['[1, 2]', '"50000"', '{"mode": "gross_to_net", "amount": "1e30"}',
+                 '{"mode": "gross_to_net", "amount": "Infinity"}', '{"mode": "gross_to_net", "amount": "50000"}']
+        response = self.client.post('/calculate/stream?chunk_size=2', data="\n".join(lines).encode("utf-8"),
+                                    content_type='application/x-ndjson')
+        streamed = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([r["id"] for r in streamed], [0, 1, 2, 3, 4])
+        self.assertTrue(all("error" in r for r in streamed[:-1]))
+        self.assertNotIn("error", streamed[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import unittest
+from decimal import Decimal
+import asgi_app
+from core import params, payroll
+
+def request(method, path, body=b"", query=b""):
+    """Uygulamayı bir sunucu olmadan çağırır; (durum, JSON) döner."""
+    async def call():
+        messages = [{"type": "http.request", "body": body[:10], "more_body": len(body) > 10},
+                    {"type": "http.request", "body": body[10:], "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": method, "path": path, "query_string": query}
+        await asgi_app.app(scope, receive, send)
+        return sent[0]["status"], json.loads(sent[1]["body"])
+
+    try:
+        return asyncio.run(call())
+    finally:
+        asgi_app.shutdown()
+
+class TestAsgiApp(unittest.TestCase):
+
+    def test_calculate_matches_engine(self):
+        body = json.dumps({"mode": "gross_to_net", "amount": "85000", "cum_base": "120000", "month": 3}).encode()
+        status, payload = request("POST", "/calculate", body)
+        self.assertEqual(status, 200)
+        expected = payroll.calculate_pay_slip(
+            Decimal("85000"), Decimal("120000"), "normal_4a", params.get_year_params(2026, 3), 3
+        )
+        self.assertEqual(payload["data"]["net"], str(expected["net"]))
+        self.assertEqual(payload["input_gross"], "85000")
+
+    def test_invalid_mode_and_unknown_path(self):
+        status, payload = request("POST", "/calculate", json.dumps({"mode": "x", "amount": "1"}).encode())
+        self.assertEqual(status, 400)
+        self.assertFalse(payload["success"])
+        self.assertEqual(request("GET", "/yok")[0], 404)
+
+    def test_batch_in_pool_matches_inline(self):
+        items = [{"mode": "gross_to_net", "amount": str(30000 + i * 500)} for i in range(asgi_app.INLINE_BATCH_ITEMS + 5)]
+        items.append({"mode": "net_to_gross", "amount": "60000"})
+        status, payload = request("POST", "/calculate/batch", json.dumps({"items": items}).encode())
+        self.assertEqual(status, 200)
+
+        inline = []
+        for start in range(0, len(items), asgi_app.INLINE_BATCH_ITEMS):
+            chunk = items[start:start + asgi_app.INLINE_BATCH_ITEMS]
+            inline += request("POST", "/calculate/batch", json.dumps({"items": chunk}).encode())[1]["data"]
+        self.assertEqual([d["net"] for d in payload["data"]], [d["net"] for d in inline])
+
+    def test_body_limit(self):
+        body = b"x" * (asgi_app.MAX_PDF_BYTES + 1)
+        self.assertEqual(request("POST", "/analyze", body)[0], 413)
+        self.assertEqual(request("POST", "/analyze")[0], 400)
+
+if __name__ == '__main__':
+    unittest.main()
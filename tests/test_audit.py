@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from core import audit
+from pdf_samples import make_company_pdf, make_payslip_pdf
+
+class TestAudit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        # Varsayılan önbellek ve şablon deposu geçici klasörde (kullanıcı önbelleğine yazılmaz)
+        patcher = mock.patch.dict(os.environ, {"BORDRO_CACHE_DIR": os.path.join(root, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.makedirs(os.path.join(root, "alt"))
+        make_payslip_pdf(os.path.join(root, "b.pdf"))
+        make_payslip_pdf(os.path.join(root, "alt", "a.pdf"), gross="90000.00", header="MART 2026 AYI")
+        with open(os.path.join(root, "bozuk.pdf"), "wb") as f:
+            f.write(b"PDF degil")
+        with open(os.path.join(root, "not.txt"), "w") as f:
+            f.write("x")
+
+    def test_find_pdfs(self):
+        root = self.tmp.name
+        files = audit.find_pdfs([root, os.path.join(root, "*.pdf")])
+        self.assertEqual([os.path.relpath(f, root) for f in files], [os.path.join("alt", "a.pdf"), "b.pdf", "bozuk.pdf"])
+
+    def test_records_in_order_with_errors(self):
+        files = audit.find_pdfs([self.tmp.name])
+        serial = list(audit.analyze_files(files, use_cache=False))
+        self.assertEqual([r["file"] for r in serial], files)
+
+        self.assertEqual(serial[0]["parsed_fields"]["gross"], "90000.00")
+        self.assertEqual(serial[0]["detected_month"], 3)
+        self.assertEqual(serial[1]["parse_confidence"], 1.0)
+        self.assertEqual(serial[1]["missing_critical"], [])
+        self.assertIn("findings", serial[1])
+        self.assertIn("error", serial[2])
+
+        parallel = list(audit.analyze_files(files, workers=2, use_cache=False))
+        for record in serial + parallel:
+            record.pop("timings")
+        self.assertEqual(parallel, serial)
+
+    def test_split_company_pdf(self):
+        path = make_company_pdf(os.path.join(self.tmp.name, "sirket.pdf"),
+                                [("50000.00", "40000.00"), ("60000.00", "45000.00"), ("70000.00", "52000.00")])
+        files = [path, os.path.join(self.tmp.name, "bozuk.pdf")]
+        records = list(audit.analyze_files(files, split=True))
+        self.assertEqual([r.get("pages") for r in records], [[1, 1], [2, 2], [3, 3], None])
+        self.assertEqual([r["parsed_fields"]["gross"] for r in records[:3]], ["50000.00", "60000.00", "70000.00"])
+        self.assertIn("error", records[3])
+
+        parallel = list(audit.analyze_files(files, workers=2, split=True))
+        for record in records + parallel:
+            record.pop("timings", None)
+        self.assertEqual(parallel, records)
+
+if __name__ == '__main__':
+    unittest.main()
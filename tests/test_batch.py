@@ -0,0 +1,151 @@
+import random
+import unittest
+from decimal import Decimal
+import numpy as np
+from core import batch, payroll, params
+
+class TestBatchPayroll(unittest.TestCase):
+
+    def setUp(self):
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def test_matches_scalar_engine(self):
+        """Toplu motor her satırda tekil motorla kuruşu kuruşuna aynı olmalı."""
+        rng = random.Random(2026)
+        gross = [Decimal(rng.randint(0, 40000000)) / 100 for _ in range(500)]
+        # Yarım kuruşa denk gelen SGK tutarları (x.x5 × 0.14) yuvarlama sınırını zorlar
+        gross += [Decimal("12345.25"), Decimal("33030.00"), Decimal("247725.00"), Decimal("247725.01")]
+        cum_base = [Decimal(rng.randint(0, 600000000)) / 100 for _ in gross]
+        types = [rng.choice(batch.EMPLOYEE_TYPES) for _ in gross]
+
+        result = batch.calculate_pay_slips(gross, cum_base, types, self.year_params)
+        for i in range(len(gross)):
+            expected = payroll.calculate_pay_slip(gross[i], cum_base[i], types[i], self.year_params)
+            self.assertEqual(batch.row(result, i), expected, f"{gross[i]} {cum_base[i]} {types[i]}")
+
+    def test_kurus_arrays_and_type_codes(self):
+        gross = batch.to_kurus(["50000", "60000.50"])
+        cum_base = batch.to_kurus(["0", "0"])
+        codes = batch.type_codes(["normal_4a", "emekli_sgdp"])
+        result = batch.calculate_pay_slips(gross, cum_base, codes, self.year_params, kurus=True)
+        self.assertEqual(list(result["gross"]), [5000000, 6000050])
+        self.assertEqual(int(result["unemployment_employee"][1]), 0)
+
+        # Bayraksız tamsayı dizisi TL sayılır
+        tl = batch.calculate_pay_slips(np.array([50000, 60000]), np.array([0, 0]), codes, self.year_params)
+        self.assertEqual(list(tl["gross"]), [5000000, 6000000])
+
+    def test_amount_range(self):
+        """int64 ara tutarları taşacak ya da sonlu olmayan tutarlar sessizce yanlış sonuç vermemeli."""
+        for amount in ["1e11", "Infinity", "NaN", "abc"]:
+            with self.assertRaises(ValueError):
+                batch.calculate_pay_slips([amount], ["0"], ["normal_4a"], self.year_params)
+        with self.assertRaises(ValueError):
+            batch.to_kurus(np.array([float("inf")]))
+        with self.assertRaises(ValueError):
+            batch.calculate_pay_slips(np.array([batch.MAX_KURUS + 1]), np.array([0]), ["normal_4a"],
+                                      self.year_params, kurus=True)
+
+        limit = batch.from_kurus(batch.MAX_KURUS)
+        result = batch.calculate_pay_slips([limit], [limit], ["normal_4a"], self.year_params)
+        self.assertEqual(batch.row(result, 0), payroll.calculate_pay_slip(limit, limit, "normal_4a", self.year_params))
+        solved = batch.find_gross_salaries([limit], [limit], ["normal_4a"], self.year_params)
+        self.assertGreater(int(solved["gross"][0]), batch.MAX_KURUS)
+
+    def test_float_arrays_round_half_up(self):
+        """Float diziler de liste / Decimal yoluyla aynı (ROUND_HALF_UP) yuvarlanmalı."""
+        values = [0.125, -0.125, 1.005, 2.675, -2.675, 123.455, 1000000.005]
+        self.assertEqual(batch.to_kurus(np.array(values)).tolist(), batch.to_kurus(values).tolist())
+        self.assertEqual(batch.to_kurus(np.array([0.125, -0.125])).tolist(), [13, -13])
+
+    def test_annual_projection_matches_monthly_chain(self):
+        """12 aylık matris, bordroyu ay ay zincirlemekle aynı olmalı (ek ödemeler dahil)."""
+        gross = [Decimal("45000"), Decimal("180000.75"), Decimal("520000")]
+        types = ["normal_4a", "emekli_sgdp", "normal_4a"]
+        fuel = [Decimal("2500"), Decimal("0"), Decimal("1200.40")]
+        projection = batch.project_annual(gross, types, self.year_params,
+                                          cum_tax_base_start=["0", "10000", "0"],
+                                          extras={11: fuel, 12: "20000"})
+        self.assertEqual(projection["net"].shape, (3, 12))
+
+        for i in range(3):
+            cum_base = [Decimal("0"), Decimal("10000"), Decimal("0")][i]
+            for month in range(1, 13):
+                month_gross = gross[i] + (fuel[i] if month == 11 else 0) + (Decimal("20000") if month == 12 else 0)
+                expected = payroll.calculate_pay_slip(month_gross, cum_base, types[i], self.year_params, month)
+                cum_base = expected["cum_tax_base_new"]
+                result = {f: batch.from_kurus(int(projection[f][i, month - 1])) for f in batch.FIELDS}
+                self.assertEqual(result, expected, f"çalışan {i}, ay {month}")
+
+    def test_per_row_months(self):
+        """Satır başına ay, o ayın istisnasıyla tekil motorla aynı sonucu vermeli."""
+        gross = [Decimal("33030"), Decimal("85000"), Decimal("85000")]
+        cum_base = [Decimal("280000"), Decimal("0"), Decimal("450000")]
+        months = [10, 1, 12]
+        result = batch.calculate_pay_slips(gross, cum_base, ["normal_4a"] * 3, self.year_params, month=months)
+        for i in range(3):
+            expected = payroll.calculate_pay_slip(gross[i], cum_base[i], "normal_4a", self.year_params, months[i])
+            self.assertEqual(batch.row(result, i), expected)
+        with self.assertRaises(ValueError):
+            batch.calculate_pay_slips(["50000"], ["0"], ["normal_4a"], self.year_params, month=13)
+
+    def test_mid_year_period(self):
+        """Temmuzda değişen tavan ve asgari ücret, Ocak parametreleri verilse de o aydan itibaren uygulanmalı."""
+        raw = params.load_params(2026)
+        raw["periods"] = [{"effective_from": "2026-07-01", "min_wage_gross": "36000.00",
+                           "sgk_ceiling_monthly": "270000.00"}]
+        january = params.YearParams(raw)
+        july = january.for_month(7)
+        self.assertNotEqual(params.YearParams(params.load_params(2026)).fingerprint, january.fingerprint)
+
+        expected = payroll.calculate_pay_slip(Decimal("300000"), Decimal("0"), "normal_4a", july, 7)
+        self.assertEqual(expected["pek"], Decimal("270000.00"))
+        self.assertEqual(payroll.calculate_pay_slip(Decimal("300000"), Decimal("0"), "normal_4a", january, 7), expected)
+
+        months = [3, 7, 12]
+        gross = [Decimal("300000"), Decimal("300000"), Decimal("36000")]
+        result = batch.calculate_pay_slips(gross, ["0"] * 3, ["normal_4a"] * 3, january, month=months)
+        for i in range(3):
+            self.assertEqual(batch.row(result, i),
+                             payroll.calculate_pay_slip(gross[i], Decimal("0"), "normal_4a", january, months[i]))
+
+        projection = batch.project_annual([Decimal("300000")], ["normal_4a"], january)
+        cum_base = Decimal("0")
+        for month in range(1, 13):
+            expected = payroll.calculate_pay_slip(Decimal("300000"), cum_base, "normal_4a", january, month)
+            cum_base = expected["cum_tax_base_new"]
+            self.assertEqual(batch.from_kurus(int(projection["net"][0, month - 1])), expected["net"], f"ay {month}")
+
+        solved = batch.find_gross_salaries(["50000", "50000"], ["0", "0"], ["normal_4a"] * 2, january, month=[1, 7])
+        for i, month in enumerate([1, 7]):
+            gross = batch.from_kurus(int(solved["gross"][i]))
+            self.assertEqual(payroll.calculate_pay_slip(gross, Decimal("0"), "normal_4a", january, month)["net"],
+                             batch.from_kurus(int(solved["net"][i])))
+
+    def test_batch_net_to_gross(self):
+        """Toplu çözücünün brütü, tekil motorda hedef nete kuruşu kuruşuna ulaşmalı."""
+        rng = random.Random(10)
+        targets = [Decimal(rng.randint(3000000, 50000000)) / 100 for _ in range(200)]
+        cum_base = [Decimal(rng.randint(0, 400000000)) / 100 for _ in targets]
+        types = [rng.choice(batch.EMPLOYEE_TYPES) for _ in targets]
+        months = [rng.randint(1, 12) for _ in targets]
+
+        solved = batch.find_gross_salaries(targets, cum_base, types, self.year_params, month=months)
+        for i in range(len(targets)):
+            gross = batch.from_kurus(int(solved["gross"][i]))
+            expected = payroll.calculate_pay_slip(gross, cum_base[i], types[i], self.year_params, months[i])
+            self.assertEqual(batch.from_kurus(int(solved["net"][i])), expected["net"])
+            self.assertEqual(batch.from_kurus(int(solved["residual"][i])), expected["net"] - targets[i])
+            self.assertLessEqual(abs(expected["net"] - targets[i]), Decimal("0.01"))
+
+    def test_batch_net_to_gross_min_wage_floor(self):
+        solved = batch.find_gross_salaries(["1000"], ["0"], ["normal_4a"], self.year_params)
+        self.assertEqual(batch.from_kurus(int(solved["gross"][0])), self.year_params.min_wage_gross)
+        self.assertGreater(int(solved["residual"][0]), 0)
+
+    def test_invalid_employee_type(self):
+        with self.assertRaises(ValueError):
+            batch.calculate_pay_slips(["50000"], ["0"], ["memur"], self.year_params)
+
+if __name__ == '__main__':
+    unittest.main()
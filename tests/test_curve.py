@@ -0,0 +1,84 @@
+import unittest
+from decimal import Decimal
+from core import curve, payroll, params
+from core.curve import NetCurve
+
+class TestNetCurve(unittest.TestCase):
+
+    def setUp(self):
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def test_net_matches_pay_slip(self):
+        """Eğri üzerindeki net, tam bordro hesabıyla kuruşu kuruşuna aynı olmalı."""
+        for employee_type in ["normal_4a", "emekli_sgdp"]:
+            for cum_base in ["0", "175000", "1480000.55"]:
+                cum_base = Decimal(cum_base)
+                curve = NetCurve(self.year_params, cum_base, employee_type)
+                for gross in ["0", "20000", "33030", "33030.01", "100000.25", "247725", "300000", "6000000"]:
+                    gross = Decimal(gross)
+                    expected = payroll.calculate_pay_slip(gross, cum_base, employee_type, self.year_params)
+                    self.assertEqual(curve.net(gross), expected["net"], f"{employee_type} {cum_base} {gross}")
+
+    def test_mid_year_period_resolved_in_constructor(self):
+        """Doğrudan kurulan eğri de ayın dönem parametrelerini (tavan, oranlar) kullanmalı."""
+        raw = params.load_params(2026)
+        raw["periods"] = [{"effective_from": "2026-07-01", "sgk_ceiling_monthly": "270000.00"}]
+        january = params.YearParams(raw)
+        curve = NetCurve(january, Decimal("0"), "normal_4a", month=7)
+        for gross in ["250000", "300000"]:
+            gross = Decimal(gross)
+            self.assertEqual(curve.net(gross), payroll.calculate_pay_slip(gross, Decimal("0"), "normal_4a", january, 7)["net"])
+
+    def test_net_to_gross_across_breakpoints(self):
+        """Tavan, dilim geçişi ve istisna bölgelerinde netten brüte gidiş-dönüş."""
+        cases = [
+            ("40000", "0"), ("150000", "0"), ("250000", "0"),
+            ("60000", "180000"), ("90000", "395000"), ("120000", "5250000"),
+        ]
+        for target, cum_base in cases:
+            target, cum_base = Decimal(target), Decimal(cum_base)
+            gross = payroll.find_gross_salary(target, cum_base, "normal_4a", self.year_params)
+            res = payroll.calculate_pay_slip(gross, cum_base, "normal_4a", self.year_params)
+            self.assertLessEqual(abs(res["net"] - target), Decimal("0.01"), f"Hedef: {target}, Hesaplanan: {res['net']}")
+
+    def test_net_below_min_wage_returns_min_wage(self):
+        """Brüt asgari ücretin altına inmemeli."""
+        gross = payroll.find_gross_salary(Decimal("10000"), Decimal("0"), "normal_4a", self.year_params)
+        self.assertEqual(gross, self.year_params.min_wage_gross)
+
+class TestCurveCache(unittest.TestCase):
+
+    def setUp(self):
+        curve.clear_curve_cache()
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def test_reused_across_equal_parameter_sets(self):
+        first = curve.get_net_curve(self.year_params, Decimal("120000"), "normal_4a", 3)
+        again = curve.get_net_curve(params.load_params(2026, compiled=True), Decimal("120000"), "normal_4a", 3)
+        self.assertIs(again, first)
+        self.assertIsNot(curve.get_net_curve(self.year_params, Decimal("120000"), "normal_4a", 4), first)
+
+    def test_invalidated_when_parameters_change(self):
+        first = curve.get_net_curve(self.year_params, Decimal("0"), "normal_4a")
+        raw = dict(params.load_params(2026), min_wage_gross=Decimal("35000"))
+        changed = curve.get_net_curve(raw, Decimal("0"), "normal_4a")
+        self.assertIsNot(changed, first)
+
+    def test_size_bounded(self):
+        for i in range(curve.CURVE_CACHE_SIZE + 10):
+            curve.get_net_curve(self.year_params, Decimal(i), "normal_4a")
+        self.assertEqual(len(curve._curve_cache), curve.CURVE_CACHE_SIZE)
+
+    def test_preview_matches_full_engine(self):
+        cum_base = Decimal("395000")
+        quick = payroll.preview("gross_to_net", Decimal("98765.43"), cum_base, "normal_4a", self.year_params, 5)
+        full = payroll.calculate_pay_slip(Decimal("98765.43"), cum_base, "normal_4a", self.year_params, 5)
+        self.assertEqual(quick["net"], full["net"])
+
+        quick = payroll.preview("net_to_gross", Decimal("70000"), cum_base, "emekli_sgdp", self.year_params, 5)
+        full = payroll.calculate_pay_slip(quick["gross"], cum_base, "emekli_sgdp", self.year_params, 5)
+        self.assertEqual(quick["net"], full["net"])
+        self.assertLessEqual(abs(full["net"] - Decimal("70000")), Decimal("0.01"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+from decimal import Decimal
+from core import batch, fixedpoint, payroll, params
+
+class TestFixedPoint(unittest.TestCase):
+
+    def setUp(self):
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def test_fast_path_matches_decimal(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            gross = Decimal(rng.randint(0, 40000000)) / 100
+            cum_base = Decimal(rng.randint(0, 600000000)) / 100
+            employee_type = rng.choice(["normal_4a", "emekli_sgdp"])
+            expected = payroll.calculate_pay_slip(gross, cum_base, employee_type, self.year_params)
+            result = payroll.calculate_pay_slip(gross, cum_base, employee_type, self.year_params, fast=True)
+            self.assertEqual(result, expected)
+
+    def test_sub_kurus_input_falls_back_to_decimal(self):
+        gross = Decimal("50000.005")
+        expected = payroll.calculate_pay_slip(gross, Decimal("0"), "normal_4a", self.year_params)
+        result = payroll.calculate_pay_slip(gross, Decimal("0"), "normal_4a", self.year_params, fast=True)
+        self.assertEqual(result, expected)
+
+    def test_round_half_up_away_from_zero(self):
+        self.assertEqual(fixedpoint.round_half_up(5, 10), 1)
+        self.assertEqual(fixedpoint.round_half_up(4, 10), 0)
+        self.assertEqual(fixedpoint.round_half_up(-5, 10), -1)
+
+    def test_shadow_reports_divergence(self):
+        guard = fixedpoint.ShadowGuard(sample_rate=1.0)
+        gross, cum_base = Decimal("60000"), Decimal("0")
+        result = payroll.calculate_pay_slip(gross, cum_base, "normal_4a", self.year_params, fast=True, shadow=guard)
+        self.assertEqual(guard.report()["divergence_count"], 0)
+
+        tampered = dict(result, net=result["net"] + Decimal("0.01"))
+        self.assertFalse(guard.compare(tampered, gross, cum_base, "normal_4a", self.year_params))
+        report = guard.report()
+        self.assertEqual(report["checked"], 2)
+        self.assertEqual(report["divergence_count"], 1)
+        self.assertIn("net", report["divergences"][0]["fields"])
+
+    def test_shadow_on_batch(self):
+        guard = fixedpoint.ShadowGuard(sample_rate=1.0)
+        batch.calculate_pay_slips(["40000", "300000"], ["0", "250000"], ["normal_4a", "emekli_sgdp"],
+                                  self.year_params, shadow=guard)
+        self.assertEqual(guard.report(), {"checked": 2, "divergence_count": 0, "divergences": []})
+
+if __name__ == '__main__':
+    unittest.main()
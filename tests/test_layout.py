@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from decimal import Decimal
+from core import analyzer, layout
+from pdf_samples import make_pdf, make_payslip_pdf, payslip_lines
+
+class TestLayoutTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store_path = os.path.join(self.tmp.name, "templates.sqlite3")
+        self.store = layout.TemplateStore(self.store_path)
+        self.addCleanup(self.store.close)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def read(self, pdf, **kwargs):
+        return analyzer.read_payslip(pdf, False, templates=self.store, **kwargs)
+
+    def test_learned_template_reads_same_vendor(self):
+        self.read(make_payslip_pdf(self.path("a.pdf")))
+        self.assertEqual(self.store.count(), 1)
+
+        other = make_payslip_pdf(self.path("b.pdf"), gross="123456.78", net="99999.10", header="MART 2026 AYI UCRET BORDROSU")
+        timings = {}
+        with mock.patch.object(analyzer, "_page_text", side_effect=AssertionError("tam okuma yapılmamalı")):
+            text, parsed = self.read(other, timings=timings)
+        self.assertEqual(self.store.hits, 1)
+        self.assertIn("template", timings)
+        self.assertEqual(parsed["gross"], Decimal("123456.78"))
+        self.assertEqual(parsed["_parse_confidence"], 1.0)
+
+        full_text, full = analyzer.read_payslip(other, False, templates=False)
+        full.pop("_generic_pairs"), parsed.pop("_generic_pairs")
+        self.assertEqual(parsed, full)
+        self.assertEqual(text, full_text)
+
+        # Depo yeniden açıldığında şablon diskten yüklenir
+        reopened = layout.TemplateStore(self.store_path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.count(), 1)
+
+    def test_other_layout_falls_back_and_learns(self):
+        self.read(make_payslip_pdf(self.path("a.pdf")))
+        # Başa eklenen satır tüm etiketleri aşağı kaydırır: parmak izi tutmaz
+        shifted = make_pdf(self.path("b.pdf"), [["FIRMA A.S."] + payslip_lines(gross="70000.00")])
+        parsed = self.read(shifted)[1]
+        self.assertEqual((self.store.hits, self.store.misses), (0, 2))
+        self.assertEqual(parsed["gross"], Decimal("70000.00"))
+        self.assertEqual(self.store.count(), 2)
+
+    def test_extra_field_falls_back(self):
+        self.read(make_payslip_pdf(self.path("a.pdf")))
+        # Aynı yerleşim, sonuna şablonda olmayan alanlar eklenmiş
+        extra = make_pdf(self.path("b.pdf"), [payslip_lines() + ["BES TUTARI: 500.00", "MUHTELIF KESINTILER: 1200.00"]])
+        parsed = self.read(extra)[1]
+        self.assertEqual(self.store.hits, 0)
+        self.assertEqual(parsed["bes_amount"], Decimal("500.00"))
+        self.assertEqual(parsed["deductions_misc"], Decimal("1200.00"))
+        parsed.pop("_generic_pairs")
+        full = analyzer.read_payslip(extra, False, templates=False)[1]
+        full.pop("_generic_pairs")
+        self.assertEqual(parsed, full)
+
+    def test_learns_only_full_confidence(self):
+        partial = make_pdf(self.path("a.pdf"), [payslip_lines()[:-1]])
+        self.assertLess(self.read(partial)[1]["_parse_confidence"], 1.0)
+        self.assertEqual(self.store.count(), 0)
+
+        # Tablo modu "always" iken şablon kullanılmaz
+        self.read(make_payslip_pdf(self.path("b.pdf")), tables="always")
+        self.assertEqual(self.store.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
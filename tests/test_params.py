@@ -0,0 +1,105 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+from core import payroll, params
+
+class TestYearParams(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = params.load_params(2026)
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def test_preconverted_values(self):
+        self.assertIsInstance(self.year_params, params.YearParams)
+        self.assertEqual(self.year_params.min_wage_gross, Decimal("33030.00"))
+        self.assertEqual(self.year_params.employee_rates("emekli_sgdp"), (Decimal("0.075"), Decimal("0.0")))
+        self.assertEqual(self.year_params.stamp_exemption, Decimal("33030.00") * Decimal("0.00759"))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.year_params.stamp_rate = Decimal("0")
+
+    def test_invalid_employee_type(self):
+        with self.assertRaises(ValueError):
+            self.year_params.employee_rates("memur")
+
+    def test_pickle_roundtrip(self):
+        """Süreçler arası aktarım için pickle edilebilmeli."""
+        clone = pickle.loads(pickle.dumps(self.year_params))
+        self.assertEqual(clone.sgk_ceiling_monthly, self.year_params.sgk_ceiling_monthly)
+        self.assertIs(clone.tariff, self.year_params.tariff)
+
+    def test_raw_dict_resolved_once(self):
+        resolved = params.as_year_params(self.raw)
+        self.assertIs(params.as_year_params(dict(self.raw)), resolved)
+        # Sözlük değişirse yeni içerik yeni nesneye çözülür; eskisi etkilenmez
+        self.raw["stamp_rate"] = Decimal("0.008")
+        changed = params.as_year_params(self.raw)
+        self.assertIsNot(changed, resolved)
+        self.assertEqual(changed.stamp_rate, Decimal("0.008"))
+        self.assertEqual(resolved.stamp_rate, Decimal("0.00759"))
+
+    def test_same_result_as_raw_dict(self):
+        for gross in ["33030", "85000", "300000"]:
+            gross = Decimal(gross)
+            expected = payroll.calculate_pay_slip(gross, Decimal("120000"), "normal_4a", self.raw)
+            result = payroll.calculate_pay_slip(gross, Decimal("120000"), "normal_4a", self.year_params)
+            self.assertEqual(result, expected)
+
+class TestParamsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.raw = params.load_params(2026)
+        self.raw["periods"] = [{"effective_from": "2026-07-01", "min_wage_gross": Decimal("36000.00")}]
+        self.write(self.raw)
+        self.registry = params.ParamsRegistry(self.data_dir)
+
+    def write(self, raw, mtime=None):
+        path = os.path.join(self.data_dir, "params_2026.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(raw, f, default=float)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def test_mid_year_period(self):
+        january = self.registry.get(2026, 1)
+        july = self.registry.get(2026, 7)
+        self.assertEqual(january.min_wage_gross, Decimal("33030.00"))
+        self.assertEqual(july.min_wage_gross, Decimal("36000.00"))
+        self.assertIs(self.registry.get(2026, 6), january)
+        self.assertIs(self.registry.get(2026, 12), july)
+        self.assertEqual(self.registry.years(), [2026])
+
+    def test_exemption_uses_each_months_min_wage(self):
+        """Temmuz istisnası, Ocak-Haziran eski ve Temmuz yeni asgari ücret matrahıyla hesaplanır."""
+        july = self.registry.get(2026, 7)
+        tariff = july.tariff
+        cum_june = self.registry.get(2026, 1).min_wage_tax_base * 6
+        expected = tariff.liability(cum_june + july.min_wage_tax_base) - tariff.liability(cum_june)
+        self.assertEqual(july.exemptions.income_tax_exemption(7), expected)
+        self.assertEqual(july.exemptions.stamp_exemption(7), Decimal("36000.00") * july.stamp_rate)
+
+    def test_cached_until_file_changes(self):
+        first = self.registry.get(2026)
+        self.assertIs(self.registry.get(2026), first)
+
+        self.raw["sgk_ceiling_monthly"] = Decimal("270000")
+        self.write(self.raw, mtime=os.stat(os.path.join(self.data_dir, "params_2026.json")).st_mtime_ns + 10**9)
+        reloaded = self.registry.get(2026)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.sgk_ceiling_monthly, Decimal("270000"))
+
+    def test_period_params_pickle(self):
+        july = self.registry.get(2026, 8)
+        clone = pickle.loads(pickle.dumps(july))
+        self.assertEqual(clone.min_wage_gross, Decimal("36000.00"))
+        self.assertEqual(clone.fingerprint, july.fingerprint)
+
+if __name__ == '__main__':
+    unittest.main()
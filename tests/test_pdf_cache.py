@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from decimal import Decimal
+from core import analyzer, params
+from core.pdf_cache import PdfCache
+from pdf_samples import make_payslip_pdf
+
+class TestPdfCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # Varsayılan şablon deposu geçici klasörde
+        patcher = mock.patch.dict(os.environ, {"BORDRO_CACHE_DIR": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = PdfCache(os.path.join(self.tmp.name, "cache.sqlite3"))
+        self.addCleanup(self.cache.close)
+        self.pdf = make_payslip_pdf(os.path.join(self.tmp.name, "bordro.pdf"))
+
+    def test_hit_skips_extraction(self):
+        text, parsed = analyzer.read_payslip(self.pdf, self.cache)
+        self.assertEqual(self.cache.misses, 1)
+
+        with mock.patch.object(analyzer, "extract_text_from_pdf", side_effect=AssertionError("PDF okunmamalı")):
+            cached_text, cached = analyzer.read_payslip(self.pdf, self.cache)
+            analysis = analyzer.analyze_pdf(self.pdf, params.get_year_params(2026), self.cache)
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(cached_text, text)
+        self.assertEqual(cached, parsed)
+        self.assertIsInstance(cached["gross"], Decimal)
+        self.assertEqual(analysis["parse_confidence"], 1.0)
+
+    def test_content_and_version_keyed(self):
+        analyzer.read_payslip(self.pdf, self.cache)
+        make_payslip_pdf(self.pdf, gross="91000.00")
+        self.assertEqual(analyzer.read_payslip(self.pdf, self.cache)[1]["gross"], Decimal("91000.00"))
+
+        with mock.patch.object(analyzer, "ANALYZER_VERSION", "test"):
+            analyzer.read_payslip(self.pdf, self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 3))
+
+    def test_bypass(self):
+        with mock.patch.object(analyzer, "extract_text_from_pdf", wraps=analyzer.extract_text_from_pdf) as extract:
+            # Şablonlar da kapalı: her okumada tam metin çıkarılır
+            analyzer.read_payslip(self.pdf, False, templates=False)
+            analyzer.read_payslip(self.pdf, False, templates=False)
+        self.assertEqual(extract.call_count, 2)
+
+    def test_lru_eviction(self):
+        for i in range(3):
+            self.cache.put(f"k{i}", "x" * 1000, {"gross": Decimal(i)})
+        self.cache.get("k0")
+        self.cache.max_bytes = 2500
+        self.cache.put("k3", "x" * 1000, {})
+        self.assertIsNotNone(self.cache.get("k0"))
+        self.assertIsNone(self.cache.get("k1"))
+        self.assertIsNotNone(self.cache.get("k3"))
+        self.assertLessEqual(self.cache.total_bytes(), 2500)
+
+if __name__ == '__main__':
+    unittest.main()
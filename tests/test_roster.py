@@ -0,0 +1,84 @@
+import io
+import json
+import unittest
+from unittest import mock
+from decimal import Decimal
+from core import batch, params, payroll, roster
+
+ROSTER_CSV = """id,gross,target_net,cum_base,type,month
+1,50000,,0,normal_4a,1
+2,,60000,120000,emekli_sgdp,3
+3,abc,,0,normal_4a,1
+4,45000.50,,250000,normal_4a,2
+"""
+
+class TestRoster(unittest.TestCase):
+
+    def setUp(self):
+        self.year_params = params.load_params(2026, compiled=True)
+
+    def run_roster(self, chunk_size, workers=1):
+        out = io.StringIO()
+        records = roster.read_records(io.StringIO(ROSTER_CSV), "csv")
+        count = roster.run_batch(records, self.year_params, roster.RosterWriter(out, "jsonl"), chunk_size, workers)
+        return count, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_results_in_input_order_with_row_errors(self):
+        count, results = self.run_roster(chunk_size=2)
+        self.assertEqual(count, 4)
+        self.assertEqual([r["id"] for r in results], ["1", "2", "3", "4"])
+        self.assertIn("error", results[2])
+
+        expected = payroll.calculate_pay_slip(Decimal("45000.50"), Decimal("250000"), "normal_4a", self.year_params, 2)
+        self.assertEqual(results[3]["net"], str(expected["net"]))
+        self.assertLessEqual(abs(Decimal(results[1]["net"]) - Decimal("60000")), Decimal("0.01"))
+
+    def test_chunk_size_does_not_change_output(self):
+        self.assertEqual(self.run_roster(chunk_size=1), self.run_roster(chunk_size=100))
+
+    def test_process_pool_preserves_order(self):
+        """İşçi süreçlerle çıktı, tek süreçle aynı ve aynı sırada olmalı."""
+        self.assertEqual(self.run_roster(chunk_size=1, workers=2), self.run_roster(chunk_size=1))
+
+    def test_out_of_range_amounts_are_row_errors(self):
+        out = io.StringIO()
+        records = [{"id": 1, "gross": "1e30"}, {"id": 2, "gross": "Infinity"}, {"id": 3, "target_net": "NaN"},
+                   [1, 2], {"id": 5, "gross": "50000"}]
+        count = roster.run_batch(iter(records), self.year_params, roster.RosterWriter(out, "jsonl"))
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 5)
+        self.assertTrue(all(r.get("error") for r in results[:4]))
+        self.assertNotIn("error", results[4])
+
+    def test_malformed_jsonl_line_is_row_error(self):
+        out = io.StringIO()
+        src = io.StringIO('{"id": 1, "gross": "50000"}\n{bad\n{"id": 3, "gross": "60000"}\n')
+        count = roster.run_batch(roster.read_records(src, "jsonl"), self.year_params, roster.RosterWriter(out, "jsonl"))
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, 3)
+        self.assertEqual(results[1]["error"], "Geçersiz JSON satırı: 2")
+        self.assertEqual([r["id"] for r in results[::2]], [1, 3])
+
+    def test_failing_target_row_does_not_fail_chunk(self):
+        solve = batch.find_gross_salaries
+
+        def failing(target_net, *args, **kwargs):
+            if Decimal("60000") in target_net:
+                raise ArithmeticError("çözülemedi")
+            return solve(target_net, *args, **kwargs)
+
+        with mock.patch.object(batch, "find_gross_salaries", side_effect=failing):
+            results = self.run_roster(chunk_size=100)[1]
+        self.assertEqual(results[1]["error"], "çözülemedi")
+        self.assertEqual(results[3], self.run_roster(chunk_size=100)[1][3])
+        self.assertNotIn("error", results[0])
+
+    def test_csv_output_header(self):
+        out = io.StringIO()
+        records = roster.read_records(io.StringIO(ROSTER_CSV), "csv")
+        roster.run_batch(records, self.year_params, roster.RosterWriter(out, "csv"))
+        header = out.getvalue().splitlines()[0].split(",")
+        self.assertEqual(tuple(header), roster.OUTPUT_COLUMNS)
+
+if __name__ == '__main__':
+    unittest.main()
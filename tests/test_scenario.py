@@ -0,0 +1,62 @@
+import unittest
+from decimal import Decimal
+from core import params, payroll, scenario
+
+class TestScenario(unittest.TestCase):
+
+    def setUp(self):
+        self.raw = params.load_params(2026)
+        self.gross = [Decimal("33030"), Decimal("85000"), Decimal("260000.50")]
+        self.cum_base = [Decimal("0"), Decimal("180000"), Decimal("1450000")]
+        self.types = ["normal_4a", "emekli_sgdp", "normal_4a"]
+        self.overlays = {
+            "asgari_zam": {"min_wage_gross": "38000", "sgk_ceiling_monthly": "285000"},
+            "sgk": {"rates": {"normal_4a": {"sgk_employee": "0.15"}}},
+        }
+
+    def test_overlay_merges_without_touching_base(self):
+        merged = scenario.apply_overlay(self.raw, self.overlays["sgk"])
+        self.assertEqual(merged["rates"]["normal_4a"]["sgk_employee"], Decimal("0.15"))
+        self.assertEqual(merged["rates"]["normal_4a"]["unemployment_employee"], Decimal("0.01"))
+        self.assertEqual(self.raw["rates"]["normal_4a"]["sgk_employee"], Decimal("0.14"))
+
+    def test_overlay_keeps_non_numeric_keys(self):
+        merged = scenario.apply_overlay(self.raw, {"notes": "Temmuz zammı taslağı", "min_wage_gross": "38000"})
+        self.assertEqual(merged["notes"], "Temmuz zammı taslağı")
+        self.assertEqual(merged["min_wage_gross"], Decimal("38000"))
+        with self.assertRaises(ValueError):
+            scenario.apply_overlay(self.raw, {"min_wage_gross": "otuz bin"})
+
+    def test_matches_scalar_engine_per_scenario(self):
+        result = scenario.run_scenarios(self.gross, self.cum_base, self.types, self.overlays, self.raw, month=4)
+
+        base_net = [payroll.calculate_pay_slip(g, c, t, self.raw, 4)["net"]
+                    for g, c, t in zip(self.gross, self.cum_base, self.types)]
+        self.assertEqual(result["baseline"]["totals"]["net"], sum(base_net))
+
+        for item in result["scenarios"]:
+            merged = scenario.apply_overlay(self.raw, self.overlays[item["name"]])
+            slips = [payroll.calculate_pay_slip(g, c, t, merged, 4)
+                     for g, c, t in zip(self.gross, self.cum_base, self.types)]
+            self.assertEqual(item["totals"]["net"], sum(s["net"] for s in slips))
+            self.assertEqual(item["delta_totals"]["net"], sum(s["net"] for s in slips) - sum(base_net))
+            for i, slip in enumerate(slips):
+                self.assertEqual(Decimal(int(item["deltas"]["net"][i])) / 100, slip["net"] - base_net[i])
+
+    def test_fine_grained_overlay_uses_decimal_engine(self):
+        """Kuruş ölçeğine sığmayan oran koşuyu durdurmaz; o senaryo Decimal motoruyla hesaplanır."""
+        overlays = dict(self.overlays, hassas={"stamp_rate": "0.007595"})
+        result = scenario.run_scenarios(self.gross, self.cum_base, self.types, overlays, self.raw, month=[1, 4, 9])
+        engines = {item["name"]: item["engine"] for item in result["scenarios"]}
+        self.assertEqual(engines, {"asgari_zam": "batch", "sgk": "batch", "hassas": "decimal"})
+
+        merged = scenario.apply_overlay(self.raw, overlays["hassas"])
+        slips = [payroll.calculate_pay_slip(g, c, t, merged, m)
+                 for g, c, t, m in zip(self.gross, self.cum_base, self.types, [1, 4, 9])]
+        self.assertEqual(result["scenarios"][-1]["totals"]["stamp_tax_net"], sum(s["stamp_tax_net"] for s in slips))
+
+        with self.assertRaisesRegex(ValueError, "bozuk"):
+            scenario.run_scenarios(self.gross, self.cum_base, self.types, {"bozuk": {"stamp_rate": "abc"}}, self.raw)
+
+if __name__ == '__main__':
+    unittest.main()
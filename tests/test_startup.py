@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_modules(module):
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_analyzer_does_not_load_pdfplumber(self):
+        self.assertNotIn("pdfplumber", loaded_modules("core.analyzer"))
+
+    def test_cli_loads_no_heavy_dependencies(self):
+        modules = loaded_modules("cli")
+        for heavy in ("pdfplumber", "numpy", "core.analyzer"):
+            self.assertNotIn(heavy, modules)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from decimal import Decimal
+from core import params, tax
+
+class TestCompiledTariff(unittest.TestCase):
+
+    def setUp(self):
+        self.params_2026 = params.load_params(2026)
+        self.tariff = params.get_tariff(self.params_2026)
+        self.compiled = params.get_compiled_tariff(self.params_2026)
+
+    def test_matches_linear_walk(self):
+        """Derlenmiş tarife, dilim dilim yürüyen hesapla aynı sonucu vermeli."""
+        for base in ["0", "1", "189999.99", "190000", "190000.01", "400000",
+                     "1234567.89", "1500000", "5300000", "7654321.12"]:
+            base = Decimal(base)
+            expected = tax.calculate_total_tax_liability(base, self.tariff)
+            self.assertEqual(tax.calculate_total_tax_liability(base, self.compiled), expected)
+
+    def test_bracket_boundary_belongs_to_lower_bracket(self):
+        """Dilim sınırındaki matrah alt dilimde kalmalı."""
+        self.assertEqual(self.compiled.bracket_index(Decimal("190000")), 0)
+        self.assertEqual(self.compiled.bracket_index(Decimal("190000.01")), 1)
+        self.assertEqual(self.compiled.liability(Decimal("190000")), Decimal("28500.00"))
+
+    def test_cached_per_parameter_set(self):
+        """Aynı tarife için derleme tekrar edilmemeli."""
+        again = params.get_compiled_tariff(params.load_params(2026))
+        self.assertIs(again, self.compiled)
+        self.assertIs(params.get_compiled_tariff(params.load_params(2026, compiled=True)), self.compiled)
+
+    def test_bounded_tariff_does_not_tax_above_last_limit(self):
+        bounded = [
+            {"up_to": Decimal("100"), "rate": Decimal("0.10")},
+            {"up_to": Decimal("200"), "rate": Decimal("0.20")},
+        ]
+        compiled = tax.compile_tariff(bounded)
+        for base in ["50", "150", "200", "500"]:
+            base = Decimal(base)
+            self.assertEqual(compiled.liability(base), tax.calculate_total_tax_liability(base, bounded))
+
+class TestExemptionSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.year_params = params.load_params(2026, compiled=True)
+        self.schedule = self.year_params.exemptions
+
+    def test_follows_min_wage_cumulative_position(self):
+        """Ay m istisnası, asgari ücretlinin m-1 aylık kümülatif matrahındaki vergisidir."""
+        tariff = self.year_params.tariff
+        base = self.year_params.min_wage_tax_base
+        self.assertEqual(self.schedule.income_tax_exemption(1), tariff.liability(base))
+        for month in range(1, 13):
+            expected = tariff.liability(base * month) - tariff.liability(base * (month - 1))
+            self.assertEqual(self.schedule.income_tax_exemption(month), expected)
+        # Asgari ücretli yıl içinde üst dilime geçtiğinde istisna artar
+        self.assertGreater(self.schedule.income_tax_exemption(12), self.schedule.income_tax_exemption(1))
+
+    def test_stamp_exemption_constant(self):
+        for month in range(1, 13):
+            self.assertEqual(self.schedule.stamp_exemption(month), self.year_params.stamp_exemption)
+
+    def test_invalid_month(self):
+        for month in (0, 13):
+            with self.assertRaises(ValueError):
+                self.schedule.income_tax_exemption(month)
+
+if __name__ == '__main__':
+    unittest.main()